@@ -1,5 +1,6 @@
 from functools import reduce
 from typing import (
+    Callable,
     Union,
     Optional,
     List,
@@ -33,6 +34,8 @@ from .occ_impl.exporters.assembly import (
     exportVTKJS,
     exportVRML,
     exportGLTF,
+    exportSTL,
+    export3MF,
     STEPExportModeLiterals,
 )
 from .occ_impl.importers.assembly import importStep as _importStep, importXbf, importXml
@@ -45,10 +48,13 @@ from .utils import deprecate, BiDict, instance_of
 # type definitions
 AssemblyObjects = Union[Shape, Workplane, None]
 ImportLiterals = Literal["STEP", "XML", "XBF"]
-ExportLiterals = Literal["STEP", "XML", "XBF", "GLTF", "VTKJS", "VRML", "STL"]
+ExportLiterals = Literal["STEP", "XML", "XBF", "GLTF", "VTKJS", "VRML", "STL", "3MF"]
 
 PATH_DELIM = "/"
 
+# attributes of lazily imported nodes that are loaded on first access
+LAZY_ATTRS = ("obj", "_subshape_names", "_subshape_colors", "_subshape_layers")
+
 # entity selector grammar definition
 
 
@@ -171,13 +177,24 @@ class Assembly(object):
         Make a deep copy of an assembly
         """
 
+        loader = self.__dict__.get("_loader")
+
         rv = self.__class__(
-            self.obj, self.loc, self.name, self.color, self.material, self.metadata
+            None if loader else self.obj,
+            self.loc,
+            self.name,
+            self.color,
+            self.material,
+            self.metadata,
         )
 
-        rv._subshape_colors = BiDict(self._subshape_colors)
-        rv._subshape_names = BiDict(self._subshape_names)
-        rv._subshape_layers = BiDict(self._subshape_layers)
+        # copies of lazy nodes stay lazy
+        if loader:
+            rv._defer(loader)
+        else:
+            rv._subshape_colors = BiDict(self._subshape_colors)
+            rv._subshape_names = BiDict(self._subshape_names)
+            rv._subshape_layers = BiDict(self._subshape_layers)
 
         for ch in self.children:
             ch_copy = ch._copy()
@@ -549,8 +566,8 @@ class Assembly(object):
         :param path: Path and filename for writing.
         :param exportType: export format (default: None, results in format being inferred form the path)
         :param mode: STEP only - See :meth:`~cadquery.occ_impl.exporters.assembly.exportAssembly`.
-        :param tolerance: the deflection tolerance, in model units. Only used for glTF, VRML. Default 0.1.
-        :param angularTolerance: the angular tolerance, in radians. Only used for glTF, VRML. Default 0.1.
+        :param tolerance: the deflection tolerance, in model units. Only used for glTF, VRML, STL and 3MF. Default 0.1.
+        :param angularTolerance: the angular tolerance, in radians. Only used for glTF, VRML, STL and 3MF. Default 0.1.
         :param \\**kwargs: Additional keyword arguments.  Only used for STEP, glTF and STL.
             See :meth:`~cadquery.occ_impl.exporters.assembly.exportAssembly`.
         :param ascii: STL only - Sets whether or not STL export should be text or binary
@@ -578,8 +595,8 @@ class Assembly(object):
         :param path: Path and filename for writing.
         :param exportType: export format (default: None, results in format being inferred form the path)
         :param mode: STEP only - See :meth:`~cadquery.occ_impl.exporters.assembly.exportAssembly`.
-        :param tolerance: the deflection tolerance, in model units. Only used for glTF, VRML. Default 0.1.
-        :param angularTolerance: the angular tolerance, in radians. Only used for glTF, VRML. Default 0.1.
+        :param tolerance: the deflection tolerance, in model units. Only used for glTF, VRML, STL and 3MF. Default 0.1.
+        :param angularTolerance: the angular tolerance, in radians. Only used for glTF, VRML, STL and 3MF. Default 0.1.
         :param unit: The internal unit of the model's geometry values. Only used for STEP. Default "MM".
         :type unit: UnitLiterals
         :param outputUnit: The unit to use in the STEP file header. If None, defaults to the value of ``unit``.
@@ -590,6 +607,9 @@ class Assembly(object):
             See :meth:`~cadquery.occ_impl.exporters.assembly.exportAssembly`.
         :param ascii: STL only - Sets whether or not STL export should be text or binary
         :type ascii: bool
+        :param lods: glTF only - Number of coarse levels of detail written with the
+            MSFT_lod extension. Default 0.
+        :type lods: int
         """
 
         # Make sure the export mode setting is correct
@@ -598,7 +618,17 @@ class Assembly(object):
 
         if exportType is None:
             t = path.split(".")[-1].upper()
-            if t in ("STEP", "XML", "XBF", "VRML", "VTKJS", "GLTF", "GLB", "STL"):
+            if t in (
+                "STEP",
+                "XML",
+                "XBF",
+                "VRML",
+                "VTKJS",
+                "GLTF",
+                "GLB",
+                "STL",
+                "3MF",
+            ):
                 exportType = cast(ExportLiterals, t)
             else:
                 raise ValueError("Unknown extension, specify export type explicitly")
@@ -612,7 +642,9 @@ class Assembly(object):
         elif exportType == "VRML":
             exportVRML(self, path, tolerance, angularTolerance)
         elif exportType == "GLTF" or exportType == "GLB":
-            exportGLTF(self, path, None, tolerance, angularTolerance)
+            exportGLTF(
+                self, path, None, tolerance, angularTolerance, kwargs.get("lods", 0)
+            )
         elif exportType == "VTKJS":
             exportVTKJS(self, path)
         elif exportType == "STL":
@@ -621,23 +653,29 @@ class Assembly(object):
             if "ascii" in kwargs:
                 export_ascii = bool(kwargs.get("ascii"))
 
-            self.toCompound().exportStl(path, tolerance, angularTolerance, export_ascii)
+            exportSTL(self, path, tolerance, angularTolerance, export_ascii)
+        elif exportType == "3MF":
+            export3MF(self, path, tolerance, angularTolerance)
         else:
             raise ValueError(f"Unknown format: {exportType}")
 
         return self
 
     @classmethod
-    def importStep(cls, path: str, unit: UnitLiterals = "MM") -> Self:
+    def importStep(
+        cls, path: str, unit: UnitLiterals = "MM", lazy: bool = False
+    ) -> Self:
         """
         Reads an assembly from a STEP file.
 
         :param path: Path and filename for reading.
         :param unit: The unit of measurement for the STEP file. Default "MM".
+        :param lazy: Build the tree with names, locations and colors only. Shapes and
+            subshape metadata of a node are loaded when first accessed. Default False.
         :return: An Assembly object.
         """
 
-        return cls.load(path, importType="STEP", unit=unit)
+        return cls.load(path, importType="STEP", unit=unit, lazy=lazy)
 
     @classmethod
     def load(
@@ -645,9 +683,12 @@ class Assembly(object):
         path: str,
         importType: Optional[ImportLiterals] = None,
         unit: UnitLiterals = "MM",
+        lazy: bool = False,
     ) -> Self:
         """
         Load step, xbf or xml. Only STEP supports unit conversion on loading.
+        With lazy=True shapes and subshape metadata of every node are only loaded
+        when first accessed.
         """
 
         if importType is None:
@@ -660,11 +701,11 @@ class Assembly(object):
         assy = cls()
 
         if importType == "STEP":
-            _importStep(assy, path, unit)
+            _importStep(assy, path, unit, lazy)
         elif importType == "XML":
-            importXml(assy, path)
+            importXml(assy, path, lazy)
         elif importType == "XBF":
-            importXbf(assy, path)
+            importXbf(assy, path, lazy)
 
         return assy
 
@@ -822,11 +863,43 @@ class Assembly(object):
 
         return name in self.objects or name in self._subshape_names.inv
 
+    def _defer(self, loader: Callable[["Assembly"], None]) -> None:
+        """
+        Defer setting obj and subshape metadata until one of them is first accessed.
+        The loader is called with this node and is expected to set obj and add
+        subshapes.
+        """
+
+        for k in LAZY_ATTRS:
+            self.__dict__.pop(k, None)
+
+        self._loader = loader
+
+    def _load(self) -> None:
+        """
+        Call the loader of a lazy node.
+        """
+
+        loader = self.__dict__.pop("_loader", None)
+
+        if loader:
+            self.obj = None
+            self._subshape_names = BiDict()
+            self._subshape_colors = BiDict()
+            self._subshape_layers = BiDict()
+
+            loader(self)
+
     def __getattr__(self, name: str) -> Union["Assembly", Shape]:
         """
         . based access to children.
         """
 
+        # load lazy nodes on first access
+        if name in LAZY_ATTRS and "_loader" in self.__dict__:
+            self._load()
+            return getattr(self, name)
+
         if name in self.objects:
             return self.objects[name]
         elif name in self._subshape_names.inv:
@@ -835,6 +908,15 @@ class Assembly(object):
 
         raise AttributeError(f"{name} is not an attribute of {self}")
 
+    def __setattr__(self, name: str, value: Any) -> None:
+
+        # load lazy nodes before assigning, so that the loader does not override
+        # the assigned value
+        if name in LAZY_ATTRS and "_loader" in self.__dict__:
+            self._load()
+
+        super().__setattr__(name, value)
+
     def __dir__(self):
         """
         Modified __dir__ for autocompletion.
@@ -851,6 +933,8 @@ class Assembly(object):
         Explicit getstate needed due to getattr.
         """
 
+        self._load()
+
         return self.__dict__
 
     def __setstate__(self, d):
@@ -1,4 +1,5 @@
 from typing import (
+    Callable,
     Union,
     Iterable,
     Iterator,
@@ -47,10 +48,21 @@ from vtkmodules.vtkRenderingCore import (
     vtkRenderer,
     vtkProp3D,
 )
+from vtkmodules.vtkRenderingLOD import vtkLODActor
+from vtkmodules.vtkCommonDataModel import vtkPolyData
 
 from .geom import Location
-from .shapes import Shape, Solid, Compound, GlueLiteral, _set_glue, _set_builder_options
+from .shapes import (
+    Shape,
+    Solid,
+    Compound,
+    GlueLiteral,
+    _set_glue,
+    _set_builder_options,
+    _vtk_poly_data,
+)
 from .exporters.vtk import toString, extractEdgesFaces
+from .mesh import lods as _lods, _toPolyData
 from ..cq import Workplane
 from ..utils import BiDict
 
@@ -406,6 +418,9 @@ class AssemblyProtocol(Protocol):
     def traverse(self) -> Iterable[Tuple[str, "AssemblyProtocol"]]:
         ...
 
+    def _defer(self, loader: Callable[[Self], None]) -> None:
+        ...
+
     def __iter__(
         self,
         loc: Optional[Location] = None,
@@ -628,30 +643,67 @@ def toVTKAssy(
     linewidth: float = 2,
     tolerance: float = 1e-3,
     angularTolerance: float = 0.1,
+    lods: int = 0,
 ) -> List[vtkProp3D]:
+    """
+    Convert an assembly to a list of actors. Every unique shape is meshed once and
+    shared by all its instances. If lods > 0, faces are rendered by vtkLODActors
+    with the given number of additional coarse levels of detail.
+    """
 
     rv: List[vtkProp3D] = []
 
+    # meshes of unique shapes, Workplane objects yield a new compound on every
+    # iteration, so compounds are keyed by their children
+    meshes: Dict[
+        Tuple[Shape, ...], Tuple[vtkPolyData, vtkPolyData, List[vtkPolyData]]
+    ] = {}
+
     for shape, _, loc, col_ in assy:
 
         col = col_.toTuple() if col_ else color
 
         trans, rot = _loc2vtk(loc)
 
-        data = shape.toVtkPolyData(tolerance, angularTolerance)
-        data_edges, data_faces = extractEdgesFaces(data)
+        key = tuple(shape) if isinstance(shape, Compound) else (shape,)
+
+        if key not in meshes:
+            coarse: List[vtkPolyData] = []
+            data: Optional[vtkPolyData] = None
+
+            if lods:
+                levels = _lods(shape, tolerance, angularTolerance, lods + 1)
+                coarse = [_toPolyData(l.vertices, l.triangles) for l in levels[1:]]
+
+                # the finest level is the stored triangulation of the shape
+                data = _vtk_poly_data(shape.wrapped)
+
+            if data is None:
+                data = shape.toVtkPolyData(tolerance, angularTolerance)
+
+            data_edges, data_faces = extractEdgesFaces(data)
+
+            meshes[key] = (data_edges, data_faces, coarse)
+
+        data_edges, data_faces, coarse = meshes[key]
 
         # add both to the vtkAssy
         mapper = vtkMapper()
         mapper.AddInputDataObject(data_faces)
 
-        actor = vtkActor()
+        actor = vtkLODActor() if lods else vtkActor()
         actor.SetMapper(mapper)
         actor.SetPosition(*trans)
         actor.SetOrientation(*rot)
         actor.GetProperty().SetColor(*col[:3])
         actor.GetProperty().SetOpacity(col[3])
 
+        for data_lod in coarse:
+            mapper_lod = vtkMapper()
+            mapper_lod.AddInputDataObject(data_lod)
+
+            cast(vtkLODActor, actor).AddLODMapper(mapper_lod)
+
         rv.append(actor)
 
         mapper = vtkMapper()
@@ -0,0 +1,346 @@
+"""
+Opt-in persistent caches stored on disk.
+"""
+
+import os
+import shutil
+import hashlib
+import tempfile
+
+from io import BytesIO
+from pathlib import Path
+from typing import Any, Callable
+
+import numpy as np
+from numpy.typing import NDArray
+
+import OCP
+from OCP.BinTools import BinTools, BinTools_FormatVersion
+from OCP.TopoDS import TopoDS_Shape
+
+# bump when the layout of the cache entries changes
+CACHE_VERSION = 2
+
+DEFAULT_MAX_SIZE = 2 ** 30
+
+
+def defaultCacheDir() -> Path:
+    """
+    Default location of the CadQuery caches.
+    """
+
+    root = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+
+    return Path(root) / "cadquery"
+
+
+def shapeHash(s: TopoDS_Shape) -> str:
+    """
+    Stable content hash of a shape. Triangulations are not taken into account.
+    """
+
+    stream = BytesIO()
+    BinTools.Write_s(
+        s, stream, False, False, BinTools_FormatVersion.BinTools_FormatVersion_CURRENT
+    )
+
+    return hashlib.sha256(stream.getvalue()).hexdigest()
+
+
+class DiskCache(object):
+    """
+    Directory based cache with LRU eviction and a size cap.
+
+    Every entry is a subdirectory named by its key. Access time is tracked via the
+    modification time of the entry directory.
+    """
+
+    path: Path
+    maxSize: int
+
+    def __init__(self, path: str | Path, maxSize: int = DEFAULT_MAX_SIZE):
+
+        self.path = Path(path)
+        self.maxSize = maxSize
+
+        self.path.mkdir(parents=True, exist_ok=True)
+
+    def _entry(self, key: str) -> Path:
+
+        return self.path / key
+
+    def _touch(self, entry: Path) -> None:
+
+        try:
+            os.utime(entry)
+        except OSError:
+            pass
+
+    def _commit(self, key: str, tmp: Path) -> None:
+        """
+        Atomically move a fully written temporary entry in place.
+        """
+
+        entry = self._entry(key)
+
+        if entry.exists():
+            shutil.rmtree(entry, ignore_errors=True)
+
+        try:
+            os.replace(tmp, entry)
+        except OSError:
+            # lost a race with a concurrent writer
+            shutil.rmtree(tmp, ignore_errors=True)
+
+        self.evict()
+
+    def _tmp(self) -> Path:
+
+        return Path(tempfile.mkdtemp(prefix=".tmp-", dir=self.path))
+
+    @staticmethod
+    def _size(entry: Path) -> int:
+
+        return sum(f.stat().st_size for f in entry.iterdir() if f.is_file())
+
+    def entries(self) -> list[Path]:
+        """
+        Cache entries sorted from the least to the most recently used.
+        """
+
+        rv = [
+            p for p in self.path.iterdir() if p.is_dir() and not p.name.startswith(".")
+        ]
+
+        return sorted(rv, key=lambda p: p.stat().st_mtime)
+
+    def size(self) -> int:
+        """
+        Total size of the cache in bytes.
+        """
+
+        return sum(self._size(e) for e in self.entries())
+
+    def evict(self) -> None:
+        """
+        Remove least recently used entries until the size cap is satisfied.
+        """
+
+        entries = self.entries()
+        sizes = [self._size(e) for e in entries]
+        total = sum(sizes)
+
+        for e, size in zip(entries, sizes):
+            if total <= self.maxSize:
+                break
+
+            shutil.rmtree(e, ignore_errors=True)
+            total -= size
+
+    def clear(self) -> None:
+        """
+        Remove all entries.
+        """
+
+        for e in self.entries():
+            shutil.rmtree(e, ignore_errors=True)
+
+    def __contains__(self, key: str) -> bool:
+
+        return self._entry(key).is_dir()
+
+
+class MeshCache(DiskCache):
+    """
+    Cache of triangulation arrays keyed by shape content and meshing parameters.
+    Arrays are stored as .npy files and returned memory-mapped.
+    """
+
+    @staticmethod
+    def key(s: TopoDS_Shape, tolerance: float, angularTolerance: float) -> str:
+
+        h = hashlib.sha256()
+        h.update(shapeHash(s).encode())
+        h.update(
+            repr(
+                (
+                    CACHE_VERSION,
+                    OCP.__version__,
+                    float(tolerance),
+                    float(angularTolerance),
+                )
+            ).encode()
+        )
+
+        return h.hexdigest()
+
+    def get(self, key: str) -> dict[str, NDArray[Any]] | None:
+        """
+        Return the memory-mapped arrays of an entry or None.
+        """
+
+        entry = self._entry(key)
+
+        try:
+            rv = {f.stem: np.load(f, mmap_mode="r") for f in entry.glob("*.npy")}
+        except (OSError, ValueError):
+            return None
+
+        if not rv:
+            return None
+
+        self._touch(entry)
+
+        return rv
+
+    def put(self, key: str, data: dict[str, NDArray[Any]]) -> None:
+        """
+        Store arrays under the given key, replacing an existing entry.
+        """
+
+        tmp = self._tmp()
+
+        for name, arr in data.items():
+            np.save(tmp / f"{name}.npy", np.ascontiguousarray(arr))
+
+        self._commit(key, tmp)
+
+
+_mesh_cache: MeshCache | None = None
+
+
+def enableMeshCache(
+    path: str | Path | None = None, maxSize: int = DEFAULT_MAX_SIZE
+) -> MeshCache:
+    """
+    Enable the persistent mesh cache used by Shape.mesh, Shape.tessellate,
+    Shape.tessellateArrays and Shape.exportStl. Cached arrays are returned as
+    read-only memory maps.
+
+    :param path: Cache directory. Defaults to a subdirectory of the user cache directory.
+    :param maxSize: Maximum size of the cache in bytes.
+    """
+
+    global _mesh_cache
+
+    _mesh_cache = MeshCache(path or defaultCacheDir() / "mesh", maxSize)
+
+    return _mesh_cache
+
+
+def disableMeshCache() -> None:
+    """
+    Disable the persistent mesh cache. Stored entries are kept.
+    """
+
+    global _mesh_cache
+
+    _mesh_cache = None
+
+
+def getMeshCache() -> MeshCache | None:
+    """
+    Currently active mesh cache or None.
+    """
+
+    return _mesh_cache
+
+
+class ImportCache(DiskCache):
+    """
+    Cache of imported files keyed by the path, modification time and size of the
+    source file and the import settings. Every entry holds a single file in one of
+    the native binary formats.
+    """
+
+    @staticmethod
+    def key(path: str | Path, kind: str, **settings: Any) -> str:
+
+        p = Path(path).absolute()
+        st = p.stat()
+
+        h = hashlib.sha256()
+        h.update(
+            repr(
+                (
+                    CACHE_VERSION,
+                    OCP.__version__,
+                    kind,
+                    str(p),
+                    st.st_mtime_ns,
+                    st.st_size,
+                    sorted(settings.items()),
+                )
+            ).encode()
+        )
+
+        return h.hexdigest()
+
+    def get(self, key: str, name: str) -> Path | None:
+        """
+        Return the path of the file stored in an entry or None.
+        """
+
+        rv = self._entry(key) / name
+
+        if not rv.is_file():
+            return None
+
+        self._touch(rv.parent)
+
+        return rv
+
+    def put(self, key: str, name: str, write: Callable[[str], Any]) -> None:
+        """
+        Store a file under the given key. write is called with the path of the file.
+        """
+
+        tmp = self._tmp()
+
+        try:
+            write(str(tmp / name))
+        except Exception:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+
+        self._commit(key, tmp)
+
+
+_import_cache: ImportCache | None = None
+
+
+def enableImportCache(
+    path: str | Path | None = None, maxSize: int = DEFAULT_MAX_SIZE
+) -> ImportCache:
+    """
+    Enable the persistent import cache used by importers.importStep and
+    Assembly.importStep. Imported shapes are stored as binary BREP and assemblies
+    as XBF.
+
+    :param path: Cache directory. Defaults to a subdirectory of the user cache directory.
+    :param maxSize: Maximum size of the cache in bytes.
+    """
+
+    global _import_cache
+
+    _import_cache = ImportCache(path or defaultCacheDir() / "import", maxSize)
+
+    return _import_cache
+
+
+def disableImportCache() -> None:
+    """
+    Disable the persistent import cache. Stored entries are kept.
+    """
+
+    global _import_cache
+
+    _import_cache = None
+
+
+def getImportCache() -> ImportCache | None:
+    """
+    Currently active import cache or None.
+    """
+
+    return _import_cache
@@ -1,4 +1,4 @@
-from typing import IO, Optional, Union, cast, Dict, Any, Iterable
+from typing import IO, Optional, Union, cast, Dict, Any, Iterable, List
 from typing_extensions import Literal
 
 from OCP.VrmlAPI import VrmlAPI
@@ -6,12 +6,13 @@ from OCP.VrmlAPI import VrmlAPI
 from ..shapes import Shape, compound
 from ...types import UnitLiterals
 
-from .svg import getSVG, exportSVG
-from .json import JsonMesh
+from .svg import getSVG, getSVGViews, writeSVG, exportSVG
+from .json import JsonMesh, toBinaryJson
 from .amf import AmfWriter
 from .threemf import ThreeMFWriter
 from .dxf import exportDXF, exportDXFProjection, DxfDocument
 from .vtk import exportVTP
+from .batch import exportBatch
 
 
 class ExportTypes:
@@ -80,29 +81,41 @@ def export(
             raise ValueError("Unknown extensions, specify export type explicitly")
 
     if exportType == ExportTypes.TJS:
-        tess = shape.tessellate(tolerance, angularTolerance)
-        mesher = JsonMesh()
+        if opt.get("binary", False):
+            tess = shape.tessellateArrays(tolerance, angularTolerance, normals=True)
 
-        # add vertices
-        for v in tess[0]:
-            mesher.addVertex(v.x, v.y, v.z)
+            with open(fname, "w") as f:
+                f.write(toBinaryJson(tess, opt.get("quantize", False)))
 
-        # add triangles
-        for ixs in tess[1]:
-            mesher.addTriangleFace(*ixs)
+        else:
+            tess = shape.tessellateArrays(tolerance, angularTolerance)
+            mesher = JsonMesh()
+            mesher.addMesh(tess.vertices, tess.triangles)
 
-        with open(fname, "w") as f:
-            f.write(mesher.toJson())
+            with open(fname, "w") as f:
+                f.write(mesher.toJson())
 
     elif exportType == ExportTypes.SVG:
         with open(fname, "w") as f:
-            f.write(getSVG(shape, opt))
+            writeSVG(shape, f, opt)
 
     elif exportType == ExportTypes.AMF:
-        tess = shape.tessellate(tolerance, angularTolerance)
-        aw = AmfWriter(tess)
+        # one object per solid, including solids of nested compounds, and one
+        # for the remaining faces
+        shapes: List[Shape] = list(shape.Solids())
+
+        if shapes:
+            solid_faces = {f for s in shapes for f in s.Faces()}
+            faces = [f for f in shape.Faces() if f not in solid_faces]
+
+            if faces:
+                shapes.append(compound(faces))
+        else:
+            shapes = [shape]
+        tess = [s.tessellateArrays(tolerance, angularTolerance) for s in shapes]
+        aw = AmfWriter([t for t in tess if len(t.triangles)])
         with open(fname, "wb") as f:
-            aw.writeAmf(f)
+            aw.writeAmf(f, compress=opt.get("compress", False))
 
     elif exportType == ExportTypes.THREEMF:
         tmfw = ThreeMFWriter(shape, tolerance, angularTolerance, **opt)
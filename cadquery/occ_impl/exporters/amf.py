@@ -1,39 +1,115 @@
-import xml.etree.cElementTree as ET
+from os import PathLike, fspath
+from os.path import basename
+from typing import IO, Iterable, List, Sequence, Tuple, Union
+from zipfile import ZipFile, ZIP_DEFLATED
+
+import numpy as np
+
+from ..geom import Vector
+from ..shapes import Tessellation
+from .threemf import CHUNK_SIZE, _format
+
+VERTEX_TEMPLATE = (
+    "<vertex><coordinates><x>%r</x><y>%r</y><z>%r</z></coordinates></vertex>\n"
+)
+TRIANGLE_TEMPLATE = "<triangle><v1>%d</v1><v2>%d</v2><v3>%d</v3></triangle>\n"
+
+LegacyTessellation = Tuple[List[Vector], List[Tuple[int, int, int]]]
+
+
+def _isLegacy(t) -> bool:
+    """
+    Check if ``t`` is a legacy ``(vertices, triangles)`` tessellation.
+    """
+
+    if not isinstance(t, tuple) or len(t) != 2:
+        return False
+
+    vertices, triangles = t
+
+    return isinstance(vertices, list) and all(isinstance(v, Vector) for v in vertices)
+
+
+def _toTessellation(t: Union[Tessellation, LegacyTessellation]) -> Tessellation:
+
+    if isinstance(t, Tessellation):
+        return t
+
+    vertices, triangles = t
+
+    return Tessellation(
+        np.array([v.toTuple() for v in vertices], dtype=float).reshape(-1, 3),
+        np.array(triangles, dtype=np.int32).reshape(-1, 3),
+        np.zeros(len(triangles), dtype=np.int32),
+    )
 
 
 class AmfWriter(object):
-    def __init__(self, tessellation):
+    """
+    AMF writer. Accepts a single tessellation or a sequence of tessellations,
+    every tessellation is written as a separate object.
+    """
+
+    def __init__(
+        self,
+        tessellation: Union[Tessellation, LegacyTessellation, Sequence[Tessellation]],
+        chunkSize: int = CHUNK_SIZE,
+    ):
 
         self.units = "mm"
-        self.tessellation = tessellation
-
-    def writeAmf(self, outFile):
-        amf = ET.Element("amf", units=self.units)
-        # TODO: if result is a compound, we need to loop through them
-        object = ET.SubElement(amf, "object", id="0")
-        mesh = ET.SubElement(object, "mesh")
-        vertices = ET.SubElement(mesh, "vertices")
-        volume = ET.SubElement(mesh, "volume")
-
-        # add vertices
-        for v in self.tessellation[0]:
-            vtx = ET.SubElement(vertices, "vertex")
-            coord = ET.SubElement(vtx, "coordinates")
-            x = ET.SubElement(coord, "x")
-            x.text = str(v.x)
-            y = ET.SubElement(coord, "y")
-            y.text = str(v.y)
-            z = ET.SubElement(coord, "z")
-            z.text = str(v.z)
-
-        # add triangles
-        for t in self.tessellation[1]:
-            triangle = ET.SubElement(volume, "triangle")
-            v1 = ET.SubElement(triangle, "v1")
-            v1.text = str(t[0])
-            v2 = ET.SubElement(triangle, "v2")
-            v2.text = str(t[1])
-            v3 = ET.SubElement(triangle, "v3")
-            v3.text = str(t[2])
-
-        amf = ET.ElementTree(amf).write(outFile, xml_declaration=True)
+        self.chunkSize = chunkSize
+
+        if isinstance(tessellation, Tessellation) or _isLegacy(tessellation):
+            self.tessellations = [_toTessellation(tessellation)]
+        else:
+            self.tessellations = [_toTessellation(t) for t in tessellation]
+
+    def writeAmf(
+        self, outFile: Union[PathLike, str, IO[bytes]], compress: bool = False
+    ):
+        """
+        Write to the given file, optionally as a zip compressed AMF.
+        """
+
+        if compress:
+            if isinstance(outFile, (str, PathLike)):
+                name = basename(fspath(outFile))
+            else:
+                name = basename(getattr(outFile, "name", "model.amf"))
+
+            with ZipFile(outFile, "w", ZIP_DEFLATED) as zf:
+                with zf.open(name, "w", force_zip64=True) as f:
+                    self._write(f)
+
+        elif isinstance(outFile, (str, PathLike)):
+            with open(outFile, "wb") as f:
+                self._write(f)
+
+        else:
+            self._write(outFile)
+
+    def _write(self, f: IO[bytes]):
+
+        for chunk in self._writeAmf():
+            f.write(chunk)
+
+    def _writeAmf(self) -> Iterable[bytes]:
+
+        yield (
+            "<?xml version='1.0' encoding='utf-8'?>\n" f'<amf units="{self.units}">\n'
+        ).encode()
+
+        for i, t in enumerate(self.tessellations):
+            yield f'<object id="{i}">\n<mesh>\n<vertices>\n'.encode()
+
+            # add vertices
+            yield from _format(VERTEX_TEMPLATE, t.vertices, self.chunkSize)
+
+            yield b"</vertices>\n<volume>\n"
+
+            # add triangles
+            yield from _format(TRIANGLE_TEMPLATE, t.triangles, self.chunkSize)
+
+            yield b"</volume>\n</mesh>\n</object>\n"
+
+        yield b"</amf>\n"
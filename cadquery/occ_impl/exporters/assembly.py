@@ -3,7 +3,7 @@ import uuid
 
 from tempfile import TemporaryDirectory
 from shutil import make_archive
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 from typing_extensions import Literal
 
 from vtkmodules.vtkIOExport import vtkJSONSceneExporter, vtkVRMLExporter
@@ -40,15 +40,16 @@ from OCP.TCollection import (
     TCollection_HAsciiString,
 )
 from OCP.PCDM import PCDM_StoreStatus
-from OCP.RWGltf import RWGltf_CafWriter
-from OCP.TColStd import TColStd_IndexedDataMapOfStringString
-from OCP.Message import Message_ProgressRange
 from OCP.Interface import Interface_Static
+from OCP.Message import Message_ProgressRange
 
 from ..assembly import AssemblyProtocol, toCAF, toVTK, toFusedCAF
 from ..geom import Location
 from ..shapes import Shape, Compound
 from ...types import UnitLiterals
+from .stl import StlWriter
+from .threemf import ThreeMFWriter, Unit
+from .gltf import GltfWriter
 
 
 class ExportModes:
@@ -97,6 +98,9 @@ def exportAssembly(
     :type precision_mode: int
     :param name_geometries: Propagate subshape names to geometric STEP entities.
     :type name_geometries: bool
+    :param progress: Progress range of a user supplied Message_ProgressIndicator, used to
+        report the progress of the transfer to STEP entities and to cancel the export.
+    :type progress: Message_ProgressRange
     """
 
     # Handle the extra settings for the STEP export
@@ -107,6 +111,7 @@ def exportAssembly(
     fuzzy_tol = kwargs["fuzzy_tol"] if "fuzzy_tol" in kwargs else None
     glue = kwargs["glue"] if "glue" in kwargs else False
     name_geometries = kwargs.get("name_geometries", False)
+    progress = kwargs.get("progress", Message_ProgressRange())
 
     # Handle the doc differently based on which mode we are using
     if mode == "fused":
@@ -127,7 +132,11 @@ def exportAssembly(
     Interface_Static.SetCVal_s(
         "write.step.unit", outputUnit if outputUnit is not None else unit.upper()
     )
-    writer.Transfer(doc, STEPControl_StepModelType.STEPControl_AsIs)
+    writer.Transfer(doc, STEPControl_StepModelType.STEPControl_AsIs, None, progress)
+
+    # transfer canceled by the user
+    if progress.UserBreak():
+        return False
 
     if name_geometries:
         finder = session.TransferWriter().FinderProcess()
@@ -388,6 +397,77 @@ def exportCAF(assy: AssemblyProtocol, path: str, binary: bool = False) -> bool:
     return status == PCDM_StoreStatus.PCDM_SS_OK
 
 
+def _instances(
+    assy: AssemblyProtocol,
+) -> Dict[Tuple[Shape, ...], Tuple[Shape, List[Location]]]:
+    """
+    Group the instances of an assembly by their underlying shapes.
+
+    Workplane objects yield a new compound on every iteration, so compounds are
+    keyed by their children. The first compound of every group is kept.
+    """
+
+    rv: Dict[Tuple[Shape, ...], Tuple[Shape, List[Location]]] = {}
+
+    for shape, _, loc, _ in assy:
+        key = tuple(shape) if isinstance(shape, Compound) else (shape,)
+        rv.setdefault(key, (shape, []))[1].append(loc)
+
+    return rv
+
+
+def exportSTL(
+    assy: AssemblyProtocol,
+    path: str,
+    tolerance: float = 1e-3,
+    angularTolerance: float = 0.1,
+    ascii: bool = False,
+) -> bool:
+    """
+    Export an assembly to a STL file.
+
+    Every unique shape is meshed once and all its instances are streamed to the file
+    with their locations applied, so no located copy of the whole assembly is built.
+    """
+
+    instances = _instances(assy)
+
+    with open(path, "wb") as f, StlWriter(f, ascii) as writer:
+        for shape, locs in instances.values():
+            tess = shape.tessellateArrays(tolerance, angularTolerance)
+
+            for loc in locs:
+                writer.add(tess.vertices, tess.triangles, loc)
+
+    return True
+
+
+def export3MF(
+    assy: AssemblyProtocol,
+    path: str,
+    tolerance: float = 1e-3,
+    angularTolerance: float = 0.1,
+    unit: Unit = "millimeter",
+) -> bool:
+    """
+    Export an assembly to a 3MF file.
+
+    Every unique shape is written as a single mesh object, its instances are
+    written as components with transforms.
+    """
+
+    instances = _instances(assy)
+
+    writer = ThreeMFWriter(None, tolerance, angularTolerance, unit)
+
+    for shape, locs in instances.values():
+        writer.add(shape, locs)
+
+    writer.write3mf(path)
+
+    return True
+
+
 def _vtkRenderWindow(
     assy: AssemblyProtocol, tolerance: float = 1e-3, angularTolerance: float = 0.1
 ) -> vtkRenderWindow:
@@ -443,9 +523,18 @@ def exportGLTF(
     binary: Optional[bool] = None,
     tolerance: float = 1e-3,
     angularTolerance: float = 0.1,
-):
+    lods: int = 0,
+) -> bool:
     """
     Export an assembly to a gltf file.
+
+    Every unique shape is meshed once and referenced by a node per instance. The
+    assembly is not modified, +Z up is mapped to glTF's +Y up by the root node.
+    If lods > 0, the given number of coarse levels of detail is written per unique
+    shape using the MSFT_lod extension.
+
+    Errors while writing are not caught, e.g. an unwritable path raises OSError.
+    Hence True is returned whenever the function returns.
     """
 
     # If the caller specified the binary option, respect it
@@ -458,19 +547,8 @@ def exportGLTF(
         if len(path_parts) > 0 and path_parts[-1] == "gltf":
             binary = False
 
-    # map from CadQuery's right-handed +Z up coordinate system to glTF's right-handed +Y up coordinate system
-    # https://registry.khronos.org/glTF/specs/2.0/glTF-2.0.html#coordinate-system-and-units
-    orig_loc = assy.loc
-    assy.loc *= Location((0, 0, 0), (1, 0, 0), -90)
-
-    _, doc = toCAF(assy, True, True, tolerance, angularTolerance)
-
-    writer = RWGltf_CafWriter(TCollection_AsciiString(path), binary)
-    result = writer.Perform(
-        doc, TColStd_IndexedDataMapOfStringString(), Message_ProgressRange()
-    )
-
-    # restore coordinate system after exporting
-    assy.loc = orig_loc
+    writer = GltfWriter(tolerance, angularTolerance, lods)
+    writer.add(assy)
+    writer.write(path, binary)
 
-    return result
+    return True
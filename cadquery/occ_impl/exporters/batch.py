@@ -0,0 +1,230 @@
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from time import perf_counter
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from OCP.TopoDS import TopoDS_Shape
+
+from ..assembly import AssemblyProtocol
+from ..geom import Location
+from ..shapes import Shape, Compound
+
+# formats handled by Assembly.export, the rest goes through exporters.export
+ASSEMBLY_TYPES = ("STEP", "XML", "XBF", "VRML", "VTKJS", "GLTF", "GLB", "STL", "3MF")
+SHAPE_TYPES = ("AMF", "SVG", "TJS", "DXF", "VTP", "BREP", "BIN")
+
+# formats that are not available for shapes
+ASSEMBLY_ONLY_TYPES = ("XML", "XBF", "VTKJS", "GLTF", "GLB")
+
+# mesh based formats
+MESH_TYPES = ("VRML", "VTKJS", "GLTF", "GLB", "STL", "3MF", "AMF", "TJS", "VTP")
+
+# object to be exported by the current process, set by _init, and its compound
+# built on first use by shape only formats
+_obj: Any = None
+_compound: Optional[Compound] = None
+
+
+class _Pickler(pickle.Pickler):
+    """
+    Pickler storing shapes as references into a list. The shapes are serialized
+    together afterwards, so that shared TShapes and their triangulations are
+    transferred once and instances are preserved.
+    """
+
+    shapes: Dict[Tuple[Shape, Any], int]
+
+    def __init__(self, f: BytesIO):
+
+        super().__init__(f, pickle.HIGHEST_PROTOCOL)
+        self.shapes = {}
+
+    def persistent_id(self, obj: Any) -> Any:
+
+        if not isinstance(obj, Shape):
+            return None
+
+        key = (obj, obj.wrapped.Orientation())
+        ix = self.shapes.setdefault(key, len(self.shapes))
+
+        return (ix, type(obj), obj.forConstruction, getattr(obj, "label", ""))
+
+
+class _Unpickler(pickle.Unpickler):
+    """
+    Unpickler resolving the shape references of _Pickler.
+    """
+
+    shapes: List[TopoDS_Shape]
+
+    def __init__(self, f: BytesIO, shapes: List[TopoDS_Shape]):
+
+        super().__init__(f)
+        self.shapes = shapes
+
+    def persistent_load(self, pid: Any) -> Shape:
+
+        ix, cls, forConstruction, label = pid
+
+        rv = cls.__new__(cls)
+        Shape.__init__(rv, self.shapes[ix])
+
+        rv.forConstruction = forConstruction
+        rv.label = label
+
+        return rv
+
+
+def _dumps(obj: Any) -> Tuple[bytes, bytes]:
+    """
+    Serialize an object and all the shapes it references.
+    """
+
+    data = BytesIO()
+    pickler = _Pickler(data)
+    pickler.dump(obj)
+
+    shapes = BytesIO()
+    Compound.makeCompound(s for s, _ in pickler.shapes).exportBin(shapes)
+
+    return data.getvalue(), shapes.getvalue()
+
+
+def _loads(data: bytes, shapes: bytes) -> Any:
+    """
+    Deserialize an object serialized with _dumps.
+    """
+
+    compound = Shape.importBin(BytesIO(shapes))
+
+    return _Unpickler(BytesIO(data), [s.wrapped for s in compound]).load()
+
+
+def _init(obj: Union[Shape, AssemblyProtocol]) -> None:
+    """
+    Store the object to be exported, so that it is transferred once per process.
+    """
+
+    global _obj, _compound
+
+    _obj = obj
+    _compound = None
+
+
+def _initWorker(data: bytes, shapes: bytes) -> None:
+    """
+    Store the object to be exported in a worker process.
+    """
+
+    _init(_loads(data, shapes))
+
+
+def _export(
+    path: str, exportType: Any, tolerance: float, angularTolerance: float
+) -> float:
+    """
+    Export the current object to a single file and return the elapsed time.
+    """
+
+    from . import export
+    from ...assembly import Assembly
+
+    global _compound
+
+    t0 = perf_counter()
+
+    if isinstance(_obj, Shape) and exportType in ASSEMBLY_ONLY_TYPES:
+        Assembly(_obj).export(
+            path, exportType, tolerance=tolerance, angularTolerance=angularTolerance
+        )
+    elif isinstance(_obj, Shape):
+        export(_obj, path, exportType, tolerance, angularTolerance)
+    elif exportType in SHAPE_TYPES:
+        if _compound is None:
+            _compound = _obj.toCompound()
+
+        export(_compound, path, exportType, tolerance, angularTolerance)
+    else:
+        _obj.export(
+            path, exportType, tolerance=tolerance, angularTolerance=angularTolerance
+        )
+
+    return perf_counter() - t0
+
+
+def _type(path: str) -> str:
+    """
+    Export type inferred from the extension.
+    """
+
+    rv = path.split(".")[-1].upper()
+
+    if rv not in ASSEMBLY_TYPES + SHAPE_TYPES:
+        raise ValueError(f"Unknown extension of {path}, cannot infer the export type")
+
+    return rv
+
+
+def exportBatch(
+    obj: Union[Shape, AssemblyProtocol],
+    paths: Iterable[str],
+    tolerance: float = 0.1,
+    angularTolerance: float = 0.1,
+    processes: Optional[int] = None,
+) -> Tuple[float, Dict[str, float]]:
+    """
+    Export a shape or an assembly to several files in one go. Formats are
+    inferred from the extensions.
+
+    The assembly is traversed and every unique shape is meshed once upfront, the
+    writers then reuse the stored triangulations. Individual files are written by
+    a pool of processes. The object is serialized once, together with all unique
+    shapes and their triangulations, so that instances are preserved by the workers.
+
+    Every worker deserializes the object and traverses the assembly again, which
+    only pays off when several files are written. A single file is therefore
+    always exported in the current process.
+
+    :param obj: Shape or assembly to be exported.
+    :param paths: Output filenames.
+    :param tolerance: the deflection tolerance, in model units. Default 0.1.
+    :param angularTolerance: the angular tolerance, in radians. Default 0.1.
+    :param processes: Number of worker processes, None uses the number of CPUs and
+        1 exports serially in the current process.
+    :return: Meshing time and time spent on every file in seconds.
+    """
+
+    targets = [(p, _type(p)) for p in paths]
+    types = {t for _, t in targets}
+
+    t0 = perf_counter()
+
+    # mesh the unique shapes once, triangulations are kept by the shapes
+    if isinstance(obj, Shape):
+        shapes: Set[Shape] = {obj}
+    else:
+        shapes = {s.located(Location()) for s, _, _, _ in obj}
+
+    if types & set(MESH_TYPES):
+        for s in shapes:
+            s.mesh(tolerance, angularTolerance)
+
+    mesh = perf_counter() - t0
+    rv: Dict[str, float] = {}
+
+    if processes == 1 or len(targets) <= 1:
+        _init(obj)
+        rv.update((p, _export(p, t, tolerance, angularTolerance)) for p, t in targets)
+    else:
+        with ProcessPoolExecutor(
+            processes, initializer=_initWorker, initargs=_dumps(obj)
+        ) as pool:
+            futures = [
+                (p, pool.submit(_export, p, t, tolerance, angularTolerance))
+                for p, t in targets
+            ]
+
+            rv.update((p, f.result()) for p, f in futures)
+
+    return mesh, rv
@@ -14,6 +14,8 @@ from typing import (
     runtime_checkable,
 )
 
+import numpy as np
+
 import ezdxf
 from ezdxf import units, zoom
 from ezdxf.entities import factory
@@ -90,6 +92,7 @@ class DxfDocument:
         metadata: Union[Dict[str, str], None] = None,
         approx: Optional[ApproxOptions] = None,
         tolerance: float = 1e-3,
+        polylines: bool = False,
     ):
         """Initialize DXF document.
 
@@ -110,6 +113,8 @@ class DxfDocument:
                 all curves approximated as arcs and straight segments
 
         :param tolerance: Approximation tolerance for converting :class:`cadquery.Workplane` objects to DXF entities.
+        :param polylines: Collapse chains of consecutive lines and arcs lying in a plane
+            parallel to XY into single LWPOLYLINE entities with bulges.
         """
         if metadata is None:
             metadata = {}
@@ -122,6 +127,7 @@ class DxfDocument:
 
         self.approx = approx
         self.tolerance = tolerance
+        self.polylines = polylines
 
         self.document = ezdxf.new(dxfversion=dxfversion, setup=setup, units=doc_units)  # type: ignore[attr-defined]
         self.msp = self.document.modelspace()
@@ -166,22 +172,30 @@ class DxfDocument:
             general_attributes["layer"] = layer
 
         if self.approx == "spline":
-            edges = [
-                e.toSplines() if e.geomType() == "BSPLINE" else e
-                for e in self._ordered_edges(shape_)
+            wires = [
+                [e.toSplines() if e.geomType() == "BSPLINE" else e for e in w]
+                for w in self._ordered_wires(shape_)
             ]
 
         elif self.approx == "arc":
-            edges = []
+            wires = []
 
             # this is needed to handle free wires
             for el in shape_.Wires():
-                edges.extend(
-                    self._ordered_edges(Face.makeFromWires(el).toArcs(self.tolerance))
+                wires.extend(
+                    self._ordered_wires(Face.makeFromWires(el).toArcs(self.tolerance))
                 )
 
         else:
-            edges = self._ordered_edges(shape_)
+            wires = self._ordered_wires(shape_)
+
+        edges = []
+
+        for w in wires:
+            if self.polylines:
+                edges.extend(self._add_polylines(w, general_attributes))
+            else:
+                edges.extend(w)
 
         for edge in edges:
             converter = self._DISPATCH_MAP.get(edge.geomType(), None)
@@ -201,18 +215,125 @@ class DxfDocument:
 
         return self
 
+    @classmethod
+    def _ordered_edges(cls, s: Shape) -> List[Edge]:
+
+        return [e for w in cls._ordered_wires(s) for e in w]
+
     @staticmethod
-    def _ordered_edges(s: Shape) -> List[Edge]:
+    def _ordered_wires(s: Shape) -> List[List[Edge]]:
 
-        rv: List[Edge] = []
+        rv: List[List[Edge]] = []
 
         # iterate over wires and then edges
         for w in s.Wires():
-            rv.extend(w)
+            rv.append(list(w))
 
         # add free edges
         if isinstance(s, Compound):
-            rv.extend(e for e in s if isinstance(e, Edge))
+            rv.extend([e] for e in s if isinstance(e, Edge))
+
+        return rv
+
+    @classmethod
+    def _chainable(cls, edge: Edge) -> bool:
+        """Check if an edge can be a segment of a LWPOLYLINE.
+
+        :param edge: CadQuery Edge
+
+        :return: True for lines and for arcs with the axis parallel to Z
+        """
+
+        geom_type = edge.geomType()
+
+        if geom_type == "LINE":
+            return True
+        elif geom_type == "CIRCLE" and not edge.IsClosed():
+            z = edge._geomAdaptor().Circle().Axis().Direction().Z()
+            return abs(abs(z) - 1) < cls.CURVE_TOLERANCE
+
+        return False
+
+    def _add_polylines(
+        self, edges: List[Edge], attributes: Dict[str, Any]
+    ) -> List[Edge]:
+        """Add chains of consecutive lines and arcs as LWPOLYLINE entities.
+
+        :param edges: ordered and connected edges of a wire
+        :param attributes: general DXF entity attributes
+
+        :return: edges that were not converted
+        """
+
+        chainable = [self._chainable(e) for e in edges]
+
+        if not any(chainable):
+            return edges
+
+        closed = (edges[0].startPoint() - edges[-1].endPoint()).Length < self.tolerance
+
+        # start closed wires after an edge that cannot be chained
+        if closed and not all(chainable):
+            ix = chainable.index(False) + 1
+            edges = edges[ix:] + edges[:ix]
+            chainable = chainable[ix:] + chainable[:ix]
+            closed = False
+
+        rv: List[Edge] = []
+        chains: List[List[Edge]] = []
+        chain: List[Edge] = []
+
+        for e, flag in zip(edges, chainable):
+            if flag:
+                chain.append(e)
+            else:
+                rv.append(e)
+                if chain:
+                    chains.append(chain)
+                chain = []
+
+        if chain:
+            chains.append(chain)
+
+        for chain in chains:
+            arcs = np.array([e.geomType() == "CIRCLE" for e in chain])
+
+            start = np.array([e.startPoint().toTuple() for e in chain])
+            end = np.array([e.endPoint().toTuple() for e in chain])
+            mid = start.copy()
+
+            if arcs.any():
+                mid[arcs] = [
+                    e.positionAt(0.5).toTuple() for e, arc in zip(chain, arcs) if arc
+                ]
+
+            # all segments need to lie in a single plane parallel to XY
+            z = np.concatenate((start[:, 2], end[:, 2], mid[:, 2]))
+
+            if np.ptp(z) > self.tolerance:
+                rv.extend(chain)
+                continue
+
+            # bulge is the ratio of the sagitta to the half chord, positive for CCW
+            chord = end[:, :2] - start[:, :2]
+            offset = mid[:, :2] - start[:, :2]
+            cross = chord[:, 0] * offset[:, 1] - chord[:, 1] * offset[:, 0]
+            length = np.sum(chord ** 2, axis=1)
+
+            bulge = np.zeros(len(chain))
+            bulge[arcs] = -2 * cross[arcs] / length[arcs]
+
+            points = np.column_stack((start[:, :2], bulge))
+
+            if not closed:
+                points = np.vstack((points, (*end[-1, :2], 0)))
+
+            self.msp.add_lwpolyline(
+                points.tolist(),
+                format="xyb",
+                close=closed,
+                dxfattribs={**attributes, "elevation": z[0]},
+            )
 
         return rv
 
@@ -373,6 +494,7 @@ def exportDXF(
     tolerance: float = 1e-3,
     *,
     doc_units: int = units.MM,
+    polylines: bool = False,
 ) -> None:
     """
     Export Workplane content to DXF. Works with 2D sections.
@@ -384,9 +506,13 @@ def exportDXF(
         in all curves being approximated as arcs and straight segments.
     :param tolerance: Approximation tolerance.
     :param doc_units: ezdxf document/modelspace :doc:`units <ezdxf-stable:concepts/units>` (in. = ``1``, mm = ``4``).
+    :param polylines: Collapse chains of lines and arcs into LWPOLYLINE entities, which
+        results in smaller files and faster export of sketches with many segments.
     """
 
-    dxf = DxfDocument(approx=approx, tolerance=tolerance, doc_units=doc_units)
+    dxf = DxfDocument(
+        approx=approx, tolerance=tolerance, doc_units=doc_units, polylines=polylines
+    )
 
     if isinstance(w, (WorkplaneLike, Shape)):
         dxf.add_shape(w)
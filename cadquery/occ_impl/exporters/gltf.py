@@ -0,0 +1,408 @@
+import json
+import os.path
+from struct import pack
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+from OCP.Quantity import Quantity_TOC_RGB
+
+from ..assembly import AssemblyProtocol, Color
+from ..geom import Location
+from ..shapes import Shape, Tessellation, _trsf_to_array
+from ..mesh import lods as _lods
+
+# glTF enums
+FLOAT = 5126
+UNSIGNED_INT = 5125
+ARRAY_BUFFER = 34962
+ELEMENT_ARRAY_BUFFER = 34963
+
+GLB_MAGIC = 0x46546C67
+GLB_JSON = 0x4E4F534A
+GLB_BIN = 0x004E4942
+
+# rotation of -90 deg about X as a quaternion, maps +Z up to glTF's +Y up
+# https://registry.khronos.org/glTF/specs/2.0/glTF-2.0.html#coordinate-system-and-units
+Y_UP = [-(0.5 ** 0.5), 0.0, 0.0, 0.5 ** 0.5]
+
+
+def _matrix(loc: Location) -> Optional[List[float]]:
+    """
+    Column major glTF matrix of a location, None for the identity.
+    """
+
+    T = _trsf_to_array(loc.wrapped.Transformation())
+
+    if np.allclose(T, np.eye(3, 4)):
+        return None
+
+    return np.vstack((T, (0, 0, 0, 1))).T.ravel().tolist()
+
+
+def _pad(data: bytes, fill: bytes = b"\0") -> bytes:
+    """
+    Pad to a multiple of 4 bytes.
+    """
+
+    return data + fill * (-len(data) % 4)
+
+
+class GltfWriter(object):
+    """
+    Instanced glTF writer. Every unique shape (TShape) is meshed and stored once,
+    all its instances are nodes referencing the same mesh with their own transforms.
+    The assembly is not modified, the conversion to +Y up is done by the root node.
+
+    If lods > 0, the given number of coarse levels of detail is generated per unique
+    shape with :func:`~cadquery.occ_impl.mesh.lods` and attached to the mesh nodes
+    with the MSFT_lod extension. Coarse levels have no normals.
+    """
+
+    tolerance: float
+    angularTolerance: float
+    lods: int
+
+    nodes: List[Dict[str, Any]]
+    meshes: List[Dict[str, Any]]
+    materials: List[Dict[str, Any]]
+    accessors: List[Dict[str, Any]]
+    bufferViews: List[Dict[str, Any]]
+    chunks: List[bytes]
+
+    # (tessellation, position, normal and index accessors) per level of every
+    # unique shape, finest first
+    _geometry: Dict[
+        Shape, Optional[List[Tuple[Tessellation, int, Optional[int], int]]]
+    ]
+    _meshes: Dict[Tuple[Any, ...], List[int]]
+    _materials: Dict[Tuple[float, ...], int]
+
+    def __init__(
+        self, tolerance: float = 1e-3, angularTolerance: float = 0.1, lods: int = 0
+    ):
+
+        self.tolerance = tolerance
+        self.angularTolerance = angularTolerance
+        self.lods = lods
+
+        self.nodes = [dict(rotation=Y_UP, children=[])]
+        self.meshes = []
+        self.materials = []
+        self.accessors = []
+        self.bufferViews = []
+        self.chunks = []
+
+        self._offset = 0
+        self._geometry = {}
+        self._meshes = {}
+        self._materials = {}
+
+    def add(self, assy: AssemblyProtocol) -> None:
+        """
+        Add an assembly as a child of the root node.
+        """
+
+        self.nodes[0]["children"].append(self._add_node(assy, None))
+
+    def write(self, path: str, binary: bool = True) -> None:
+        """
+        Write a .glb file or a .gltf file with a .bin buffer next to it. I/O errors
+        are propagated.
+        """
+
+        buffer = b"".join(self.chunks)
+
+        rv: Dict[str, Any] = dict(
+            asset=dict(version="2.0", generator="CadQuery"),
+            scene=0,
+            scenes=[dict(nodes=[0])],
+            nodes=self.nodes,
+        )
+
+        for name in ("meshes", "materials", "accessors", "bufferViews"):
+            if getattr(self, name):
+                rv[name] = getattr(self, name)
+
+        if buffer:
+            rv["buffers"] = [dict(byteLength=len(buffer))]
+
+        if any("extensions" in n for n in self.nodes):
+            rv["extensionsUsed"] = ["MSFT_lod"]
+
+        if binary:
+            content = _pad(json.dumps(rv, sort_keys=True).encode(), b" ")
+
+            chunks = [pack("<II", len(content), GLB_JSON), content]
+            if buffer:
+                chunks += [pack("<II", len(buffer), GLB_BIN), buffer]
+
+            length = 12 + sum(len(c) for c in chunks)
+
+            with open(path, "wb") as f:
+                f.write(pack("<III", GLB_MAGIC, 2, length))
+                for c in chunks:
+                    f.write(c)
+        else:
+            if buffer:
+                bin_path = os.path.splitext(path)[0] + ".bin"
+                rv["buffers"][0]["uri"] = os.path.basename(bin_path)
+
+                with open(bin_path, "wb") as f:
+                    f.write(buffer)
+
+            with open(path, "w") as f:
+                json.dump(rv, f, sort_keys=True)
+
+    def _add_node(self, el: AssemblyProtocol, color: Optional[Color]) -> int:
+        """
+        Recursively add an assembly node. Colors are inherited from the parents.
+        """
+
+        color = el.color if el.color else color
+
+        rv = len(self.nodes)
+        node: Dict[str, Any] = dict(name=el.name)
+        self.nodes.append(node)
+
+        shapes = list(el.shapes) if el.obj else []
+        children = list(el.children)
+        subshape_colors = dict(el._subshape_colors.items())
+
+        # single part leafs hold the mesh directly
+        if len(shapes) == 1 and not children:
+            s = shapes[0]
+            matrix = _matrix(el.loc * s.location())
+            meshes = self._mesh(s, color, subshape_colors)
+
+            if meshes is not None:
+                self._set_meshes(node, meshes, matrix)
+        else:
+            matrix = _matrix(el.loc)
+            node_children = []
+
+            for s in shapes:
+                meshes = self._mesh(s, color, subshape_colors)
+
+                if meshes is not None:
+                    node_children.append(len(self.nodes))
+                    child: Dict[str, Any] = dict()
+                    self.nodes.append(child)
+
+                    self._set_meshes(child, meshes, _matrix(s.location()))
+
+            node_children.extend(self._add_node(ch, color) for ch in children)
+
+            if node_children:
+                node["children"] = node_children
+
+        if matrix:
+            node["matrix"] = matrix
+
+        return rv
+
+    def _set_meshes(
+        self, node: Dict[str, Any], meshes: List[int], matrix: Optional[List[float]]
+    ) -> None:
+        """
+        Set the mesh of a node, coarse levels are added as MSFT_lod nodes.
+        """
+
+        node["mesh"] = meshes[0]
+
+        ids = []
+        for mesh in meshes[1:]:
+            ids.append(len(self.nodes))
+            self.nodes.append(dict(mesh=mesh))
+
+        if matrix:
+            for i in ids:
+                self.nodes[i]["matrix"] = matrix
+
+            node["matrix"] = matrix
+
+        if ids:
+            node["extensions"] = dict(MSFT_lod=dict(ids=ids))
+
+    def _mesh(
+        self, s: Shape, color: Optional[Color], subshape_colors: Dict[Shape, Color],
+    ) -> Optional[List[int]]:
+        """
+        Get or create the meshes of all levels of a shape with the given colors.
+        """
+
+        base = s.located(Location())
+        geometry = self._geometry_of(base)
+
+        if geometry is None:
+            return None
+
+        # per face colors of this shape
+        face_colors: Dict[int, int] = {}
+
+        if subshape_colors:
+            face_ixs = {f: i for i, f in enumerate(s.Faces())}
+
+            for k, c in subshape_colors.items():
+                for f in k.Faces():
+                    if f in face_ixs:
+                        face_colors[face_ixs[f]] = self._material(c)
+
+        default = self._material(color) if color else -1
+
+        key = (base, default, tuple(sorted(face_colors.items())))
+
+        if key in self._meshes:
+            return self._meshes[key]
+
+        rv = []
+
+        for tess, position, normal, indices in geometry:
+
+            if face_colors:
+                # split the triangles by material
+                materials = np.full(len(tess.faces), default)
+                for f, m in face_colors.items():
+                    materials[tess.faces == f] = m
+
+                groups = []
+                for m in np.unique(materials).tolist():
+                    triangles = tess.triangles[materials == m]
+                    groups.append((m, self._accessor(triangles.ravel(), "SCALAR")))
+            else:
+                groups = [(default, indices)]
+
+            attributes = dict(POSITION=position)
+            if normal is not None:
+                attributes["NORMAL"] = normal
+
+            primitives = []
+
+            for m, ix in groups:
+                primitive: Dict[str, Any] = dict(attributes=attributes, indices=ix)
+                if m >= 0:
+                    primitive["material"] = m
+
+                primitives.append(primitive)
+
+            rv.append(len(self.meshes))
+            self.meshes.append(dict(primitives=primitives))
+
+        self._meshes[key] = rv
+
+        return rv
+
+    def _geometry_of(
+        self, base: Shape
+    ) -> Optional[List[Tuple[Tessellation, int, Optional[int], int]]]:
+        """
+        Mesh a shape once and store its vertices, normals and triangles, followed
+        by the vertices and triangles of the coarse levels.
+        """
+
+        if base in self._geometry:
+            return self._geometry[base]
+
+        tess = base.tessellateArrays(
+            self.tolerance, self.angularTolerance, normals=True
+        )
+
+        if len(tess.triangles) == 0:
+            rv = None
+        else:
+            assert tess.normals is not None
+
+            rv = [
+                (
+                    tess,
+                    self._accessor(tess.vertices, "VEC3", bounds=True),
+                    self._accessor(tess.normals, "VEC3"),
+                    self._accessor(tess.triangles.ravel(), "SCALAR"),
+                )
+            ]
+
+            if self.lods:
+                levels = _lods(
+                    base, self.tolerance, self.angularTolerance, self.lods + 1
+                )
+
+                rv.extend(
+                    (
+                        lod,
+                        self._accessor(lod.vertices, "VEC3", bounds=True),
+                        None,
+                        self._accessor(lod.triangles.ravel(), "SCALAR"),
+                    )
+                    for lod in levels[1:]
+                    if len(lod.triangles)
+                )
+
+        self._geometry[base] = rv
+
+        return rv
+
+    def _material(self, color: Color) -> int:
+        """
+        Get or create the material of a color. glTF colors are linear RGB.
+        """
+
+        rgb = color.wrapped.GetRGB().Values(Quantity_TOC_RGB)
+        rgba = (*rgb, color.wrapped.Alpha())
+
+        if rgba not in self._materials:
+            material: Dict[str, Any] = dict(
+                pbrMetallicRoughness=dict(
+                    baseColorFactor=list(rgba), metallicFactor=0.0, roughnessFactor=0.5
+                )
+            )
+            if rgba[3] < 1:
+                material["alphaMode"] = "BLEND"
+
+            self._materials[rgba] = len(self.materials)
+            self.materials.append(material)
+
+        return self._materials[rgba]
+
+    def _accessor(self, arr: NDArray, kind: str, bounds: bool = False) -> int:
+        """
+        Store an array in the buffer and add an accessor for it. Vector arrays are
+        stored as float32 vertex attributes, scalar arrays as uint32 indices.
+        """
+
+        if kind == "SCALAR":
+            data = np.ascontiguousarray(arr, dtype="<u4")
+            componentType, target = UNSIGNED_INT, ELEMENT_ARRAY_BUFFER
+        else:
+            data = np.ascontiguousarray(arr, dtype="<f4")
+            componentType, target = FLOAT, ARRAY_BUFFER
+
+        content = data.tobytes()
+
+        self.bufferViews.append(
+            dict(
+                buffer=0,
+                byteOffset=self._offset,
+                byteLength=len(content),
+                target=target,
+            )
+        )
+
+        content = _pad(content)
+        self.chunks.append(content)
+        self._offset += len(content)
+
+        accessor: Dict[str, Any] = dict(
+            bufferView=len(self.bufferViews) - 1,
+            componentType=componentType,
+            count=len(data),
+            type=kind,
+        )
+
+        if bounds:
+            accessor["min"] = data.min(axis=0).tolist()
+            accessor["max"] = data.max(axis=0).tolist()
+
+        self.accessors.append(accessor)
+
+        return len(self.accessors) - 1
@@ -4,6 +4,16 @@
     https://github.com/mrdoob/three.js/wiki/JSON-Model-format-3.0
 """
 
+import json
+
+from base64 import b64encode
+from typing import Any, Dict
+
+import numpy as np
+from numpy.typing import NDArray
+
+from ..shapes import Tessellation
+
 JSON_TEMPLATE = """\
 {
     "metadata" :
@@ -67,6 +77,17 @@ class JsonMesh(object):
         self.nFaces += 1
         self.faces.extend([0, int(i), int(j), int(k)])
 
+    # add a whole triangle mesh at once
+    def addMesh(self, vertices: NDArray[np.float64], triangles: NDArray[np.int32]):
+        faces = np.zeros((len(triangles), 4), dtype=np.int64)
+        faces[:, 1:] = triangles
+        faces[:, 1:] += self.nVertices
+
+        self.vertices.extend(vertices.ravel().tolist())
+        self.faces.extend(faces.ravel().tolist())
+        self.nVertices += len(vertices)
+        self.nFaces += len(triangles)
+
     """
         Get a json model from this model.
         For now we'll forget about colors, vertex normals, and all that stuff
@@ -79,3 +100,90 @@ class JsonMesh(object):
             "nVertices": self.nVertices,
             "nFaces": self.nFaces,
         }
+
+
+def _attribute(arr: NDArray, normalized: bool = False) -> Dict[str, Any]:
+    """
+    three.js BufferAttribute with the data packed as a base64 little endian typed array.
+    """
+
+    types = {
+        "<f4": "Float32Array",
+        "<u4": "Uint32Array",
+        "<u2": "Uint16Array",
+        "|i1": "Int8Array",
+    }
+
+    return {
+        "itemSize": arr.shape[1] if arr.ndim > 1 else 1,
+        "type": types[arr.dtype.str],
+        "normalized": normalized,
+        "encoding": "base64",
+        "array": b64encode(np.ascontiguousarray(arr)).decode(),
+    }
+
+
+# type of the binary JSON, it follows the three.js BufferGeometry layout but cannot
+# be read by BufferGeometryLoader
+BINARY_JSON_TYPE = "CadQueryBinaryGeometry"
+BINARY_JSON_VERSION = 1
+
+
+def toBinaryJson(tessellation: Tessellation, quantize: bool = False) -> str:
+    """
+    Compact JSON of a tessellation laid out like a three.js BufferGeometry. Attribute
+    data is stored as base64 encoded typed arrays, which BufferGeometryLoader does not
+    support, hence the own type. Clients wrap the arrays without parsing, e.g. using
+    new Float32Array(Uint8Array.from(atob(array), c => c.charCodeAt(0)).buffer),
+    and create the BufferAttributes themselves.
+
+    With quantize=True positions are stored as Uint16Array together with the
+    quantization offset and scale (position = offset + scale*q) and normals as
+    normalized Int8Array.
+    """
+
+    vertices = tessellation.vertices
+    normals = tessellation.normals
+    attributes = {}
+    userData: Dict[str, Any] = {}
+
+    if quantize:
+        offset = vertices.min(axis=0) if len(vertices) else np.zeros(3)
+        extent = vertices.max(axis=0) - offset if len(vertices) else np.zeros(3)
+        scale = np.where(extent > 0, extent / 65535, 1.0)
+
+        attributes["position"] = _attribute(
+            np.rint((vertices - offset) / scale).astype("<u2")
+        )
+        userData["quantization"] = {
+            "offset": offset.tolist(),
+            "scale": scale.tolist(),
+        }
+
+        if normals is not None:
+            attributes["normal"] = _attribute(
+                np.rint(np.clip(normals, -1, 1) * 127).astype("|i1"), True
+            )
+    else:
+        attributes["position"] = _attribute(vertices.astype("<f4"))
+
+        if normals is not None:
+            attributes["normal"] = _attribute(normals.astype("<f4"))
+
+    index_type = "<u2" if len(vertices) <= 2 ** 16 else "<u4"
+
+    rv = {
+        "metadata": {
+            "version": BINARY_JSON_VERSION,
+            "type": BINARY_JSON_TYPE,
+            "generator": "cadquery",
+        },
+        "type": BINARY_JSON_TYPE,
+        "userData": userData,
+        "data": {
+            "attributes": attributes,
+            "index": _attribute(tessellation.triangles.ravel().astype(index_type)),
+        },
+    }
+
+    return json.dumps(rv)
@@ -0,0 +1,143 @@
+from struct import pack
+from typing import IO, List, Optional
+
+import numpy as np
+from numpy.typing import NDArray
+
+from ..geom import Location
+from ..shapes import _trsf_to_array
+
+CHUNK_SIZE = 2 ** 16
+
+# binary STL triangle record
+STL_DTYPE = np.dtype(
+    [("normal", "<f4", (3,)), ("vertices", "<f4", (3, 3)), ("attr", "<u2")]
+)
+
+STL_HEADER = b"Exported by CadQuery".ljust(80, b"\0")
+
+FACET_TEMPLATE = (
+    " facet normal %13e %13e %13e\n"
+    "   outer loop\n"
+    "     vertex %13e %13e %13e\n"
+    "     vertex %13e %13e %13e\n"
+    "     vertex %13e %13e %13e\n"
+    "   endloop\n"
+    " endfacet\n"
+)
+
+
+def _normals(pts: NDArray) -> NDArray:
+    """
+    Unit facet normals of (N, 3, 3) triangle corner coordinates.
+    """
+
+    rv = np.cross(pts[:, 1] - pts[:, 0], pts[:, 2] - pts[:, 0])
+    lengths = np.sqrt(np.einsum("ij,ij->i", rv, rv))[:, None]
+    np.divide(rv, lengths, out=rv, where=lengths > 0)
+
+    return rv
+
+
+class StlWriter(object):
+    """
+    Streaming STL writer. Triangles are written in chunks as they are added, so
+    only one chunk needs to be kept in memory. Binary output requires a seekable
+    file object, the triangle count is written when the writer is closed.
+    """
+
+    f: IO[bytes]
+    ascii: bool
+    chunkSize: int
+    count: int
+
+    def __init__(self, f: IO[bytes], ascii: bool = False, chunkSize: int = CHUNK_SIZE):
+
+        self.f = f
+        self.ascii = ascii
+        self.chunkSize = chunkSize
+        self.count = 0
+
+        self._pending: List[NDArray[np.float64]] = []
+        self._npending = 0
+
+        if ascii:
+            f.write(b"solid \n")
+        else:
+            f.write(STL_HEADER)
+            self._start = f.tell()
+            f.write(pack("<I", 0))
+
+    def __enter__(self) -> "StlWriter":
+
+        return self
+
+    def __exit__(self, *args):
+
+        self.close()
+
+    def add(
+        self,
+        vertices: NDArray[np.float64],
+        triangles: NDArray[np.int32],
+        loc: Optional[Location] = None,
+    ):
+        """
+        Add a triangle mesh, optionally moved to the given location.
+        """
+
+        if loc is not None:
+            T = _trsf_to_array(loc.wrapped.Transformation())
+            vertices = vertices @ T[:, :3].T + T[:, 3]
+
+        for i in range(0, len(triangles), self.chunkSize):
+            pts = vertices[triangles[i : i + self.chunkSize]]
+
+            self._pending.append(pts)
+            self._npending += len(pts)
+
+            if self._npending >= self.chunkSize:
+                self._flush()
+
+    def _flush(self):
+        """
+        Write all pending triangles. Small meshes are batched to amortize per-call overhead.
+        """
+
+        if not self._pending:
+            return
+
+        pts = np.concatenate(self._pending)
+
+        self._pending = []
+        self._npending = 0
+
+        if self.ascii:
+            normals = _normals(pts)
+            data = np.concatenate((normals, pts.reshape(-1, 9)), axis=1)
+            self.f.write(
+                "".join(FACET_TEMPLATE % tuple(r) for r in data.tolist()).encode()
+            )
+        else:
+            data = np.empty(len(pts), dtype=STL_DTYPE)
+            data["vertices"] = pts
+            data["normal"] = _normals(data["vertices"])
+            data["attr"] = 0
+            self.f.write(memoryview(data).cast("B"))
+
+        self.count += len(pts)
+
+    def close(self):
+        """
+        Finalize the file.
+        """
+
+        self._flush()
+
+        if self.ascii:
+            self.f.write(b"endsolid\n")
+        else:
+            end = self.f.tell()
+            self.f.seek(self._start)
+            self.f.write(pack("<I", self.count))
+            self.f.seek(end)
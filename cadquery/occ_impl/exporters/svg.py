@@ -1,7 +1,12 @@
 import io as StringIO
+from concurrent.futures import ProcessPoolExecutor
+from typing import IO, Any, Iterable, Optional, Union
 
-from ..shapes import Compound, Edge
-from ..geom import BoundBox
+import numpy as np
+from numpy.typing import NDArray
+
+from ..shapes import Edge, Shape, HLRResult, compound
+from ..geom import BoundBox, VectorLike
 from ..shapes import hlr
 
 
@@ -9,6 +14,9 @@ from OCP.GCPnts import GCPnts_QuasiUniformDeflection
 
 DISCRETIZATION_TOLERANCE = 1e-3
 
+# end points closer than this are merged into a single path
+JOIN_TOLERANCE = 1e-6
+
 SVG_TEMPLATE = """<?xml version="1.0" encoding="UTF-8" standalone="no"?>
 <svg
    xmlns:svg="http://www.w3.org/2000/svg"
@@ -78,29 +86,110 @@ def guessUnitOfMeasure(shape):
     return UNITS.MM
 
 
-def makeSVGedge(e):
+def _discretize(e: Edge) -> NDArray:
     """
-    Creates an SVG edge from a OCCT edge.
+    Discretize an edge into an array of 2D points. Lines are not discretized.
     """
 
-    cs = StringIO.StringIO()
-
     curve = e._geomAdaptor()  # adapt the edge into curve
     start = curve.FirstParameter()
     end = curve.LastParameter()
 
-    points = GCPnts_QuasiUniformDeflection(curve, DISCRETIZATION_TOLERANCE, start, end)
+    if e.geomType() == "LINE":
+        pts = [curve.Value(start), curve.Value(end)]
+    else:
+        points = GCPnts_QuasiUniformDeflection(
+            curve, DISCRETIZATION_TOLERANCE, start, end
+        )
+
+        if not points.IsDone():
+            return np.empty((0, 2))
+
+        pts = [points.Value(i + 1) for i in range(points.NbPoints())]
+
+    return np.array([(p.X(), p.Y()) for p in pts]).reshape(-1, 2)
+
+
+def _path(pts: NDArray) -> str:
+    """
+    Convert an array of 2D points into SVG path data.
+    """
+
+    coords = ["{},{} ".format(*p) for p in pts.tolist()]
+
+    return "M" + "L".join(coords)
+
+
+def _join(polylines: list[NDArray]) -> list[NDArray]:
+    """
+    Merge polylines with coincident end points into longer polylines.
+    """
+
+    # polylines ending at a given point, the second element is True for the start
+    ends: dict[tuple[int, int], list[tuple[int, bool]]] = {}
+
+    def _key(p: NDArray) -> tuple[int, int]:
+
+        return tuple(np.round(p / JOIN_TOLERANCE).astype(int).tolist())  # type: ignore
+
+    for i, pts in enumerate(polylines):
+        ends.setdefault(_key(pts[0]), []).append((i, True))
+        ends.setdefault(_key(pts[-1]), []).append((i, False))
+
+    used = np.zeros(len(polylines), dtype=bool)
+
+    def _next(p: NDArray) -> Optional[NDArray]:
+        """
+        Find an unused polyline starting at p, reversed if needed.
+        """
 
-    if points.IsDone():
-        point_it = (points.Value(i + 1) for i in range(points.NbPoints()))
+        for j, start in ends.get(_key(p), []):
+            if not used[j]:
+                used[j] = True
+                return polylines[j] if start else polylines[j][::-1]
 
-        p = next(point_it)
-        cs.write("M{},{} ".format(p.X(), p.Y()))
+        return None
 
-        for p in point_it:
-            cs.write("L{},{} ".format(p.X(), p.Y()))
+    rv = []
 
-    return cs.getvalue()
+    for i, pts in enumerate(polylines):
+        if used[i]:
+            continue
+
+        used[i] = True
+        chain = [pts]
+
+        # extend forward
+        while (nxt := _next(chain[-1][-1])) is not None:
+            chain.append(nxt[1:])
+
+        # extend backward
+        while (prev := _next(chain[0][0])) is not None:
+            chain.insert(0, prev[::-1][:-1])
+
+        rv.append(np.vstack(chain))
+
+    return rv
+
+
+def makeSVGedge(e):
+    """
+    Creates an SVG edge from a OCCT edge.
+    """
+
+    pts = _discretize(e)
+
+    return _path(pts) if len(pts) else ""
+
+
+def makeSVGpaths(edges: Iterable[Edge]) -> list[str]:
+    """
+    Creates SVG paths from OCCT edges. Connected edges are merged into single paths.
+    """
+
+    polylines = [pts for pts in map(_discretize, edges) if len(pts)]
+
+    return [_path(pts) for pts in _join(polylines)]
 
 
 def getPaths(
@@ -110,16 +199,62 @@ def getPaths(
     Collects the visible and hidden edges from the CadQuery object.
     """
 
-    hiddenPaths = []
-    visiblePaths = []
+    return (makeSVGpaths(hiddenEdges), makeSVGpaths(visibleEdges))
 
-    for e in visibleEdges:
-        visiblePaths.append(makeSVGedge(e))
 
-    for e in hiddenEdges:
-        hiddenPaths.append(makeSVGedge(e))
+# shape to be projected by the current process, set by _init
+_shape: Optional[Shape] = None
 
-    return (hiddenPaths, visiblePaths)
+# default options of getSVG
+SVG_OPTIONS = {
+    "width": 800,
+    "height": 240,
+    "marginLeft": 200,
+    "marginTop": 20,
+    "projectionDir": (-1.75, 1.1, 5),
+    "up": None,
+    "showAxes": True,
+    "strokeWidth": -1.0,  # -1 = calculated based on unitScale
+    "strokeColor": (0, 0, 0),  # RGB 0-255
+    "hiddenColor": (160, 160, 160),  # RGB 0-255
+    "showHidden": True,
+    "focus": None,
+    "poly": False,
+}
+
+
+def _init(shape: Shape) -> None:
+    """
+    Store the shape to be projected, so that it is transferred once per process.
+    """
+
+    global _shape
+
+    _shape = shape
+
+
+def _project(shape: Shape, d: dict[str, Any]) -> HLRResult:
+    """
+    Project a shape using the given options.
+    """
+
+    return hlr(
+        shape,
+        tuple(d["projectionDir"]),
+        up=d["up"],
+        focus=float(d["focus"]) if d.get("focus") else None,
+        poly=bool(d["poly"]),
+    )
+
+
+def _hlr(d: dict[str, Any]) -> HLRResult:
+    """
+    Project the current shape using the given options.
+    """
+
+    assert _shape is not None
+
+    return _project(_shape, d)
 
 
 def getSVG(shape, opts=None):
@@ -145,27 +280,94 @@ def getSVG(shape, opts=None):
         showHidden: Whether or not to show hidden lines.
         focus: If specified, creates a perspective SVG with the projector
                at the distance specified.
+        poly: Whether to use the faster, mesh based hidden line removal.
     """
 
     # Available options and their defaults
-    d = {
-        "width": 800,
-        "height": 240,
-        "marginLeft": 200,
-        "marginTop": 20,
-        "projectionDir": (-1.75, 1.1, 5),
-        "up": None,
-        "showAxes": True,
-        "strokeWidth": -1.0,  # -1 = calculated based on unitScale
-        "strokeColor": (0, 0, 0),  # RGB 0-255
-        "hiddenColor": (160, 160, 160),  # RGB 0-255
-        "showHidden": True,
-        "focus": None,
-    }
+    d = dict(SVG_OPTIONS)
+
+    if opts:
+        d.update(opts)
+
+    f = StringIO.StringIO()
+    _writeSVG(f, shape, _project(shape, d), d)
+
+    return f.getvalue()
+
+
+def writeSVG(shape, f: IO[str], opts=None) -> None:
+    """
+    Export a shape to SVG text written directly to a file object, so that large
+    drawings are not kept in memory as a single string.
+
+    :param shape: A CadQuery shape object to convert to SVG.
+    :param f: Text file object to write to.
+    :param opts: An options dictionary, see :func:`getSVG`.
+    """
+
+    d = dict(SVG_OPTIONS)
 
     if opts:
         d.update(opts)
 
+    _writeSVG(f, shape, _project(shape, d), d)
+
+
+def getSVGViews(
+    shape: Shape,
+    dirs: Iterable[VectorLike],
+    opts: Optional[dict[str, Any]] = None,
+    processes: Optional[int] = None,
+) -> list[tuple[HLRResult, str]]:
+    """
+    Export several views of a shape to SVG text. Hidden line removal of the views
+    is done by a pool of processes.
+
+    :param shape: A CadQuery shape object to convert to SVG strings.
+    :param dirs: Projection directions of the views.
+    :param opts: An options dictionary, see :func:`getSVG`. projectionDir is
+        overridden by dirs.
+    :param processes: Number of worker processes, None uses the number of CPUs and
+        1 projects serially in the current process.
+    :return: HLR results and SVG strings of all views.
+    """
+
+    views = []
+
+    for dir in dirs:
+        d = dict(SVG_OPTIONS)
+
+        if opts:
+            d.update(opts)
+
+        d["projectionDir"] = tuple(dir)
+        views.append(d)
+
+    if processes == 1:
+        results = [_project(shape, d) for d in views]
+    else:
+        with ProcessPoolExecutor(
+            processes, initializer=_init, initargs=(shape,)
+        ) as pool:
+            results = list(pool.map(_hlr, views))
+
+    rv = []
+
+    for r, d in zip(results, views):
+        f = StringIO.StringIO()
+        _writeSVG(f, shape, r, d)
+        rv.append((r, f.getvalue()))
+
+    return rv
+
+
+def _writeSVG(
+    f: IO[str], shape: Shape, hlr_result: HLRResult, d: dict[str, Any]
+) -> None:
+    """
+    Write the result of a projection as SVG text.
+    """
+
     # need to guess the scale and the coordinate center
     uom = guessUnitOfMeasure(shape)
 
@@ -185,15 +387,12 @@ def getSVG(shape, opts=None):
     strokeColor = tuple(d["strokeColor"])
     hiddenColor = tuple(d["hiddenColor"])
     showHidden = bool(d["showHidden"])
-    focus = float(d["focus"]) if d.get("focus") else None
 
-    hlr_result = hlr(shape, projectionDir, up=up, focus=focus)
     visibleEdges = hlr_result.visible
     hiddenEdges = hlr_result.hidden
-    hiddenPaths, visiblePaths = getPaths(visibleEdges, hiddenEdges)
 
     # get bounding box -- these are all in 2D space
-    bb = Compound.makeCompound(hiddenEdges + visibleEdges).BoundingBox()
+    bb = compound(hiddenEdges, visibleEdges).BoundingBox()
 
     # Determine whether the user wants to fit the drawing to the bounding box
     if width is None or height is None:
@@ -222,18 +421,6 @@ def getSVG(shape, opts=None):
     if strokeWidth == -1.0:
         strokeWidth = 1.0 / unitScale
 
-    # compute paths
-    hiddenContent = ""
-
-    # Prevent hidden paths from being added if the user disabled them
-    if showHidden:
-        for p in hiddenPaths:
-            hiddenContent += PATHTEMPLATE % p
-
-    visibleContent = ""
-    for p in visiblePaths:
-        visibleContent += PATHTEMPLATE % p
-
     # If the caller wants the axes indicator and is using the default direction, add in the indicator
     if showAxes and projectionDir == (-1.75, 1.1, 5) and up is None:
         axesIndicator = AXES_TEMPLATE % (
@@ -242,14 +429,16 @@ def getSVG(shape, opts=None):
     else:
         axesIndicator = ""
 
-    svg = SVG_TEMPLATE % (
-        {
+    # the paths are written between the parts of the template
+    head, middle, tail = (
+        SVG_TEMPLATE
+        % {
             "unitScale": str(unitScale),
             "strokeWidth": str(strokeWidth),
             "strokeColor": ",".join([str(x) for x in strokeColor]),
             "hiddenColor": ",".join([str(x) for x in hiddenColor]),
-            "hiddenContent": hiddenContent,
-            "visibleContent": visibleContent,
+            "hiddenContent": "\0",
+            "visibleContent": "\0",
             "xTranslate": str(xTranslate),
             "yTranslate": str(yTranslate),
             "width": str(width),
@@ -258,19 +447,27 @@ def getSVG(shape, opts=None):
             "uom": str(uom),
             "axesIndicator": axesIndicator,
         }
-    )
+    ).split("\0")
+
+    f.write(head)
+
+    # Prevent hidden paths from being added if the user disabled them
+    if showHidden:
+        f.writelines(PATHTEMPLATE % p for p in makeSVGpaths(hiddenEdges))
 
-    return svg
+    f.write(middle)
+    f.writelines(PATHTEMPLATE % p for p in makeSVGpaths(visibleEdges))
+    f.write(tail)
 
 
-def exportSVG(shape, fileName: str, opts=None):
+def exportSVG(shape, fileName: Union[str, IO[str]], opts=None):
     """
-    Accept a cadquery shape, and export it to the provided file
-    TODO: should use file-like objects, not a fileName, and/or be able to return a string instead
+    Accept a cadquery shape, and export it to the provided file or file object
     export a view of a part to svg
     """
 
-    svg = getSVG(shape.val(), opts)
-    f = open(fileName, "w")
-    f.write(svg)
-    f.close()
+    if isinstance(fileName, str):
+        with open(fileName, "w") as f:
+            writeSVG(shape.val(), f, opts)
+    else:
+        writeSVG(shape.val(), fileName, opts)
@@ -1,10 +1,19 @@
 from datetime import datetime
 from os import PathLike
 import xml.etree.cElementTree as ET
-from typing import IO, List, Literal, Tuple, Union
+from typing import IO, Iterable, List, Literal, Optional, Tuple, Union
 from zipfile import ZipFile, ZIP_DEFLATED, ZIP_STORED
 
-from ..shapes import Compound, Shape, Vector
+import numpy as np
+from numpy.typing import NDArray
+
+from ..geom import Location
+from ..shapes import Compound, Shape, Tessellation, _trsf_to_array
+
+CHUNK_SIZE = 2 ** 16
+
+VERTEX_TEMPLATE = '<vertex x="%r" y="%r" z="%r"/>\n'
+TRIANGLE_TEMPLATE = '<triangle v1="%d" v2="%d" v3="%d"/>\n'
 
 
 class CONTENT_TYPES(object):
@@ -22,28 +31,76 @@ class SCHEMAS(object):
 Unit = Literal["micron", "millimeter", "centimeter", "meter", "inch", "foot"]
 
 
+def _transform(loc: Location) -> str:
+    """
+    3MF transform attribute of a location. 3MF uses row vectors, hence the transpose.
+    """
+
+    T = _trsf_to_array(loc.wrapped.Transformation())
+
+    return " ".join(repr(v) for v in np.vstack((T[:, :3].T, T[:, 3])).ravel().tolist())
+
+
+def _format(template: str, arr: NDArray, chunkSize: int) -> Iterable[bytes]:
+    """
+    Format rows of an array in chunks.
+    """
+
+    for i in range(0, len(arr), chunkSize):
+        chunk = arr[i : i + chunkSize]
+        yield ((template * len(chunk)) % tuple(chunk.ravel().tolist())).encode()
+
+
 class ThreeMFWriter(object):
+
+    meshes: List[Tessellation]
+    components: List[Tuple[int, Optional[Location]]]
+
     def __init__(
         self,
-        shape: Shape,
+        shape: Optional[Shape],
         tolerance: float,
         angularTolerance: float,
         unit: Unit = "millimeter",
+        chunkSize: int = CHUNK_SIZE,
     ):
         """
         Initialize the writer.
-        Used to write the given Shape to a 3MF file.
+        Used to write the given Shape to a 3MF file. If shape is None an empty writer is
+        created, use add to populate it.
         """
         self.unit = unit
+        self.tolerance = tolerance
+        self.angularTolerance = angularTolerance
+        self.chunkSize = chunkSize
 
-        if isinstance(shape, Compound):
+        self.meshes = []
+        self.components = []
+
+        if shape is None:
+            shapes = []
+        elif isinstance(shape, Compound):
             shapes = list(shape)
         else:
             shapes = [shape]
 
-        tessellations = [s.tessellate(tolerance, angularTolerance) for s in shapes]
-        # Remove shapes that did not tesselate
-        self.tessellations = [t for t in tessellations if all(t)]
+        for s in shapes:
+            self.add(s)
+
+    def add(self, shape: Shape, locs: Iterable[Optional[Location]] = (None,)):
+        """
+        Add a shape. The shape is meshed once and referenced by one component
+        per location.
+        """
+
+        tess = shape.tessellateArrays(self.tolerance, self.angularTolerance)
+
+        # Skip shapes that did not tessellate
+        if len(tess.vertices) == 0 or len(tess.triangles) == 0:
+            return
+
+        self.meshes.append(tess)
+        self.components.extend((len(self.meshes) - 1, loc) for loc in locs)
 
     def write3mf(
         self, outfile: Union[PathLike, str, IO[bytes]],
@@ -62,72 +119,67 @@ class ThreeMFWriter(object):
         with ZipFile(outfile, "w", compression) as zf:
             zf.writestr("_rels/.rels", self._write_relationships())
             zf.writestr("[Content_Types].xml", self._write_content_types())
-            zf.writestr("3D/3dmodel.model", self._write_3d())
-
-    def _write_3d(self) -> str:
 
-        no_meshes = len(self.tessellations)
+            with zf.open("3D/3dmodel.model", "w", force_zip64=True) as f:
+                for chunk in self._write_3d():
+                    f.write(chunk)
 
-        model = ET.Element(
-            "model", {"xml:lang": "en-US", "xmlns": SCHEMAS.CORE,}, unit=self.unit,
-        )
+    def _write_3d(self) -> Iterable[bytes]:
+        """
+        Generate the model part in chunks.
+        """
 
-        # Add meta data
-        ET.SubElement(
-            model, "metadata", name="Application"
-        ).text = "CadQuery 3MF Exporter"
-        ET.SubElement(
-            model, "metadata", name="CreationDate"
-        ).text = datetime.now().isoformat()
+        no_meshes = len(self.meshes)
 
-        resources = ET.SubElement(model, "resources")
+        yield (
+            "<?xml version='1.0' encoding='utf-8'?>\n"
+            f'<model xml:lang="en-US" xmlns="{SCHEMAS.CORE}" unit="{self.unit}">\n'
+            '<metadata name="Application">CadQuery 3MF Exporter</metadata>\n'
+            f'<metadata name="CreationDate">{datetime.now().isoformat()}</metadata>\n'
+            "<resources>\n"
+        ).encode()
 
         # Add all meshes to resources
-        for i, tessellation in enumerate(self.tessellations):
-            self._add_mesh(resources, str(i), tessellation)
+        for i, tessellation in enumerate(self.meshes):
+            yield from self._write_mesh(str(i), tessellation)
 
         # Create a component of all meshes
-        comp_object = ET.SubElement(
-            resources,
-            "object",
-            id=str(no_meshes),
-            name=f"CadQuery Component",
-            type="model",
-        )
-        components = ET.SubElement(comp_object, "components")
-
-        # Add all meshes to the component
-        for i in range(no_meshes):
-            ET.SubElement(
-                components, "component", objectid=str(i),
-            )
+        yield (
+            f'<object id="{no_meshes}" name="CadQuery Component" type="model">\n'
+            "<components>\n"
+        ).encode()
+
+        # Add all instances to the component
+        yield "".join(
+            f'<component objectid="{i}"/>\n'
+            if loc is None
+            else f'<component objectid="{i}" transform="{_transform(loc)}"/>\n'
+            for i, loc in self.components
+        ).encode()
 
         # Add the component to the build
-        build = ET.SubElement(model, "build")
-        ET.SubElement(build, "item", objectid=str(no_meshes))
+        yield (
+            "</components>\n</object>\n</resources>\n"
+            f'<build>\n<item objectid="{no_meshes}"/>\n</build>\n'
+            "</model>\n"
+        ).encode()
 
-        return ET.tostring(model, xml_declaration=True, encoding="utf-8")
+    def _write_mesh(self, id: str, tessellation: Tessellation) -> Iterable[bytes]:
 
-    def _add_mesh(
-        self,
-        to: ET.Element,
-        id: str,
-        tessellation: Tuple[List[Vector], List[Tuple[int, int, int]]],
-    ):
-        object = ET.SubElement(
-            to, "object", id=id, name=f"CadQuery Shape {id}", type="model"
-        )
-        mesh = ET.SubElement(object, "mesh")
+        yield (
+            f'<object id="{id}" name="CadQuery Shape {id}" type="model">\n'
+            "<mesh>\n<vertices>\n"
+        ).encode()
 
         # add vertices
-        vertices = ET.SubElement(mesh, "vertices")
-        for v in tessellation[0]:
-            ET.SubElement(vertices, "vertex", x=str(v.x), y=str(v.y), z=str(v.z))
+        yield from _format(VERTEX_TEMPLATE, tessellation.vertices, self.chunkSize)
+
+        yield b"</vertices>\n<triangles>\n"
 
         # add triangles
-        volume = ET.SubElement(mesh, "triangles")
-        for t in tessellation[1]:
-            ET.SubElement(volume, "triangle", v1=str(t[0]), v2=str(t[1]), v3=str(t[2]))
+        yield from _format(TRIANGLE_TEMPLATE, tessellation.triangles, self.chunkSize)
+
+        yield b"</triangles>\n</mesh>\n</object>\n"
 
     def _write_content_types(self) -> str:
 
@@ -1,4 +1,5 @@
 from math import pi
+from pathlib import Path
 from typing import List, Literal
 
 import OCP.IFSelect
@@ -6,7 +7,9 @@ from OCP.STEPControl import STEPControl_Reader
 from OCP.Interface import Interface_Static
 
 from ... import cq
-from ..shapes import Shape
+from ..cache import getImportCache
+from ..shapes import Shape, compound
+from .assembly import _step_settings
 from .dxf import _importDXF
 from ...types import UnitLiterals
 
@@ -91,8 +94,20 @@ def _importStep(fileName: str, unit: UnitLiterals = "MM") -> list["Shape"]:
     # Set the target cascade unit - OCCT scales from the file's declared unit to this unit
     Interface_Static.SetCVal_s("xstep.cascade.unit", unit.upper())
 
-    # Now read and return the shape
     reader = STEPControl_Reader()
+
+    # Check the import cache
+    cache = getImportCache()
+    key = None
+
+    if cache is not None and Path(fileName).is_file():
+        key = cache.key(fileName, "STEP", **_step_settings(unit))
+        cached = cache.get(key, "shapes.bin")
+
+        if cached:
+            return list(Shape.importBin(str(cached)))
+
+    # Now read and return the shape
     readStatus = reader.ReadFile(fileName)
     if readStatus != OCP.IFSelect.IFSelect_RetDone:
         raise ValueError("STEP File could not be loaded")
@@ -101,6 +116,9 @@ def _importStep(fileName: str, unit: UnitLiterals = "MM") -> list["Shape"]:
 
     rv = [Shape.cast(reader.Shape(i + 1)) for i in range(reader.NbShapes())]
 
+    if cache is not None and key:
+        cache.put(key, "shapes.bin", compound(rv).exportBin)
+
     return rv
 
 
@@ -119,7 +137,11 @@ def importStep(fileName: str, unit: UnitLiterals = "MM") -> "cq.Workplane":
 
 
 def importDXF(
-    filename: str, tol: float = 1e-6, exclude: List[str] = [], include: List[str] = []
+    filename: str,
+    tol: float = 1e-6,
+    exclude: List[str] = [],
+    include: List[str] = [],
+    fast: bool = False,
 ) -> "cq.Workplane":
     """
     Loads a DXF file into a Workplane.
@@ -131,8 +153,11 @@ def importDXF(
     :param tol: The tolerance used for merging edges into wires
     :param exclude: a list of layer names not to import
     :param include: a list of layer names to import
+    :param fast: Connect edges using a grid hash of their end points and nest wires
+        using bounding box tests instead of sorting all wires at once. Islands inside
+        of holes result in separate faces. Suitable for large drawings.
     """
 
-    faces = _importDXF(filename, tol, exclude, include)
+    faces = _importDXF(filename, tol, exclude, include, fast)
 
     return cq.Workplane("XY").newObject(faces)
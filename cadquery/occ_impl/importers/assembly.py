@@ -1,4 +1,5 @@
-from typing import cast
+from typing import cast, Any
+from functools import partial
 from pathlib import Path
 
 from OCP.TopoDS import TopoDS_Shape
@@ -21,13 +22,41 @@ from OCP.TDocStd import TDocStd_Application
 from OCP.XmlXCAFDrivers import XmlXCAFDrivers
 from OCP.BinXCAFDrivers import BinXCAFDrivers
 from OCP.Interface import Interface_Static
-from OCP.PCDM import PCDM_ReaderStatus
+from OCP.PCDM import PCDM_ReaderStatus, PCDM_StoreStatus
+from OCP.XCAFApp import XCAFApp_Application
 
 from ..assembly import AssemblyProtocol, Color, Material
+from ..cache import getImportCache
 from ..geom import Location
 from ..shapes import Shape
 from ...types import UnitLiterals
 
+# integer and real reader settings that affect the result of a STEP import
+STEP_INT_SETTINGS = (
+    "read.precision.mode",
+    "read.maxprecision.mode",
+    "read.step.product.mode",
+    "read.step.product.context",
+    "read.step.shape.repr",
+    "read.step.assembly.level",
+    "read.step.shape.relationship",
+    "read.step.shape.aspect",
+    "read.stepcaf.subshapes.name",
+)
+STEP_REAL_SETTINGS = ("read.precision.val", "read.maxprecision.val")
+
+
+def _step_settings(unit: UnitLiterals) -> dict[str, Any]:
+    """
+    Current STEP reader settings, used as a part of the import cache key.
+    """
+
+    rv: dict[str, Any] = {k: Interface_Static.IVal_s(k) for k in STEP_INT_SETTINGS}
+    rv.update((k, Interface_Static.RVal_s(k)) for k in STEP_REAL_SETTINGS)
+    rv["unit"] = unit.upper()
+
+    return rv
+
 
 def _get_name(label: TDF_Label) -> str:
     """
@@ -130,7 +159,9 @@ def _get_shape_color(s: TopoDS_Shape, color_tool: XCAFDoc_ColorTool) -> Color |
     return rv
 
 
-def importStep(assy: AssemblyProtocol, path: str, unit: UnitLiterals = "MM"):
+def importStep(
+    assy: AssemblyProtocol, path: str, unit: UnitLiterals = "MM", lazy: bool = False
+):
     """
     Import a step file into an assembly.
 
@@ -139,6 +170,8 @@ def importStep(assy: AssemblyProtocol, path: str, unit: UnitLiterals = "MM"):
     :param unit: The assumed unit of measurement when the STEP file does not
       declare one in its header. Has no effect when the file already contains
       a unit declaration. Default "MM".
+    :param lazy: Only build the tree with names, locations and colors. Shapes and
+      subshape metadata are cast when the obj of a node is first accessed.
 
     :return: None
     """
@@ -153,26 +186,58 @@ def importStep(assy: AssemblyProtocol, path: str, unit: UnitLiterals = "MM"):
     Interface_Static.SetIVal_s("read.stepcaf.subshapes.name", 1)
     Interface_Static.SetCVal_s("xstep.cascade.unit", unit.upper())
 
+    # Check the import cache
+    cache = getImportCache()
+    key = None
+
+    if cache is not None and Path(path).is_file():
+        key = cache.key(path, "XCAF", **_step_settings(unit))
+        cached = cache.get(key, "assy.xbf")
+
+        if cached:
+            importXbf(assy, str(cached), lazy)
+            return
+
     # Read the STEP file
     status = step_reader.ReadFile(path)
     if status != IFSelect_RetDone:
         raise ValueError(f"Error reading STEP file: {path}")
 
     # Document that the step file will be read into
-    doc = TDocStd_Document(TCollection_ExtendedString("XmXCAF"))
+    doc = TDocStd_Document(TCollection_ExtendedString("BinXCAF"))
 
     # Transfer the contents of the STEP file to the document
     step_reader.Transfer(doc)
 
-    _importDoc(doc, assy)
+    _importDoc(doc, assy, lazy)
+
+    # the transferred document is stored as is, so lazy nodes stay lazy
+    if cache is not None and key:
+        cache.put(key, "assy.xbf", partial(_saveXbf, doc))
 
 
-def importXbf(assy: AssemblyProtocol, path: str):
+def _saveXbf(doc: TDocStd_Document, path: str):
+    """
+    Save an XCAF document to an xbf file. The document is kept open, since lazy
+    assembly nodes are loaded from it.
+    """
+
+    app = XCAFApp_Application.GetApplication_s()
+    BinXCAFDrivers.DefineFormat_s(app)
+
+    status = app.SaveAs(doc, TCollection_ExtendedString(path))
+
+    if status != PCDM_StoreStatus.PCDM_SS_OK:
+        raise IOError(f"Saving of file {path} failed: {status}")
+
+
+def importXbf(assy: AssemblyProtocol, path: str, lazy: bool = False):
     """
     Import an xbf file into an assembly.
 
     :param assy: An Assembly object that will be packed with the contents of the XBF file.
     :param path: Path and filename to the xbf file to read.
+    :param lazy: Cast shapes and subshape metadata on first access.
 
     :return: None
     """
@@ -194,15 +259,16 @@ def importXbf(assy: AssemblyProtocol, path: str):
         status == PCDM_ReaderStatus.PCDM_RS_OK
     ), f"Opening of file {path} failed: {status}"
 
-    _importDoc(doc, assy)
+    _importDoc(doc, assy, lazy)
 
 
-def importXml(assy: AssemblyProtocol, path: str):
+def importXml(assy: AssemblyProtocol, path: str, lazy: bool = False):
     """
     Import an xcaf xml file into an assembly.
 
     :param assy: An Assembly object that will be packed with the contents of the XML file.
     :param path: Path and filename to the xml file to read.
+    :param lazy: Cast shapes and subshape metadata on first access.
 
     :return: None
     """
@@ -224,10 +290,59 @@ def importXml(assy: AssemblyProtocol, path: str):
         status == PCDM_ReaderStatus.PCDM_RS_OK
     ), f"Opening of file {path} failed: {status}"
 
-    _importDoc(doc, assy)
+    _importDoc(doc, assy, lazy)
+
+
+def _load_shape(doc: TDocStd_Document, lbl: TDF_Label, assy: AssemblyProtocol):
+    """
+    Set the shape of a simple shape label and its subshape names, layers and colors
+    on an assembly node. The document has to be kept alive for lazy nodes.
+    """
+
+    shape_tool = XCAFDoc_DocumentTool.ShapeTool_s(doc.Main())
+    layer_tool = XCAFDoc_DocumentTool.LayerTool_s(doc.Main())
+
+    assy.obj = Shape.cast(shape_tool.GetShape_s(lbl))
+
+    # iterate over subshape and handle names, layers and colors
+    subshape_labels = TDF_LabelSequence()
+    shape_tool.GetSubShapes_s(lbl, subshape_labels)
+
+    for child_label in subshape_labels:
+
+        # Save the shape so that we can add it to the subshape data
+        cur_shape: TopoDS_Shape = shape_tool.GetShape_s(child_label)
+
+        # Handle subshape name
+        child_name = _get_name(child_label)
+
+        if child_name:
+            assy.addSubshape(
+                Shape.cast(cur_shape), name=child_name,
+            )
 
+        # Find the layer name, if there is one set for this shape
+        layers = TDF_LabelSequence()
+        layer_tool.GetLayers(child_label, layers)
 
-def _importDoc(doc: TDocStd_Document, assy: AssemblyProtocol):
+        for layer_lbl in layers:
+            # Extract the layer name for the shape here
+            layer_name = _get_name(layer_lbl)
+
+            # Add the layer as a subshape entry on the assembly
+            assy.addSubshape(Shape.cast(cur_shape), layer=layer_name)
+
+        # Find the subshape color, if there is one set for this shape
+
+        # try the instance first
+        color = _get_ref_color(child_label)
+
+        if color:
+            # Save the color info via the assembly subshape mechanism
+            assy.addSubshape(Shape.cast(cur_shape), color=color)
+
+
+def _importDoc(doc: TDocStd_Document, assy: AssemblyProtocol, lazy: bool = False):
     def _process_label(lbl: TDF_Label, parent: AssemblyProtocol):
         """
         Recursive method to process the assembly in a top-down manner.
@@ -275,13 +390,11 @@ def _importDoc(doc: TDocStd_Document, assy: AssemblyProtocol):
                     # Find the name of this referenced part
                     ref_name = _get_name(comp_label)
 
-                    # A single shape needs to be added to the assembly
-                    final_shape = shape_tool.GetShape_s(ref_label)
-                    cq_shape = Shape.cast(final_shape)
-
                     # If the instance has no color, try to find the referenced shape color
                     if color is None:
-                        color = _get_shape_color(final_shape, color_tool)
+                        color = _get_shape_color(
+                            shape_tool.GetShape_s(ref_label), color_tool
+                        )
 
                     if material is None:
                         material = _get_material(ref_label)
@@ -290,15 +403,14 @@ def _importDoc(doc: TDocStd_Document, assy: AssemblyProtocol):
                     # "*"/"*_part" based naming is the default structure produced by CQ
                     # with an object and child nodes at the same time
                     if ref_name.endswith("_part"):
-                        parent.obj = cq_shape
                         parent.loc = cq_loc
                         parent.color = color
 
-                        # change the current assy to handle subshape data
+                        # change the current assy to handle the shape and subshape data
                         current = parent
                     else:
                         tmp = assy.__class__(
-                            cq_shape,
+                            None,
                             loc=cq_loc,
                             name=comp_name,
                             color=color,
@@ -306,53 +418,19 @@ def _importDoc(doc: TDocStd_Document, assy: AssemblyProtocol):
                         )
                         parent.add(tmp)
 
-                        # change the current assy to handle subshape data
+                        # change the current assy to handle the shape and subshape data
                         current = cast(AssemblyProtocol, parent[comp_name])
 
-                    # iterate over subshape and handle names, layers and colors
-                    subshape_labels = TDF_LabelSequence()
-                    shape_tool.GetSubShapes_s(ref_label, subshape_labels)
-
-                    for child_label in subshape_labels:
-
-                        # Save the shape so that we can add it to the subshape data
-                        cur_shape: TopoDS_Shape = shape_tool.GetShape_s(child_label)
-
-                        # Handle subshape name
-                        child_name = _get_name(child_label)
-
-                        if child_name:
-                            current.addSubshape(
-                                Shape.cast(cur_shape), name=child_name,
-                            )
-
-                        # Find the layer name, if there is one set for this shape
-                        layers = TDF_LabelSequence()
-                        layer_tool.GetLayers(child_label, layers)
-
-                        for lbl in layers:
-                            # Extract the layer name for the shape here
-                            layer_name = _get_name(lbl)
-
-                            # Add the layer as a subshape entry on the assembly
-                            current.addSubshape(Shape.cast(cur_shape), layer=layer_name)
-
-                        # Find the subshape color, if there is one set for this shape
-
-                        # try the instance first
-                        color = _get_ref_color(child_label)
-                        material = _get_material(child_label)
-
-                        if color:
-                            # Save the color info via the assembly subshape mechanism
-                            current.addSubshape(Shape.cast(cur_shape), color=color)
+                    if lazy:
+                        current._defer(partial(_load_shape, doc, ref_label))
+                    else:
+                        _load_shape(doc, ref_label, current)
 
         return parent
 
     # Shape and color tools for extracting XCAF data
     shape_tool = XCAFDoc_DocumentTool.ShapeTool_s(doc.Main())
     color_tool = XCAFDoc_DocumentTool.ColorTool_s(doc.Main())
-    layer_tool = XCAFDoc_DocumentTool.LayerTool_s(doc.Main())
 
     # Collect all the labels representing shapes in the document
     labels = TDF_LabelSequence()
@@ -1,14 +1,19 @@
 from collections import OrderedDict
-from math import pi
-from typing import List
+from itertools import product
+from math import floor, pi
+from typing import Dict, Iterable, List, Tuple, cast
+
+import numpy as np
 
 from ... import cq
 from ..geom import Vector
-from ..shapes import Shape, Edge, Face, sortWiresByBuildOrder
+from ..shapes import Shape, Edge, Face, Wire, sortWiresByBuildOrder
 
 import ezdxf
 
+from OCP.BRepClass import BRepClass_FaceClassifier
 from OCP.ShapeAnalysis import ShapeAnalysis_FreeBounds
+from OCP.TopAbs import TopAbs_IN
 from OCP.TopTools import TopTools_HSequenceOfShape
 from OCP.gp import gp_Pnt
 from OCP.Geom import Geom_BSplineCurve
@@ -135,15 +140,20 @@ DXF_CONVERTERS = {
 }
 
 
+def _dxf_edges(el) -> Iterable[Edge]:
+
+    conv = DXF_CONVERTERS.get(el.dxf.dxftype)
+
+    return conv(el) if conv else ()
+
+
 def _dxf_convert(elements, tol):
 
     rv = []
     edges = []
 
     for el in elements:
-        conv = DXF_CONVERTERS.get(el.dxf.dxftype)
-        if conv:
-            edges.extend(conv(el))
+        edges.extend(_dxf_edges(el))
 
     if edges:
         edges_in = TopTools_HSequenceOfShape()
@@ -158,8 +168,122 @@ def _dxf_convert(elements, tol):
     return rv
 
 
+def _connect_edges(edges: Iterable[Edge], tol: float) -> List[Wire]:
+    """
+    Connect edges into wires. End points are hashed on a grid with cell size tol to
+    split the edges into connected groups, which are then connected separately.
+    """
+
+    groups: List[int] = []  # union-find forest of the edges
+    cells: Dict[Tuple[int, int, int], int] = {}
+    edge_list: List[Edge] = []
+
+    def _find(i: int) -> int:
+
+        while groups[i] != i:
+            groups[i] = groups[groups[i]]
+            i = groups[i]
+
+        return i
+
+    for i, e in enumerate(edges):
+        edge_list.append(e)
+        groups.append(i)
+
+        for p in (e.startPoint(), e.endPoint()):
+            cell = (floor(p.x / tol), floor(p.y / tol), floor(p.z / tol))
+
+            # points within tol are in the same or in a neighboring cell
+            for d in product((-1, 0, 1), repeat=3):
+                other = cells.get((cell[0] + d[0], cell[1] + d[1], cell[2] + d[2]))
+
+                if other is not None:
+                    groups[_find(other)] = _find(i)
+
+            cells.setdefault(cell, i)
+
+    components: Dict[int, List[Edge]] = {}
+
+    for i, e in enumerate(edge_list):
+        components.setdefault(_find(i), []).append(e)
+
+    rv = []
+
+    for component in components.values():
+        edges_in = TopTools_HSequenceOfShape()
+        wires_out = TopTools_HSequenceOfShape()
+
+        for e in component:
+            edges_in.Append(e.wrapped)
+
+        ShapeAnalysis_FreeBounds.ConnectEdgesToWires_s(edges_in, tol, False, wires_out)
+
+        rv.extend(cast(Wire, Shape.cast(el)) for el in wires_out)
+
+    return rv
+
+
+def _nest_wires(wires: List[Wire], tol: float) -> List[List[Wire]]:
+    """
+    Group closed wires into outer wires followed by their holes. Containment is
+    checked on the bounding boxes first and confirmed by classifying a point of
+    the inner wire. Wires on even nesting levels are outer wires, so islands
+    inside of holes result in separate faces. Open wires are ignored.
+    """
+
+    closed = [w for w in wires if w.IsClosed()]
+
+    if not closed:
+        return []
+
+    boxes = [w.BoundingBox() for w in closed]
+    bbs = np.array([(bb.xmin, bb.ymin, bb.xmax, bb.ymax) for bb in boxes])
+    areas = (bbs[:, 2] - bbs[:, 0]) * (bbs[:, 3] - bbs[:, 1])
+
+    # larger wires first, so that parents precede their children
+    order = np.argsort(-areas, kind="stable")
+    bbs = bbs[order]
+    closed = [closed[i] for i in order]
+
+    faces: Dict[int, Face] = {}
+    depths: List[int] = []
+    rv: Dict[int, List[Wire]] = {}
+
+    for i, w in enumerate(closed):
+        candidates = np.all(bbs[:i, :2] <= bbs[i, :2] + tol, axis=1) & np.all(
+            bbs[:i, 2:] >= bbs[i, 2:] - tol, axis=1
+        )
+
+        pnt = w.positionAt(0.5).toPnt()
+        parent = -1
+
+        # smallest candidates first
+        for j in np.flatnonzero(candidates)[::-1].tolist():
+            if j not in faces:
+                faces[j] = Face.makeFromWires(closed[j])
+
+            classifier = BRepClass_FaceClassifier(faces[j].wrapped, pnt, tol)
+
+            if classifier.State() == TopAbs_IN:
+                parent = j
+                break
+
+        depths.append(depths[parent] + 1 if parent >= 0 else 0)
+
+        if depths[i] % 2 == 0:
+            rv[i] = [w]
+        else:
+            rv[parent].append(w)
+
+    return list(rv.values())
+
+
 def _importDXF(
-    filename: str, tol: float = 1e-6, exclude: List[str] = [], include: List[str] = [],
+    filename: str,
+    tol: float = 1e-6,
+    exclude: List[str] = [],
+    include: List[str] = [],
+    fast: bool = False,
 ) -> List[Face]:
     """
     Loads a DXF file into a list of faces.
@@ -168,6 +292,8 @@ def _importDXF(
     :param tol: The tolerance used for merging edges into wires
     :param exclude: a list of layer names not to import
     :param include: a list of layer names to import
+    :param fast: Convert entities one by one, connect edges using a grid hash of their
+        end points and nest wires using bounding box tests. Suitable for large drawings.
     """
 
     if exclude and include:
@@ -193,8 +319,13 @@ def _importDXF(
 
     for name, layer in layers.items():
         if name.lower() in selected:
-            res = _dxf_convert(layers[name], tol)
-            wire_sets = sortWiresByBuildOrder(res)
+            if fast:
+                edges = (e for el in layer for e in _dxf_edges(el))
+                wire_sets = _nest_wires(_connect_edges(edges, tol), tol)
+            else:
+                res = _dxf_convert(layers[name], tol)
+                wire_sets = sortWiresByBuildOrder(res)
+
             for wire_set in wire_sets:
                 faces.append(Face.makeFromWires(wire_set[0], wire_set[1:]))
 
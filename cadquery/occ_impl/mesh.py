@@ -0,0 +1,356 @@
+"""
+Post-processing of array based tessellations.
+"""
+
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+from scipy.spatial import cKDTree
+
+from vtkmodules.vtkCommonCore import vtkPoints, VTK_DOUBLE_MAX
+from vtkmodules.vtkCommonDataModel import vtkCellArray, vtkPolyData
+from vtkmodules.vtkFiltersCore import vtkDecimatePro, vtkQuadricDecimation
+from vtkmodules.vtkFiltersGeneral import vtkDistancePolyDataFilter
+from vtkmodules.util.numpy_support import (
+    numpy_to_vtk,
+    numpy_to_vtkIdTypeArray,
+    vtk_to_numpy,
+)
+
+from OCP.BRepMesh import BRepMesh_IncrementalMesh
+from OCP.BRepTools import BRepTools
+
+from .shapes import (
+    Shape,
+    Tessellation,
+    _tessellation_arrays,
+    _polygon_arrays,
+    _restore_triangulation,
+)
+
+# maximal number of times the deflection is tightened
+MAX_ATTEMPTS = 5
+
+# factor applied to the deflection if the deviation bound is not met
+TIGHTENING = 0.7
+
+# number of bisection steps used to find the decimation ratio of a face
+BISECTION_STEPS = 7
+
+# point data array holding the original node indices of a decimated face
+NODE_IDS = "NodeIds"
+
+
+def weld(tess: Tessellation, tolerance: float = 1e-9) -> Tessellation:
+    """
+    Merge coincident vertices, e.g. the duplicated nodes along shared face boundaries.
+
+    Vertices are merged when they round to the same point of a grid with the given
+    spacing. Triangles that become degenerate are removed and normals of merged vertices
+    are averaged.
+
+    :param tess: Tessellation to weld.
+    :param tolerance: Grid spacing used for merging.
+    """
+
+    keys = np.rint(tess.vertices / tolerance).astype(np.int64)
+    _, index, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+    inverse = inverse.reshape(-1)
+
+    triangles = inverse[tess.triangles]
+    valid = (
+        (triangles[:, 0] != triangles[:, 1])
+        & (triangles[:, 1] != triangles[:, 2])
+        & (triangles[:, 0] != triangles[:, 2])
+    )
+
+    normals = None
+
+    if tess.normals is not None:
+        normals = np.zeros((len(index), 3))
+        np.add.at(normals, inverse, tess.normals)
+
+        lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+        np.divide(normals, lengths, out=normals, where=lengths > 0)
+
+    return Tessellation(
+        np.ascontiguousarray(tess.vertices[index]),
+        np.ascontiguousarray(triangles[valid], dtype=np.int32),
+        np.ascontiguousarray(tess.faces[valid]),
+        normals,
+    )
+
+
+def _toPolyData(vertices: NDArray[np.float64], triangles: NDArray) -> vtkPolyData:
+
+    points = vtkPoints()
+    points.SetData(numpy_to_vtk(np.ascontiguousarray(vertices), deep=True))
+
+    cells = vtkCellArray()
+    cells.SetData(
+        numpy_to_vtkIdTypeArray(
+            np.arange(0, 3 * len(triangles) + 1, 3, dtype=np.int64), deep=True
+        ),
+        numpy_to_vtkIdTypeArray(triangles.astype(np.int64).ravel(), deep=True),
+    )
+
+    rv = vtkPolyData()
+    rv.SetPoints(points)
+    rv.SetPolys(cells)
+
+    return rv
+
+
+def _fromPolyData(data: vtkPolyData) -> tuple[NDArray[np.float64], NDArray[np.int32]]:
+
+    vertices = vtk_to_numpy(data.GetPoints().GetData()).astype(np.float64)
+    triangles = vtk_to_numpy(data.GetPolys().GetConnectivityArray()).reshape(-1, 3)
+
+    return vertices, triangles.astype(np.int32)
+
+
+def _decimate(data: vtkPolyData, reduction: float) -> vtkPolyData:
+    """
+    Remove the given fraction of the triangles, least significant vertices first.
+    Boundary vertices are kept so that neighboring faces still match.
+    """
+
+    alg = vtkDecimatePro()
+    alg.SetInputData(data)
+    alg.SetTargetReduction(reduction)
+    alg.PreserveTopologyOn()
+    alg.SplittingOff()
+    alg.BoundaryVertexDeletionOff()
+    alg.SetMaximumError(VTK_DOUBLE_MAX)
+    alg.Update()
+
+    return alg.GetOutput()
+
+
+def _deviation(reference: vtkPolyData, data: vtkPolyData) -> float:
+    """
+    Maximal distance of the nodes of the reference mesh to the given mesh.
+    """
+
+    alg = vtkDistancePolyDataFilter()
+    alg.SetInputData(0, reference)
+    alg.SetInputData(1, data)
+    alg.SignedDistanceOff()
+    alg.ComputeSecondDistanceOff()
+    alg.Update()
+
+    return float(
+        vtk_to_numpy(alg.GetOutput().GetPointData().GetArray("Distance")).max()
+    )
+
+
+def _faces(data: dict[str, NDArray[Any]]) -> list[vtkPolyData]:
+
+    return [
+        _toPolyData(data["vertices"][n0:n1], data["triangles"][t0:t1] - n0)
+        for _, n0, n1, t0, t1 in data["ranges"].tolist()
+    ]
+
+
+def decimate(
+    s: Shape,
+    maxDeviation: float,
+    angularTolerance: float = 0.5,
+    refinement: float = 0.25,
+) -> float:
+    """
+    Generate a lightweight triangulation of a shape with a bounded deviation from the BRep.
+
+    The shape is meshed with an absolute deflection of maxDeviation and the deviation
+    of every face is measured at the nodes of a reference mesh with a deflection of
+    refinement*maxDeviation, which lie on the BRep. The deflection is tightened until
+    the measured deviation plus the deflection of the reference mesh stays within
+    maxDeviation. Afterwards every face is decimated as far as the bound allows, which
+    removes vertices where the surface is flat and keeps them where curvature demands
+    it. Face boundaries are not modified, so the result stays watertight.
+
+    The result is stored as the triangulation of the shape, like :meth:`Shape.mesh`, and
+    is reused by subsequent exports with an absolute tolerance not smaller than
+    maxDeviation.
+
+    :param s: Shape to mesh.
+    :param maxDeviation: Maximal allowed distance between the mesh and the BRep.
+    :param angularTolerance: Angular deflection of the mesh before decimation.
+    :param refinement: Deflection of the reference mesh relative to maxDeviation.
+    :return: The maximal deviation of the result.
+    :raises ValueError: If the deviation bound cannot be met.
+    """
+
+    ref = s.copy()
+    BRepMesh_IncrementalMesh(
+        ref.wrapped, refinement * maxDeviation, False, min(angularTolerance, 0.1)
+    )
+
+    ref_data = _tessellation_arrays(ref.wrapped)
+    ref_faces = dict(zip(ref_data["ranges"][:, 0].tolist(), _faces(ref_data)))
+    ref_deflections = dict(
+        zip(ref_data["ranges"][:, 0].tolist(), ref_data["deflections"].tolist())
+    )
+
+    def _bound(i: int, data: vtkPolyData) -> float:
+
+        return _deviation(ref_faces[i], data) + ref_deflections[i]
+
+    BRepTools.Clean_s(s.wrapped)
+
+    deflection = maxDeviation
+
+    for _ in range(MAX_ATTEMPTS):
+        BRepMesh_IncrementalMesh(s.wrapped, deflection, False, angularTolerance)
+
+        data = _tessellation_arrays(s.wrapped)
+        faces = _faces(data)
+        bounds = [_bound(i, f) for i, f in zip(data["ranges"][:, 0].tolist(), faces)]
+
+        if max(bounds, default=0.0) <= maxDeviation:
+            break
+
+        deflection *= TIGHTENING
+
+    else:
+        raise ValueError(
+            f"Deviation {max(bounds):g} exceeds {maxDeviation:g} after {MAX_ATTEMPTS} "
+            "attempts, consider a lower refinement or angularTolerance"
+        )
+
+    # UV nodes and edge polygons of the undecimated mesh
+    polygons = _polygon_arrays(s.wrapped)
+    node_maps = {}
+
+    vertices = []
+    triangles = []
+    uvs = []
+    ranges = []
+    deflections = []
+
+    n0 = t0 = 0
+
+    for (i, m0, m1, _, _), face, bound in zip(data["ranges"].tolist(), faces, bounds):
+
+        # decimation passes the point data through, so the original node of every
+        # remaining node is known even for coincident seam nodes
+        ids = numpy_to_vtkIdTypeArray(np.arange(m1 - m0, dtype=np.int64), deep=True)
+        ids.SetName(NODE_IDS)
+        face.GetPointData().AddArray(ids)
+
+        # bisect the largest reduction that keeps the bound
+        lo, hi = 0.0, 1.0
+        result = face
+
+        for _ in range(BISECTION_STEPS):
+            reduction = (lo + hi) / 2
+            candidate = _decimate(face, reduction)
+            candidate_bound = _bound(i, candidate)
+
+            if candidate_bound <= maxDeviation:
+                lo = reduction
+                result, bound = candidate, candidate_bound
+            else:
+                hi = reduction
+
+        v, t = _fromPolyData(result)
+
+        # decimation only removes nodes, map the remaining ones to the original ones
+        src = vtk_to_numpy(result.GetPointData().GetArray(NODE_IDS)).astype(np.int64)
+        node_maps[i] = np.full(m1 - m0, -1)
+        node_maps[i][src] = np.arange(len(v))
+
+        n1 = n0 + len(v)
+        t1 = t0 + len(t)
+
+        vertices.append(v)
+        uvs.append(polygons["uvs"][m0 + src])
+        triangles.append(t + n0)
+        ranges.append((i, n0, n1, t0, t1))
+        deflections.append(bound)
+
+        n0, t0 = n1, t1
+
+    # boundary nodes are kept, so the edge polygons only need to be renumbered
+    edge_nodes = polygons["edge_nodes"].copy()
+
+    for _, f, _, k0, k1 in polygons["edge_ranges"].tolist():
+        edge_nodes[k0:k1] = node_maps[f][edge_nodes[k0:k1] - 1] + 1
+
+    if ranges:
+        _restore_triangulation(
+            s.wrapped,
+            dict(
+                vertices=np.concatenate(vertices),
+                triangles=np.concatenate(triangles),
+                ranges=np.array(ranges, dtype=np.int64),
+                deflections=np.array(deflections),
+                uvs=np.concatenate(uvs),
+                edge_ranges=polygons["edge_ranges"],
+                edge_nodes=edge_nodes,
+                edge_params=polygons["edge_params"],
+                edge_deflections=polygons["edge_deflections"],
+            ),
+        )
+
+    return max(deflections, default=0.0)
+
+
+def _centroids(
+    vertices: NDArray[np.float64], triangles: NDArray
+) -> NDArray[np.float64]:
+
+    return vertices[triangles].mean(axis=1)
+
+
+def lods(
+    s: Shape,
+    tolerance: float = 1e-3,
+    angularTolerance: float = 0.1,
+    levels: int = 3,
+    reduction: float = 0.75,
+) -> list[Tessellation]:
+    """
+    Generate levels of detail of a shape for interactive viewing, finest first.
+
+    The finest level is the welded tessellation of the shape. Every next level is
+    derived from the previous one by quadric decimation removing the given fraction
+    of its triangles, so the meshing and welding work is shared by all levels.
+    Triangles of coarse levels are mapped to the face of the nearest fine triangle.
+
+    :param s: Shape to tessellate.
+    :param tolerance: Linear deflection of the finest level.
+    :param angularTolerance: Angular deflection of the finest level.
+    :param levels: Total number of levels.
+    :param reduction: Fraction of triangles removed per level.
+    """
+
+    fine = weld(s.tessellateArrays(tolerance, angularTolerance))
+    rv = [fine]
+
+    if levels > 1 and len(fine.triangles):
+        tree = cKDTree(_centroids(fine.vertices, fine.triangles))
+        data = _toPolyData(fine.vertices, fine.triangles)
+
+    for _ in range(1, levels):
+
+        if len(rv[-1].triangles) == 0:
+            break
+
+        alg = vtkQuadricDecimation()
+        alg.SetInputData(data)
+        alg.SetTargetReduction(reduction)
+        alg.VolumePreservationOn()
+        alg.Update()
+
+        data = alg.GetOutput()
+        vertices, triangles = _fromPolyData(data)
+
+        _, nearest = tree.query(_centroids(vertices, triangles))
+
+        rv.append(
+            Tessellation(vertices, triangles, fine.faces[nearest].astype(np.int32))
+        )
+
+    return rv
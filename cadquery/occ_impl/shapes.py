@@ -18,10 +18,17 @@ from typing import (
 
 from io import BytesIO
 
+from concurrent.futures import ThreadPoolExecutor
+
 from warnings import warn
 
-from vtkmodules.vtkCommonDataModel import vtkPolyData
+import numpy as np
+from numpy.typing import NDArray
+
+from vtkmodules.vtkCommonCore import vtkPoints
+from vtkmodules.vtkCommonDataModel import vtkCellArray, vtkPolyData
 from vtkmodules.vtkFiltersCore import vtkTriangleFilter, vtkPolyDataNormals
+from vtkmodules.util.numpy_support import numpy_to_vtk, numpy_to_vtkIdTypeArray
 
 from OCP.ShapeBuild import ShapeBuild_ReShape
 
@@ -85,6 +92,9 @@ from OCP.BRepAdaptor import (
     BRepAdaptor_Surface,
 )
 
+from OCP.Bnd import Bnd_Box
+from OCP.BRepBndLib import BRepBndLib
+
 from OCP.BRepBuilderAPI import (
     BRepBuilderAPI_Command,
     BRepBuilderAPI_MakeShape,
@@ -164,7 +174,12 @@ from OCP.BRepAlgoAPI import (
 )
 
 from OCP.HLRAlgo import HLRAlgo_Projector
-from OCP.HLRBRep import HLRBRep_Algo, HLRBRep_HLRToShape
+from OCP.HLRBRep import (
+    HLRBRep_Algo,
+    HLRBRep_HLRToShape,
+    HLRBRep_PolyAlgo,
+    HLRBRep_PolyHLRToShape,
+)
 
 from OCP.Geom import (
     Geom_BezierCurve,
@@ -179,7 +194,7 @@ from OCP.Geom2d import Geom2d_Line
 
 from OCP.Geom2dAPI import Geom2dAPI_Interpolate
 
-from OCP.BRepLib import BRepLib, BRepLib_FindSurface
+from OCP.BRepLib import BRepLib, BRepLib_FindSurface, BRepLib_ToolTriangulatedShape
 
 from OCP.BRepOffsetAPI import (
     BRepOffsetAPI_DraftAngle,
@@ -252,6 +267,8 @@ from OCP.TCollection import TCollection_AsciiString
 
 from OCP.TopLoc import TopLoc_Location
 
+from OCP.Poly import Poly_Triangulation, Poly_Triangle, Poly_PolygonOnTriangulation
+
 from OCP.GeomAbs import (
     GeomAbs_Shape,
     GeomAbs_C0,
@@ -305,6 +322,7 @@ from OCP.GeomFill import (
 from OCP.BRepProj import BRepProj_Projection
 from OCP.BRepExtrema import BRepExtrema_DistShapeShape
 
+from OCP.IVtk import IVtk_MeshType
 from OCP.IVtkOCC import IVtkOCC_Shape, IVtkOCC_ShapeMesher
 from OCP.IVtkVTK import IVtkVTK_ShapeData
 
@@ -343,6 +361,8 @@ import warnings
 
 from ..utils import deprecate
 
+from .cache import getMeshCache
+
 Real = float | int
 GlueLiteral = Literal["partial", "full", None]
 
@@ -393,6 +413,28 @@ geom_LUT = {
     ta.TopAbs_COMPOUND: "Compound",
 }
 
+# fields of Shape.properties available for every kind of subshapes
+properties_LUT: dict[str, tuple[str, ...]] = {
+    "Vertex": ("center", "bbmin", "bbmax", "geomType"),
+    "Edge": ("center", "length", "tangent", "bbmin", "bbmax", "geomType"),
+    "Wire": ("center", "length", "bbmin", "bbmax", "geomType"),
+    "Face": ("center", "area", "normal", "bbmin", "bbmax", "geomType"),
+    "Shell": ("center", "area", "bbmin", "bbmax", "geomType"),
+    "Solid": ("center", "area", "volume", "bbmin", "bbmax", "geomType"),
+}
+
+PropertyFields = Literal[
+    "center",
+    "length",
+    "area",
+    "volume",
+    "tangent",
+    "normal",
+    "bbmin",
+    "bbmax",
+    "geomType",
+]
+
 ancestors_LUT = {
     "Vertex": ta.TopAbs_EDGE,
     "Edge": ta.TopAbs_WIRE,
@@ -434,6 +476,602 @@ def fix(obj: TopoDS_Shape) -> TopoDS_Shape:
     return downcast(sf.Shape())
 
 
+@dataclass(frozen=True)
+class Tessellation:
+    """
+    Array based tessellation of a shape.
+
+    * ``vertices`` is a contiguous (N, 3) float64 array of node coordinates.
+    * ``triangles`` is a contiguous (M, 3) int32 array of indices into ``vertices``.
+    * ``faces`` is a (M,) int32 array mapping every triangle to the index of
+      its face in :meth:`Shape.Faces`.
+    * ``normals`` is an optional (N, 3) float64 array of per-vertex normals.
+    """
+
+    vertices: NDArray[np.float64]
+    triangles: NDArray[np.int32]
+    faces: NDArray[np.int32]
+    normals: NDArray[np.float64] | None = None
+
+
+def _trsf_to_array(trsf: gp_Trsf) -> NDArray[np.float64]:
+    """
+    Convert a gp_Trsf to a (3, 4) array.
+    """
+
+    return np.array(
+        [[trsf.Value(i, j) for j in range(1, 5)] for i in range(1, 4)], dtype=np.float64
+    )
+
+
+def _face_triangulation(
+    f: TopoDS_Face,
+    poly: Poly_Triangulation,
+    loc: TopLoc_Location,
+    offset: int,
+    vertices: NDArray[np.float64],
+    triangles: NDArray[np.int32],
+    normals: NDArray[np.float64] | None = None,
+) -> None:
+    """
+    Copy the triangulation of a face into preallocated arrays in global coordinates.
+    Triangles are shifted by offset and oriented consistently with the face orientation.
+    """
+
+    nb_nodes = poly.NbNodes()
+    T = _trsf_to_array(loc.Transformation())
+
+    vertices[:] = [poly.Node(i).Coord() for i in range(1, nb_nodes + 1)]
+    vertices[:] = vertices @ T[:, :3].T + T[:, 3]
+
+    triangles[:] = [t.Get() for t in poly.Triangles()]
+    triangles += offset - 1
+
+    reverse = f.Orientation() == TopAbs_Orientation.TopAbs_REVERSED
+
+    if reverse:
+        triangles[:] = triangles[:, (0, 2, 1)]
+
+    if normals is not None:
+        normals[:] = [poly.Normal(i).Coord() for i in range(1, nb_nodes + 1)]
+
+        # rotate only, location does not scale normals
+        normals[:] = normals @ T[:, :3].T
+        normals /= np.linalg.norm(normals, axis=1, keepdims=True)
+
+        if reverse:
+            normals *= -1
+
+
+def _tessellation_arrays(
+    s: TopoDS_Shape, normals: bool = False, parallel: bool = False
+) -> dict[str, NDArray[Any]]:
+    """
+    Extract the stored triangulations of all faces of a shape into arrays.
+
+    Besides the Tessellation fields, (face index, first node, last node, first triangle,
+    last triangle) ranges and the deflection of every triangulated face are returned.
+    """
+
+    data = []
+
+    face_map = TopTools_IndexedMapOfShape()
+    TopExp.MapShapes_s(s, ta.TopAbs_FACE, face_map)
+
+    for i, f in enumerate(face_map):
+
+        face = TopoDS.Face(f)
+        loc = TopLoc_Location()
+        poly = BRep_Tool.Triangulation_s(face, loc)
+
+        if poly is None:
+            continue
+
+        # triangulations can be shared between faces, so modify them upfront
+        if normals and not poly.HasNormals():
+            BRepLib_ToolTriangulatedShape.ComputeNormals_s(face, poly)
+
+        data.append((i, face, poly, loc))
+
+    # prefix sums of the node and triangle counts
+    node_offsets = np.cumsum([0] + [d[2].NbNodes() for d in data])
+    tri_offsets = np.cumsum([0] + [d[2].NbTriangles() for d in data])
+
+    rv = dict(
+        vertices=np.empty((node_offsets[-1], 3), dtype=np.float64),
+        triangles=np.empty((tri_offsets[-1], 3), dtype=np.int32),
+        faces=np.empty(tri_offsets[-1], dtype=np.int32),
+        ranges=np.column_stack(
+            (
+                np.array([d[0] for d in data], dtype=np.int64),
+                node_offsets[:-1],
+                node_offsets[1:],
+                tri_offsets[:-1],
+                tri_offsets[1:],
+            )
+        ).reshape(-1, 5),
+        deflections=np.array([d[2].Deflection() for d in data], dtype=np.float64),
+    )
+
+    if normals:
+        rv["normals"] = np.empty((node_offsets[-1], 3), dtype=np.float64)
+
+    def _fill(j: int) -> None:
+
+        i, face, poly, loc = data[j]
+        n0, n1 = node_offsets[j], node_offsets[j + 1]
+        t0, t1 = tri_offsets[j], tri_offsets[j + 1]
+
+        _face_triangulation(
+            face,
+            poly,
+            loc,
+            n0,
+            rv["vertices"][n0:n1],
+            rv["triangles"][t0:t1],
+            rv["normals"][n0:n1] if normals else None,
+        )
+        rv["faces"][t0:t1] = i
+
+    if parallel and len(data) > 1:
+        with ThreadPoolExecutor() as pool:
+            for _ in pool.map(_fill, range(len(data))):
+                pass
+    else:
+        for j in range(len(data)):
+            _fill(j)
+
+    return rv
+
+
+def _polygon_arrays(s: TopoDS_Shape) -> dict[str, NDArray[Any]]:
+    """
+    Extract the UV nodes of the face triangulations and the polygons of the edges on
+    them, which are needed for a restored mesh to be complete.
+
+    ``uvs`` are aligned with the vertices of _tessellation_arrays and NaN for faces
+    without UV nodes. Every row of ``edge_ranges`` holds the edge index, face index,
+    a reversed flag for the second polygon of seam edges and the first and last
+    position in ``edge_nodes`` and ``edge_params``. Missing parameters are NaN.
+    """
+
+    faces = TopTools_IndexedMapOfShape()
+    TopExp.MapShapes_s(s, ta.TopAbs_FACE, faces)
+
+    edges = TopTools_IndexedMapOfShape()
+    TopExp.MapShapes_s(s, ta.TopAbs_EDGE, edges)
+
+    uvs = []
+    ranges = []
+    nodes: list[int] = []
+    params: list[float] = []
+    deflections = []
+
+    for i in range(1, faces.Extent() + 1):
+
+        face = TopoDS.Face(faces.FindKey(i))
+        loc = TopLoc_Location()
+        poly = BRep_Tool.Triangulation_s(face, loc)
+
+        if poly is None:
+            continue
+
+        n = poly.NbNodes()
+
+        if poly.HasUVNodes():
+            uvs.append([poly.UVNode(j).Coord() for j in range(1, n + 1)])
+        else:
+            uvs.append(np.full((n, 2), np.nan))
+
+        face_edges = TopTools_IndexedMapOfShape()
+        TopExp.MapShapes_s(face, ta.TopAbs_EDGE, face_edges)
+
+        for k in range(1, face_edges.Extent() + 1):
+
+            edge = TopoDS.Edge(face_edges.FindKey(k)).Oriented(
+                TopAbs_Orientation.TopAbs_FORWARD
+            )
+
+            # seam edges hold a polygon per orientation
+            oriented = [edge]
+            if BRep_Tool.IsClosed_s(edge, face):
+                oriented.append(TopoDS.Edge(edge.Reversed()))
+
+            for rev, e in enumerate(oriented):
+                edge_poly = BRep_Tool.PolygonOnTriangulation_s(e, poly, loc)
+
+                if edge_poly is None:
+                    continue
+
+                m = edge_poly.NbNodes()
+
+                ranges.append(
+                    (edges.FindIndex(edge) - 1, i - 1, rev, len(nodes), len(nodes) + m)
+                )
+                nodes.extend(edge_poly.Node(j) for j in range(1, m + 1))
+                params.extend(
+                    edge_poly.Parameter(j) if edge_poly.HasParameters() else np.nan
+                    for j in range(1, m + 1)
+                )
+                deflections.append(edge_poly.Deflection())
+
+    return dict(
+        uvs=np.concatenate(uvs).reshape(-1, 2) if uvs else np.empty((0, 2)),
+        edge_ranges=np.array(ranges, dtype=np.int64).reshape(-1, 5),
+        edge_nodes=np.array(nodes, dtype=np.int32),
+        edge_params=np.array(params, dtype=np.float64),
+        edge_deflections=np.array(deflections, dtype=np.float64),
+    )
+
+
+def _mesh_arrays(
+    s: TopoDS_Shape, normals: bool = False, parallel: bool = False
+) -> dict[str, NDArray[Any]]:
+    """
+    Arrays of _tessellation_arrays and _polygon_arrays, as stored by the mesh cache.
+    """
+
+    return {
+        **_tessellation_arrays(s, normals, parallel),
+        **_polygon_arrays(s),
+    }
+
+
+def _restore_triangulation(s: TopoDS_Shape, data: dict[str, NDArray[Any]]) -> None:
+    """
+    Attach triangulations extracted by _mesh_arrays back to the faces of a shape,
+    together with the UV nodes and the polygons of their edges if present.
+    """
+
+    faces = TopTools_IndexedMapOfShape()
+    TopExp.MapShapes_s(s, ta.TopAbs_FACE, faces)
+
+    edges = TopTools_IndexedMapOfShape()
+    TopExp.MapShapes_s(s, ta.TopAbs_EDGE, edges)
+
+    bldr = BRep_Builder()
+    polys: dict[int, Poly_Triangulation] = {}
+
+    for (i, n0, n1, t0, t1), deflection in zip(
+        data["ranges"].tolist(), data["deflections"].tolist()
+    ):
+
+        face = TopoDS.Face(faces.FindKey(i + 1))
+        loc = face.Location()
+
+        # back to the local coordinates of the face
+        T = _trsf_to_array(loc.Transformation().Inverted())
+        vertices = (data["vertices"][n0:n1] @ T[:, :3].T + T[:, 3]).tolist()
+
+        triangles = np.array(data["triangles"][t0:t1]) - (n0 - 1)
+        if face.Orientation() == TopAbs_Orientation.TopAbs_REVERSED:
+            triangles = triangles[:, (0, 2, 1)]
+
+        uvs = np.array(data["uvs"][n0:n1]) if "uvs" in data else None
+        has_uvs = uvs is not None and not np.isnan(uvs).any()
+
+        poly = Poly_Triangulation(n1 - n0, t1 - t0, has_uvs)
+
+        for j, v in enumerate(vertices, 1):
+            poly.SetNode(j, gp_Pnt(*v))
+
+        if uvs is not None and has_uvs:
+            for j, uv in enumerate(uvs.tolist(), 1):
+                poly.SetUVNode(j, gp_Pnt2d(*uv))
+
+        for j, t in enumerate(triangles.tolist(), 1):
+            poly.SetTriangle(j, Poly_Triangle(*t))
+
+        poly.Deflection(deflection)
+
+        bldr.UpdateFace(face, poly)
+        polys[i] = poly
+
+    if "edge_ranges" not in data:
+        return
+
+    # polygons of the edges on the restored triangulations, per edge and face
+    edge_polys: dict[tuple[int, int], list[Poly_PolygonOnTriangulation]] = {}
+
+    for (e, f, _, k0, k1), deflection in zip(
+        data["edge_ranges"].tolist(), data["edge_deflections"].tolist()
+    ):
+
+        params = data["edge_params"][k0:k1]
+        has_params = not np.isnan(params).any()
+
+        edge_poly = Poly_PolygonOnTriangulation(k1 - k0, has_params)
+
+        for j, n in enumerate(data["edge_nodes"][k0:k1].tolist(), 1):
+            edge_poly.SetNode(j, n)
+
+        if has_params:
+            for j, p in enumerate(params.tolist(), 1):
+                edge_poly.SetParameter(j, p)
+
+        edge_poly.Deflection(deflection)
+
+        # rows of seam edges are stored forward first
+        edge_polys.setdefault((e, f), []).append(edge_poly)
+
+    for (e, f), ps in edge_polys.items():
+
+        face = faces.FindKey(f + 1)
+        edge = TopoDS.Edge(edges.FindKey(e + 1)).Oriented(
+            TopAbs_Orientation.TopAbs_FORWARD
+        )
+
+        if len(ps) == 1:
+            bldr.UpdateEdge(edge, ps[0], polys[f], face.Location())
+        else:
+            bldr.UpdateEdge(edge, ps[0], ps[1], polys[f], face.Location())
+
+
+def _vtk_cell_array(cells: NDArray[Any]) -> vtkCellArray:
+    """
+    Convert a (K, n) array of point indices to a vtkCellArray.
+    """
+
+    K, n = cells.shape
+    rv = vtkCellArray()
+    rv.SetData(
+        numpy_to_vtkIdTypeArray(
+            np.arange(0, n * K + 1, n, dtype=np.int64), deep=True
+        ),
+        numpy_to_vtkIdTypeArray(cells.astype(np.int64).ravel(), deep=True),
+    )
+
+    return rv
+
+
+def _vtk_poly_data(s: TopoDS_Shape, normals: bool = False) -> vtkPolyData | None:
+    """
+    Build vtkPolyData of the vertices, edges and faces of a shape directly from the
+    stored face triangulations and edge polygons, following the conventions of
+    IVtkOCC_ShapeMesher and the post-processing of Shape.toVtkPolyData. Returns None
+    if any face or edge is not meshed.
+    """
+
+    faces = TopTools_IndexedMapOfShape()
+    TopExp.MapShapes_s(s, ta.TopAbs_FACE, faces)
+
+    data = _tessellation_arrays(s)
+
+    if len(data["ranges"]) != faces.Extent():
+        return None
+
+    subshapes = TopTools_IndexedMapOfShape()
+    TopExp.MapShapes_s(s, subshapes)
+
+    node_offsets = dict(data["ranges"][:, :2].tolist())
+
+    points = [data["vertices"]]
+    n_points = len(data["vertices"])
+
+    lines = []
+    line_ids = []
+    line_types = []
+
+    edge_faces = TopTools_IndexedDataMapOfShapeListOfShape()
+    TopExp.MapShapesAndAncestors_s(s, ta.TopAbs_EDGE, ta.TopAbs_FACE, edge_faces)
+
+    for i in range(1, edge_faces.Extent() + 1):
+
+        edge = TopoDS.Edge(edge_faces.FindKey(i))
+        ancestors = edge_faces.FindFromIndex(i)
+
+        if BRep_Tool.Degenerated_s(edge):
+            continue
+
+        loc = TopLoc_Location()
+
+        if ancestors.IsEmpty():
+            poly3d = BRep_Tool.Polygon3D_s(edge, loc)
+
+            if poly3d is None:
+                return None
+
+            T = _trsf_to_array(loc.Transformation())
+            pts = np.array([p.Coord() for p in poly3d.Nodes()]) @ T[:, :3].T + T[:, 3]
+
+            ixs = np.arange(n_points, n_points + len(pts))
+            points.append(pts)
+            n_points += len(pts)
+
+            kind = IVtk_MeshType.MT_FreeEdge
+        else:
+            face = TopoDS.Face(ancestors.First())
+            poly = BRep_Tool.PolygonOnTriangulation_s(
+                edge, BRep_Tool.Triangulation_s(face, loc), loc
+            )
+
+            if poly is None:
+                return None
+
+            nodes = poly.Nodes()
+            ixs = np.array(
+                [nodes.Value(j) for j in range(nodes.Lower(), nodes.Upper() + 1)]
+            )
+            ixs += node_offsets[faces.FindIndex(face) - 1] - 1
+
+            if BRep_Tool.IsClosed_s(edge, face):
+                kind = IVtk_MeshType.MT_SeamEdge
+            elif ancestors.Size() == 1:
+                kind = IVtk_MeshType.MT_BoundaryEdge
+            else:
+                kind = IVtk_MeshType.MT_SharedEdge
+
+        lines.append(np.column_stack((ixs[:-1], ixs[1:])))
+        line_ids.append(np.full(len(ixs) - 1, subshapes.FindIndex(edge)))
+        line_types.append(np.full(len(ixs) - 1, int(kind)))
+
+    vertex_edges = TopTools_IndexedDataMapOfShapeListOfShape()
+    TopExp.MapShapesAndAncestors_s(s, ta.TopAbs_VERTEX, ta.TopAbs_EDGE, vertex_edges)
+
+    vertex_ids = []
+    vertex_types = []
+
+    for i in range(1, vertex_edges.Extent() + 1):
+
+        vertex = TopoDS.Vertex(vertex_edges.FindKey(i))
+
+        points.append(np.array([BRep_Tool.Pnt_s(vertex).Coord()]))
+        vertex_ids.append(subshapes.FindIndex(vertex))
+        vertex_types.append(
+            int(
+                IVtk_MeshType.MT_FreeVertex
+                if vertex_edges.FindFromIndex(i).IsEmpty()
+                else IVtk_MeshType.MT_SharedVertex
+            )
+        )
+
+    n_vertices = len(vertex_ids)
+    vertices = np.arange(n_points, n_points + n_vertices).reshape(-1, 1)
+
+    # subshape ids of the faces
+    face_ids = np.array(
+        [subshapes.FindIndex(faces.FindKey(i)) for i in range(1, faces.Extent() + 1)],
+        dtype=np.int64,
+    )
+
+    rv = vtkPolyData()
+
+    vtk_points = vtkPoints()
+    vtk_points.SetData(numpy_to_vtk(np.concatenate(points), deep=True))
+    rv.SetPoints(vtk_points)
+
+    rv.SetVerts(_vtk_cell_array(vertices))
+    rv.SetLines(
+        _vtk_cell_array(np.concatenate(lines) if lines else np.empty((0, 2)))
+    )
+    rv.SetPolys(_vtk_cell_array(data["triangles"]))
+
+    # cell data in the order verts, lines, polys
+    for name, values in (
+        (
+            "SUBSHAPE_IDS",
+            (vertex_ids, np.concatenate(line_ids + [[]]), face_ids[data["faces"]]),
+        ),
+        (
+            "MESH_TYPES",
+            (
+                vertex_types,
+                np.concatenate(line_types + [[]]),
+                np.full(len(data["triangles"]), int(IVtk_MeshType.MT_ShadedFace)),
+            ),
+        ),
+    ):
+        arr = numpy_to_vtkIdTypeArray(
+            np.concatenate(values).astype(np.int64), deep=True
+        )
+        arr.SetName(name)
+        rv.GetCellData().AddArray(arr)
+
+    return _vtk_filter(rv, normals)
+
+
+def _vtk_filter(data: vtkPolyData, normals: bool) -> vtkPolyData:
+    """
+    Convert to triangles, split edges and optionally compute normals.
+    """
+
+    # convert to triangles and split edges
+    t_filter = vtkTriangleFilter()
+    t_filter.SetInputData(data)
+    t_filter.Update()
+
+    rv = t_filter.GetOutput()
+
+    # compute normals
+    if normals:
+        n_filter = vtkPolyDataNormals()
+        n_filter.SetComputePointNormals(True)
+        n_filter.SetComputeCellNormals(True)
+        n_filter.SetFeatureAngle(360)
+        n_filter.SetInputData(rv)
+        n_filter.Update()
+
+        rv = n_filter.GetOutput()
+
+    return rv
+
+
+class _TopologyIndex(object):
+    """
+    Lazily built maps of subshapes and ancestors of a shape. The index is valid as
+    long as the location and orientation of the shape are unchanged and no topology
+    was modified in place since it was built.
+    """
+
+    # number of in place modifications, shared by all indices since the modified
+    # TShape can be referenced by any number of shapes
+    modifications: int = 0
+
+    shape: TopoDS_Shape
+    modification: int
+    entities: dict[TopAbs_ShapeEnum, TopTools_IndexedMapOfShape]
+    ancestors: dict[
+        tuple[TopAbs_ShapeEnum, TopAbs_ShapeEnum],
+        TopTools_IndexedDataMapOfShapeListOfShape,
+    ]
+
+    def __init__(self, obj: TopoDS_Shape):
+
+        # copy, so that in place modifications of obj are detected
+        self.shape = obj.Oriented(obj.Orientation())
+        self.modification = _TopologyIndex.modifications
+
+        self.entities = {}
+        self.ancestors = {}
+
+    @classmethod
+    def modified(cls) -> None:
+        """
+        Invalidate all indices after a topology was modified in place.
+        """
+
+        cls.modifications += 1
+
+    def valid(self, obj: TopoDS_Shape) -> bool:
+
+        return (
+            self.modification == _TopologyIndex.modifications
+            and self.shape.IsEqual(obj)
+        )
+
+    def entitiesOf(self, kind: TopAbs_ShapeEnum) -> TopTools_IndexedMapOfShape:
+        """
+        Unique subshapes of a given kind.
+        """
+
+        rv = self.entities.get(kind)
+
+        if rv is None:
+            rv = TopTools_IndexedMapOfShape()
+            TopExp.MapShapes_s(self.shape, kind, rv)
+
+            self.entities[kind] = rv
+
+        return rv
+
+    def ancestorsOf(
+        self, child: TopAbs_ShapeEnum, parent: TopAbs_ShapeEnum
+    ) -> TopTools_IndexedDataMapOfShapeListOfShape:
+        """
+        Map of subshapes of kind child to their ancestors of kind parent.
+        """
+
+        rv = self.ancestors.get((child, parent))
+
+        if rv is None:
+            rv = TopTools_IndexedDataMapOfShapeListOfShape()
+            TopExp.MapShapesAndAncestors_s(self.shape, child, parent, rv)
+
+            self.ancestors[(child, parent)] = rv
+
+        return rv
+
+
 class Shape(object):
     """
     Represents a shape in the system. Wraps TopoDS_Shape.
@@ -441,6 +1079,7 @@ class Shape(object):
 
     wrapped: TopoDS_Shape
     forConstruction: bool
+    _topology: _TopologyIndex | None
 
     def __init__(self, obj: TopoDS_Shape) -> None:
         self.wrapped = downcast(obj)
@@ -515,10 +1154,14 @@ class Shape(object):
             Setting this value to True may cause large features to become faceted, or small features dense.
         :param parallel: If True, OCCT will use parallel processing to mesh the shape. Default is True.
         """
-        # The constructor used here automatically calls mesh.Perform(). https://dev.opencascade.org/doc/refman/html/class_b_rep_mesh___incremental_mesh.html#a3a383b3afe164161a3aa59a492180ac6
-        BRepMesh_IncrementalMesh(
-            self.wrapped, tolerance, relative, angularTolerance, parallel
-        )
+        # cached meshes are always relative
+        if relative and getMeshCache() is not None:
+            self.mesh(tolerance, angularTolerance, parallel)
+        else:
+            # The constructor used here automatically calls mesh.Perform(). https://dev.opencascade.org/doc/refman/html/class_b_rep_mesh___incremental_mesh.html#a3a383b3afe164161a3aa59a492180ac6
+            BRepMesh_IncrementalMesh(
+                self.wrapped, tolerance, relative, angularTolerance, parallel
+            )
 
         writer = StlAPI_Writer()
         writer.ASCIIMode = ascii
@@ -905,10 +1548,22 @@ class Shape(object):
     def ShapeType(self) -> Shapes:
         return tcast(Shapes, shape_LUT[shapetype(self.wrapped)])
 
+    def _index(self) -> _TopologyIndex:
+        """
+        Topology index of this shape, rebuilt if the shape was moved or modified in
+        place.
+        """
+
+        rv: _TopologyIndex | None = getattr(self, "_topology", None)
+
+        if rv is None or not rv.valid(self.wrapped):
+            rv = self._topology = _TopologyIndex(self.wrapped)
+
+        return rv
+
     def _entities(self, topo_type: Shapes) -> Iterable[TopoDS_Shape]:
 
-        shape_set = TopTools_IndexedMapOfShape()
-        TopExp.MapShapes_s(self.wrapped, inverse_shape_LUT[topo_type], shape_set)
+        shape_set = self._index().entitiesOf(inverse_shape_LUT[topo_type])
 
         return tcast(Iterable[TopoDS_Shape], shape_set)
 
@@ -916,13 +1571,8 @@ class Shape(object):
         self, child_type: Shapes, parent_type: Shapes
     ) -> dict[Shape, list[Shape]]:
 
-        res = TopTools_IndexedDataMapOfShapeListOfShape()
-
-        TopExp.MapShapesAndAncestors_s(
-            self.wrapped,
-            inverse_shape_LUT[child_type],
-            inverse_shape_LUT[parent_type],
-            res,
+        res = self._index().ancestorsOf(
+            inverse_shape_LUT[child_type], inverse_shape_LUT[parent_type]
         )
 
         out: dict[Shape, list[Shape]] = {}
@@ -1148,6 +1798,137 @@ class Shape(object):
         # when density == 1, mass == volume
         return Shape.computeMass(self, tol)
 
+    def properties(
+        self, kind: Shapes, fields: Iterable[PropertyFields] = ("center",)
+    ) -> dict[str, NDArray]:
+        """
+        Compute geometric properties of all subshapes of a given kind in one pass.
+
+        Vector fields (center, tangent, normal, bbmin, bbmax) are returned as (N, 3)
+        arrays, scalar fields (length, area, volume) as (N,) arrays and geomType as
+        an array of strings. Rows follow the order of e.g. :meth:`Faces`. Values
+        match the per object methods: tangents are computed at the middle of the
+        length of edges and normals at the center of the uv bounds of faces.
+
+        :param kind: Type of the subshapes.
+        :param fields: Properties to compute.
+        :returns: Dictionary of arrays keyed by field.
+        """
+
+        fields = list(fields)
+
+        if kind not in properties_LUT:
+            raise ValueError(f"Properties of {kind} are not supported")
+
+        invalid = set(fields) - set(properties_LUT[kind])
+
+        if invalid:
+            raise ValueError(f"Unsupported properties of {kind}: {sorted(invalid)}")
+
+        if kind == "Edge":
+            objs = [
+                el
+                for el in self._entities(kind)
+                if not BRep_Tool.Degenerated_s(TopoDS.Edge(el))
+            ]
+        else:
+            objs = list(self._entities(kind))
+
+        n = len(objs)
+        rv: dict[str, NDArray] = {}
+
+        for f in fields:
+            if f == "geomType":
+                continue
+            elif f in ("length", "area", "volume"):
+                rv[f] = np.empty(n)
+            else:
+                rv[f] = np.empty((n, 3))
+
+        types = []
+
+        calc_function = shape_properties_LUT[inverse_shape_LUT[kind]]
+        tr: Any = geom_LUT[inverse_shape_LUT[kind]]
+
+        pnt = gp_Pnt()
+        vec = gp_Vec()
+        adaptor: Any = None
+
+        for i, obj in enumerate(objs):
+            obj = downcast(obj)
+
+            # one adaptor per subshape
+            if kind == "Edge":
+                adaptor = BRepAdaptor_Curve(obj)
+            elif kind == "Wire":
+                adaptor = BRepAdaptor_CompCurve(obj)
+            elif kind == "Face":
+                adaptor = BRepAdaptor_Surface(obj)
+
+            if "center" in rv:
+                if kind == "Vertex":
+                    center = BRep_Tool.Pnt_s(obj)
+                else:
+                    props = GProp_GProps()
+                    calc_function(obj, props)
+                    center = props.CentreOfMass()
+
+                rv["center"][i] = center.X(), center.Y(), center.Z()
+
+            if "length" in rv:
+                rv["length"][i] = GCPnts_AbscissaPoint.Length_s(adaptor)
+
+            if "tangent" in rv:
+                length = GCPnts_AbscissaPoint.Length_s(adaptor)
+                param = GCPnts_AbscissaPoint(
+                    adaptor, 0.5 * length, adaptor.FirstParameter()
+                ).Parameter()
+
+                adaptor.D1(param, pnt, vec)
+                tangent = gp_Dir(vec)
+
+                rv["tangent"][i] = tangent.X(), tangent.Y(), tangent.Z()
+
+            if "area" in rv:
+                props = GProp_GProps()
+                BRepGProp.SurfaceProperties_s(obj, props)
+                rv["area"][i] = props.Mass()
+
+            if "volume" in rv:
+                props = GProp_GProps()
+                BRepGProp.VolumeProperties_s(obj, props)
+                rv["volume"][i] = props.Mass()
+
+            if "normal" in rv:
+                u0, u1, v0, v1 = BRepTools.UVBounds_s(obj)
+                BRepGProp_Face(obj).Normal(0.5 * (u0 + u1), 0.5 * (v0 + v1), pnt, vec)
+                normal = vec.Normalized()
+
+                rv["normal"][i] = normal.X(), normal.Y(), normal.Z()
+
+            if "bbmin" in rv or "bbmax" in rv:
+                bb = Bnd_Box()
+                BRepBndLib.AddOptimal_s(obj, bb)
+                xmin, ymin, zmin, xmax, ymax, zmax = bb.Get()
+
+                if "bbmin" in rv:
+                    rv["bbmin"][i] = xmin, ymin, zmin
+                if "bbmax" in rv:
+                    rv["bbmax"][i] = xmax, ymax, zmax
+
+            if "geomType" in fields:
+                if isinstance(tr, str):
+                    types.append(tr)
+                elif kind == "Edge":
+                    types.append(geom_LUT_EDGE[adaptor.GetType()])
+                else:
+                    types.append(geom_LUT_FACE[adaptor.GetType()])
+
+        if "geomType" in fields:
+            rv["geomType"] = np.array(types, dtype=str)
+
+        return rv
+
     def _apply_transform(self: T, Tr: gp_Trsf) -> T:
 
         return self.__class__(BRepBuilderAPI_Transform(self.wrapped, Tr, True).Shape())
@@ -1605,66 +2386,104 @@ class Shape(object):
 
             yield dist_calc.Value()
 
-    def mesh(self, tolerance: float, angularTolerance: float = 0.1) -> None:
+    def mesh(
+        self, tolerance: float, angularTolerance: float = 0.1, parallel: bool = False
+    ) -> None:
         """
         Generate triangulation if none exists.
+
+        :param tolerance: Linear deflection of the mesh.
+        :param angularTolerance: Angular deflection of the mesh.
+        :param parallel: Mesh faces in parallel.
         """
 
         if not BRepTools.Triangulation_s(self.wrapped, tolerance):
-            BRepMesh_IncrementalMesh(self.wrapped, tolerance, True, angularTolerance)
+
+            cache = getMeshCache()
+
+            if cache is None:
+                BRepMesh_IncrementalMesh(
+                    self.wrapped, tolerance, True, angularTolerance, parallel
+                )
+            else:
+                key = cache.key(self.wrapped, tolerance, angularTolerance)
+                cached = cache.get(key)
+
+                if cached is None or "edge_ranges" not in cached:
+                    BRepMesh_IncrementalMesh(
+                        self.wrapped, tolerance, True, angularTolerance, parallel
+                    )
+                    cache.put(key, _mesh_arrays(self.wrapped))
+                else:
+                    _restore_triangulation(self.wrapped, cached)
 
     def tessellate(
         self, tolerance: float, angularTolerance: float = 0.1
     ) -> tuple[list[Vector], list[tuple[int, int, int]]]:
+        """
+        Tessellate the shape and return a list of vertices and a list of triangles.
+        """
 
-        self.mesh(tolerance, angularTolerance)
+        tess = self.tessellateArrays(tolerance, angularTolerance)
 
-        vertices: list[Vector] = []
-        triangles: list[tuple[int, int, int]] = []
-        offset = 0
+        vertices = [Vector(x, y, z) for x, y, z in tess.vertices.tolist()]
+        triangles: list[tuple[int, int, int]] = list(
+            map(tuple, tess.triangles.tolist())
+        )
 
-        for f in self.Faces():
+        return vertices, triangles
 
-            loc = TopLoc_Location()
-            poly = BRep_Tool.Triangulation_s(f.wrapped, loc)
-            if poly is None:
-                continue
-            Trsf = loc.Transformation()
-            reverse = (
-                True
-                if f.wrapped.Orientation() == TopAbs_Orientation.TopAbs_REVERSED
-                else False
-            )
+    def tessellateArrays(
+        self,
+        tolerance: float,
+        angularTolerance: float = 0.1,
+        normals: bool = False,
+        parallel: bool = False,
+    ) -> Tessellation:
+        """
+        Tessellate the shape and return the result as contiguous arrays.
 
-            # add vertices
-            vertices += [
-                Vector(v.X(), v.Y(), v.Z())
-                for v in (
-                    poly.Node(i).Transformed(Trsf) for i in range(1, poly.NbNodes() + 1)
-                )
-            ]
+        Output arrays are preallocated and every face is copied into its own
+        slice, so the result does not depend on the order in which faces are processed.
 
-            # add triangles
-            triangles += [
-                (
-                    (
-                        t.Value(1) + offset - 1,
-                        t.Value(3) + offset - 1,
-                        t.Value(2) + offset - 1,
-                    )
-                    if reverse
-                    else (
-                        t.Value(1) + offset - 1,
-                        t.Value(2) + offset - 1,
-                        t.Value(3) + offset - 1,
+        :param tolerance: Linear deflection of the mesh.
+        :param angularTolerance: Angular deflection of the mesh.
+        :param normals: Compute per-vertex normals.
+        :param parallel: Mesh faces and extract their triangulations in parallel.
+        :return: Vertices, triangles, per-triangle face indices and optionally normals.
+        """
+
+        cache = getMeshCache()
+
+        if cache is None:
+            self.mesh(tolerance, angularTolerance, parallel)
+            data = _tessellation_arrays(self.wrapped, normals, parallel)
+        else:
+            key = cache.key(self.wrapped, tolerance, angularTolerance)
+            cached = cache.get(key)
+
+            if cached is not None and (not normals or "normals" in cached):
+                data = cached
+            else:
+                # an existing triangulation is used but not cached under this key
+                meshed = not BRepTools.Triangulation_s(self.wrapped, tolerance)
+
+                if meshed:
+                    BRepMesh_IncrementalMesh(
+                        self.wrapped, tolerance, True, angularTolerance, parallel
                     )
-                )
-                for t in poly.Triangles()
-            ]
 
-            offset += poly.NbNodes()
+                data = _mesh_arrays(self.wrapped, normals, parallel)
 
-        return vertices, triangles
+                if meshed:
+                    cache.put(key, data)
+
+        return Tessellation(
+            data["vertices"],
+            data["triangles"],
+            data["faces"],
+            data["normals"] if normals else None,
+        )
 
     def toSplines(
         self: T, degree: int = 3, tolerance: float = 1e-3, nurbs: bool = False
@@ -1710,9 +2529,16 @@ class Shape(object):
         normals: bool = False,
     ) -> vtkPolyData:
         """
-        Convert shape to vtkPolyData
+        Convert shape to vtkPolyData. If the shape is already meshed within the given
+        tolerance, the stored triangulation is used.
         """
 
+        if tolerance and BRepTools.Triangulation_s(self.wrapped, tolerance, True):
+            rv = _vtk_poly_data(self.wrapped, normals)
+
+            if rv is not None:
+                return rv
+
         vtk_shape = IVtkOCC_Shape(self.wrapped)
         shape_data = IVtkVTK_ShapeData()
         shape_mesher = IVtkOCC_ShapeMesher()
@@ -1729,27 +2555,7 @@ class Shape(object):
 
         shape_mesher.Build(vtk_shape, shape_data)
 
-        rv = shape_data.getVtkPolyData()
-
-        # convert to triangles and split edges
-        t_filter = vtkTriangleFilter()
-        t_filter.SetInputData(rv)
-        t_filter.Update()
-
-        rv = t_filter.GetOutput()
-
-        # compute normals
-        if normals:
-            n_filter = vtkPolyDataNormals()
-            n_filter.SetComputePointNormals(True)
-            n_filter.SetComputeCellNormals(True)
-            n_filter.SetFeatureAngle(360)
-            n_filter.SetInputData(rv)
-            n_filter.Update()
-
-            rv = n_filter.GetOutput()
-
-        return rv
+        return _vtk_filter(shape_data.getVtkPolyData(), normals)
 
     def _repr_javascript_(self) -> str:
         """
@@ -1776,10 +2582,8 @@ class Shape(object):
         Iterate over ancestors, i.e. shapes of type kind within ctx shape that contain self.
         """
 
-        shape_map = TopTools_IndexedDataMapOfShapeListOfShape()
-
-        TopExp.MapShapesAndAncestors_s(
-            ctx.wrapped, shapetype(self.wrapped), inverse_shape_LUT[kind], shape_map
+        shape_map = ctx._index().ancestorsOf(
+            shapetype(self.wrapped), inverse_shape_LUT[kind]
         )
 
         return Compound.makeCompound(
@@ -1793,9 +2597,8 @@ class Shape(object):
         Iterate over siblings, i.e. shapes within ctx shape that share subshapes of type kind with self.
         """
 
-        shape_map = TopTools_IndexedDataMapOfShapeListOfShape()
-        TopExp.MapShapesAndAncestors_s(
-            ctx.wrapped, inverse_shape_LUT[kind], shapetype(self.wrapped), shape_map,
+        shape_map = ctx._index().ancestorsOf(
+            inverse_shape_LUT[kind], shapetype(self.wrapped)
         )
         exclude = TopTools_MapOfShape()
 
@@ -4854,6 +5657,9 @@ class Compound(Shape, Mixin3D):
         for s in shape:
             comp_builder.Remove(self.wrapped, s.wrapped)
 
+        # the topology was modified in place, other shapes may share it
+        _TopologyIndex.modified()
+
         return self
 
     @classmethod
@@ -5006,16 +5812,15 @@ class Compound(Shape, Mixin3D):
 
         """
 
-        shape_map = TopTools_IndexedDataMapOfShapeListOfShape()
-        shapetypes = set(shapetype(ch.wrapped) for ch in self)
-
-        for t in shapetypes:
-            TopExp.MapShapesAndAncestors_s(
-                ctx.wrapped, t, inverse_shape_LUT[kind], shape_map
-            )
+        index = ctx._index()
+        parent = inverse_shape_LUT[kind]
 
         return Compound.makeCompound(
-            Shape.cast(a) for s in self for a in shape_map.FindFromKey(s.wrapped)
+            Shape.cast(a)
+            for s in self
+            for a in index.ancestorsOf(shapetype(s.wrapped), parent).FindFromKey(
+                s.wrapped
+            )
         )
 
     def siblings(
@@ -5026,13 +5831,11 @@ class Compound(Shape, Mixin3D):
 
         """
 
-        shape_map = TopTools_IndexedDataMapOfShapeListOfShape()
+        index = ctx._index()
         shapetypes = set(shapetype(ch.wrapped) for ch in self)
-
-        for t in shapetypes:
-            TopExp.MapShapesAndAncestors_s(
-                ctx.wrapped, inverse_shape_LUT[kind], t, shape_map,
-            )
+        shape_maps = [
+            index.ancestorsOf(inverse_shape_LUT[kind], t) for t in shapetypes
+        ]
 
         exclude = TopTools_MapOfShape()
 
@@ -5047,6 +5850,7 @@ class Compound(Shape, Mixin3D):
                 rv.update(
                     Shape.cast(el)
                     for child in s._entities(kind)
+                    for shape_map in shape_maps
                     for el in shape_map.FindFromKey(child)
                     if not exclude.Contains(el)
                 )
@@ -8247,6 +9051,9 @@ def hlr(
     pnt: VectorLike = (0, 0, 0),
     up: VectorLike | None = None,
     focus: float | None = None,
+    poly: bool = False,
+    tolerance: float = 1e-3,
+    angularTolerance: float = 0.1,
 ) -> HLRResult:
     """
     Project a shape onto a plane and perform hidden-line removal. Useful for
@@ -8256,6 +9063,10 @@ def hlr(
     Orthographic projection is used by default; supplying ``focus`` enables
     perspective projection.
 
+    By default the exact algorithm is used. With ``poly`` the shape is meshed and the
+    hidden lines are computed on the triangulation, which is much faster for complex
+    shapes but yields polygonal edges.
+
     :param s: Shape to project.
     :param dir: Projection direction and normal of the projection plane.
     :param pnt: Origin of the projection plane.
@@ -8263,14 +9074,15 @@ def hlr(
         OCCT chooses the in-plane orientation.
     :param focus: Focal distance for perspective projection. If omitted,
         orthographic projection is used.
+    :param poly: Use the mesh based algorithm.
+    :param tolerance: Linear deflection of the mesh used by the mesh based algorithm.
+    :param angularTolerance: Angular deflection of the mesh used by the mesh based
+        algorithm.
     :return: Visible and hidden projected edges together with the projection
         plane.
     :raises ValueError: If ``dir`` or ``up`` is zero, or if ``up`` is parallel
         to ``dir``.
     """
-    hlr = HLRBRep_Algo()
-    hlr.Add(s.wrapped)
-
     origin = Vector(pnt)
     normal = Vector(dir)
 
@@ -8307,11 +9119,28 @@ def hlr(
     else:
         projector = HLRAlgo_Projector(coordinate_system)
 
-    hlr.Projector(projector)
-    hlr.Update()
-    hlr.Hide()
+    hlr_shapes: HLRBRep_HLRToShape | HLRBRep_PolyHLRToShape
+
+    if poly:
+        # mesh a copy, so that the triangulation of s is not modified
+        meshed = s.copy()
+        meshed.mesh(tolerance, angularTolerance)
+
+        poly_algo = HLRBRep_PolyAlgo()
+        poly_algo.Load(meshed.wrapped)
+        poly_algo.Projector(projector)
+        poly_algo.Update()
+
+        hlr_shapes = HLRBRep_PolyHLRToShape()
+        hlr_shapes.Update(poly_algo)
+    else:
+        algo = HLRBRep_Algo()
+        algo.Add(s.wrapped)
+        algo.Projector(projector)
+        algo.Update()
+        algo.Hide()
 
-    hlr_shapes = HLRBRep_HLRToShape(hlr)
+        hlr_shapes = HLRBRep_HLRToShape(algo)
 
     visible = []
 
@@ -0,0 +1,222 @@
+"""
+Single file store of many shapes with an index of names and bounding boxes.
+"""
+
+import json
+import mmap
+
+from io import BytesIO
+from pathlib import Path
+from struct import pack, unpack_from
+from typing import IO, Iterable, Iterator, Mapping, Optional
+
+import numpy as np
+from numpy.typing import NDArray
+
+from OCP.Bnd import Bnd_Box
+
+from .geom import BoundBox, Vector
+from .shapes import Shape
+
+MAGIC = b"CQSTORE\0"
+STORE_VERSION = 1
+
+# magic, version and offset of the index
+HEADER = "<8sIQ"
+
+
+class ShapeStore(object):
+    """
+    Read only store of named shapes packed into one file.
+
+    Shapes are stored in the binary BREP format one after another, followed by an
+    index of their offsets, sizes, bounding boxes and names. The file is memory
+    mapped and single shapes are deserialized on demand. Bounding box queries only
+    use the index.
+
+    .. code-block:: python
+
+        ShapeStore.write("parts.cqs", {"bolt": bolt, "nut": nut})
+
+        with ShapeStore("parts.cqs") as store:
+            nut = store["nut"]
+            names = store.query(nut.BoundingBox())
+    """
+
+    path: Path
+    names: list[str]
+    offsets: NDArray
+    sizes: NDArray
+    bounds: NDArray  # xmin, ymin, zmin, xmax, ymax, zmax of every shape
+
+    _file: Optional[IO[bytes]]
+    _mmap: Optional[mmap.mmap]
+    _ixs: dict[str, int]
+
+    def __init__(self, path: str | Path):
+
+        self.path = Path(path)
+
+        self._file = open(self.path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, ix_offset = unpack_from(HEADER, self._mmap)
+
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a shape store")
+
+        if ix_offset == 0:
+            self.close()
+            raise ValueError(f"{path} is incomplete")
+
+        if version != STORE_VERSION:
+            self.close()
+            raise ValueError(f"Unsupported shape store version {version}")
+
+        # index: count, offsets, sizes, bounding boxes and names as json
+        (n,) = unpack_from("<Q", self._mmap, ix_offset)
+        pos = ix_offset + 8
+
+        # the index is copied, so that no views of the map outlive it
+        self.offsets = np.frombuffer(self._mmap, "<u8", n, pos).copy()
+        pos += 8 * n
+
+        self.sizes = np.frombuffer(self._mmap, "<u8", n, pos).copy()
+        pos += 8 * n
+
+        self.bounds = np.frombuffer(self._mmap, "<f8", 6 * n, pos).reshape(n, 6).copy()
+        pos += 48 * n
+
+        self.names = json.loads(self._mmap[pos:].decode())
+        self._ixs = {name: i for i, name in enumerate(self.names)}
+
+    @classmethod
+    def write(
+        cls,
+        path: str | Path,
+        shapes: Mapping[str, Shape] | Iterable[tuple[str, Shape]],
+    ) -> None:
+        """
+        Write named shapes to a new store. Shapes are serialized one at a time.
+
+        :param path: Output filename.
+        :param shapes: Mapping or iterable of names and shapes.
+        """
+
+        items = shapes.items() if isinstance(shapes, Mapping) else shapes
+
+        names: list[str] = []
+        seen: set[str] = set()
+        offsets: list[int] = []
+        sizes: list[int] = []
+        bounds: list[tuple[float, ...]] = []
+
+        with open(path, "wb") as f:
+            f.write(pack(HEADER, MAGIC, STORE_VERSION, 0))
+
+            for name, s in items:
+                if name in seen:
+                    raise ValueError(f"Duplicate shape name {name}")
+
+                seen.add(name)
+
+                stream = BytesIO()
+                s.exportBin(stream)
+                data = stream.getvalue()
+
+                bb = s.BoundingBox()
+
+                names.append(name)
+                offsets.append(f.tell())
+                sizes.append(len(data))
+                bounds.append((bb.xmin, bb.ymin, bb.zmin, bb.xmax, bb.ymax, bb.zmax))
+
+                f.write(data)
+
+            ix_offset = f.tell()
+
+            f.write(pack("<Q", len(names)))
+            f.write(np.array(offsets, dtype="<u8").tobytes())
+            f.write(np.array(sizes, dtype="<u8").tobytes())
+            f.write(np.array(bounds, dtype="<f8").reshape(-1, 6).tobytes())
+            f.write(json.dumps(names).encode())
+
+            # finally point the header to the index
+            f.seek(0)
+            f.write(pack(HEADER, MAGIC, STORE_VERSION, ix_offset))
+
+    def __getitem__(self, name: str) -> Shape:
+        """
+        Load a single shape.
+        """
+
+        assert self._mmap is not None, "Store is closed"
+
+        ix = self._ixs[name]
+        offset = int(self.offsets[ix])
+
+        data = self._mmap[offset : offset + int(self.sizes[ix])]
+
+        return Shape.importBin(BytesIO(data))
+
+    def __contains__(self, name: str) -> bool:
+
+        return name in self._ixs
+
+    def __iter__(self) -> Iterator[str]:
+
+        return iter(self.names)
+
+    def __len__(self) -> int:
+
+        return len(self.names)
+
+    def boundingBox(self, name: str) -> BoundBox:
+        """
+        Bounding box of a shape without loading it.
+        """
+
+        xmin, ymin, zmin, xmax, ymax, zmax = self.bounds[self._ixs[name]].tolist()
+
+        return BoundBox(
+            Bnd_Box(Vector(xmin, ymin, zmin).toPnt(), Vector(xmax, ymax, zmax).toPnt())
+        )
+
+    def query(self, bb: BoundBox, tol: float = 0) -> list[str]:
+        """
+        Names of the shapes whose bounding boxes intersect the given box.
+
+        :param bb: Query box.
+        :param tol: Enlarge the query box by this amount.
+        """
+
+        lo = np.array((bb.xmin, bb.ymin, bb.zmin)) - tol
+        hi = np.array((bb.xmax, bb.ymax, bb.zmax)) + tol
+
+        mask = np.all(self.bounds[:, :3] <= hi, axis=1) & np.all(
+            self.bounds[:, 3:] >= lo, axis=1
+        )
+
+        return [self.names[i] for i in np.flatnonzero(mask).tolist()]
+
+    def close(self) -> None:
+        """
+        Release the memory map and the file.
+        """
+
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "ShapeStore":
+
+        return self
+
+    def __exit__(self, *args) -> None:
+
+        self.close()
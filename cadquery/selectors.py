@@ -20,12 +20,439 @@ from pyparsing import (
     infix_notation,
     opAssoc,
 )
-from functools import reduce
-from typing import Iterable, List, Sequence, TypeVar, cast
+from collections import OrderedDict
+from functools import lru_cache, reduce
+from threading import Lock
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple, TypeVar, cast
+
+import numpy as np
+from numpy.typing import NDArray
 
 Shape = TypeVar("Shape", bound=ShapeProtocol)
 
 
+class _Properties(object):
+    """
+    Properties of the filtered objects stored as arrays. Every property is computed
+    at most once and shared by all the selectors of an expression.
+    """
+
+    objects: List[Any]
+    _data: Dict[Any, Any]
+
+    def __init__(self, objectList: Sequence[Shape]):
+
+        self.objects = list(objectList)
+        self._data = {}
+
+    def _get(self, name: Any, fn: Callable[[], Any]) -> Any:
+
+        if name not in self._data:
+            self._data[name] = fn()
+
+        return self._data[name]
+
+    def select(self, ixs: NDArray) -> List[Any]:
+        """
+        Objects at the given indices.
+        """
+
+        return [self.objects[i] for i in ixs.tolist()]
+
+    def shapeTypes(self) -> NDArray:
+
+        return self._get(
+            "shapeTypes",
+            lambda: np.array([o.ShapeType() for o in self.objects], dtype=object),
+        )
+
+    def geomTypes(self) -> NDArray:
+
+        return self._get(
+            "geomTypes",
+            lambda: np.array([o.geomType() for o in self.objects], dtype=object),
+        )
+
+    def centers(self) -> NDArray:
+
+        return self._get(
+            "centers",
+            lambda: np.array(
+                [o.Center().toTuple() for o in self.objects], dtype=float
+            ).reshape(-1, 3),
+        )
+
+    def centersOf(self, ixs: NDArray) -> NDArray:
+        """
+        Centers of the objects at the given indices, only these are computed
+        unless all centers are already known.
+        """
+
+        if "centers" in self._data:
+            return self._data["centers"][ixs]
+
+        return np.array(
+            [self.objects[i].Center().toTuple() for i in ixs.tolist()], dtype=float
+        ).reshape(-1, 3)
+
+    def bounds(self) -> NDArray:
+        """
+        xmin, ymin, zmin, xmax, ymax, zmax of every object.
+        """
+
+        return self._get("bounds", lambda: _bounds(self.objects))
+
+    def tree(self) -> "_BoxTree | None":
+        """
+        Spatial index of the objects shared with other filter calls on the same
+        objects, None if it is not worth building. See :func:`enableIndexCache`.
+        """
+
+        return self._get("tree", lambda: _tree(self.objects))
+
+    def directions(self) -> NDArray:
+        """
+        Normals of planar faces and tangents of linear edges, NaN for other objects.
+        """
+
+        def _directions():
+            rv = np.full((len(self.objects), 3), np.nan)
+
+            for i, (o, t) in enumerate(zip(self.objects, self.shapeTypes())):
+                if t == "Face" and o.geomType() == "PLANE":
+                    rv[i] = cast(FaceProtocol, o).normalAt(None).toTuple()
+                elif t == "Edge" and o.geomType() == "LINE":
+                    rv[i] = cast(Shape1DProtocol, o).tangentAt().toTuple()
+
+            return rv
+
+        return self._get("directions", _directions)
+
+    def keys(
+        self, key: Callable[[Any], float], name: Any = None
+    ) -> Tuple[NDArray, NDArray]:
+        """
+        Keys of all objects and a mask of the objects having one. Only stored if
+        a name is given.
+        """
+
+        def _keys():
+            rv = np.zeros(len(self.objects))
+            valid = np.zeros(len(self.objects), dtype=bool)
+
+            for i, o in enumerate(self.objects):
+                try:
+                    rv[i] = key(o)
+                    valid[i] = True
+                except ValueError:
+                    pass
+
+            return rv, valid
+
+        return self._get(name, _keys) if name else _keys()
+
+
+def _owner(cls: type, name: str) -> type:
+    """
+    Class defining the given attribute.
+    """
+
+    return next(c for c in cls.__mro__ if name in vars(c))
+
+
+def _apply(selector: "Selector", props: _Properties) -> List[Any]:
+    """
+    Filter using precomputed properties. Subclasses overriding filter but not
+    _filter are applied through their filter method.
+    """
+
+    cls = type(selector)
+    if _owner(cls, "filter") is not _owner(cls, "_filter"):
+        return list(selector.filter(props.objects))
+
+    return selector._filter(props)
+
+
+# Vector math on (N, 3) arrays following the operation order of gp_Vec, so that
+# the results match the per object methods of Vector
+
+
+def _cross(d: Vector, vecs: NDArray) -> NDArray:
+
+    x, y, z = d.toTuple()
+    vx, vy, vz = vecs.T
+
+    return np.column_stack((y * vz - z * vy, z * vx - x * vz, x * vy - y * vx))
+
+
+def _length(vecs: NDArray) -> NDArray:
+
+    vx, vy, vz = vecs.T
+
+    return np.sqrt(vx * vx + vy * vy + vz * vz)
+
+
+def _dot(vecs: NDArray, d: Vector) -> NDArray:
+
+    x, y, z = d.toTuple()
+    vx, vy, vz = vecs.T
+
+    return vx * x + vy * y + vz * z
+
+
+def _angle(d: Vector, vecs: NDArray) -> NDArray:
+    """
+    Angles between a vector and an array of vectors, see gp_Dir::Angle.
+    """
+
+    d = d.normalized()
+    vecs = vecs / _length(vecs)[:, None]
+
+    cos = _dot(vecs, d)
+
+    with np.errstate(invalid="ignore"):
+        sin = _length(_cross(d, vecs))
+
+        return np.where(
+            np.abs(cos) < 0.70710678118655,
+            np.arccos(np.clip(cos, -1, 1)),
+            np.where(cos < 0, math.pi - np.arcsin(sin), np.arcsin(sin)),
+        )
+
+
+def _bounds(objects: Sequence[Shape]) -> NDArray:
+    """
+    xmin, ymin, zmin, xmax, ymax, zmax of the given objects.
+    """
+
+    rv = np.empty((len(objects), 6))
+
+    for i, o in enumerate(objects):
+        bb = o.BoundingBox()
+        rv[i] = (bb.xmin, bb.ymin, bb.zmin, bb.xmax, bb.ymax, bb.zmax)
+
+    return rv
+
+
+def _morton(pts: NDArray, bits: int = 10) -> NDArray:
+    """
+    Order of points along a Morton (Z-order) curve.
+    """
+
+    lo = pts.min(axis=0)
+    span = pts.max(axis=0) - lo
+    span[span == 0] = 1
+
+    q = ((pts - lo) / span * (2 ** bits - 1)).astype(np.uint64)
+    code = np.zeros(len(pts), dtype=np.uint64)
+
+    for bit in range(bits):
+        for axis in range(3):
+            code |= ((q[:, axis] >> np.uint64(bit)) & np.uint64(1)) << np.uint64(
+                3 * bit + axis
+            )
+
+    return np.argsort(code, kind="stable")
+
+
+# boxes are enlarged by this amount when pruning, so that rounding errors of the
+# exact checks never exclude an object
+BVH_MARGIN = 1e-6
+
+
+class _BoxTree(object):
+    """
+    Bounding volume hierarchy over the bounding boxes of objects. Boxes are ordered
+    along a Morton curve and every BRANCHING consecutive nodes are enclosed by a
+    node of the next level. Levels are stored as (N, 6) arrays and traversed
+    breadth first.
+    """
+
+    BRANCHING = 16
+
+    bounds: NDArray  # boxes of the objects in the original order
+    order: NDArray  # indices of the objects along the curve
+    levels: List[NDArray]  # boxes of the nodes, leaves first
+
+    def __init__(self, bounds: NDArray):
+
+        self.bounds = bounds
+        self.order = _morton((bounds[:, :3] + bounds[:, 3:]) / 2)
+
+        level = bounds[self.order]
+        self.levels = [level]
+
+        while len(level) > self.BRANCHING:
+            starts = np.arange(0, len(level), self.BRANCHING)
+            level = np.hstack(
+                (
+                    np.minimum.reduceat(level[:, :3], starts),
+                    np.maximum.reduceat(level[:, 3:], starts),
+                )
+            )
+            self.levels.append(level)
+
+    def query(self, test: Callable[[NDArray], NDArray]) -> NDArray:
+        """
+        Indices of the objects whose boxes pass the test, in the original order.
+
+        :param test: Maps an (N, 6) array of boxes of one level to a mask. It has
+            to keep every node containing an object that can pass.
+        """
+
+        ixs = np.arange(len(self.levels[-1]))
+
+        for i in range(len(self.levels) - 1, -1, -1):
+            ixs = ixs[test(self.levels[i][ixs])]
+
+            # children of the remaining nodes
+            if i > 0:
+                b = self.BRANCHING
+                ixs = (ixs[:, None] * b + np.arange(b)).ravel()
+                ixs = ixs[ixs < len(self.levels[i - 1])]
+
+        return np.sort(self.order[ixs])
+
+
+# default number of object lists with a cached spatial index
+BVH_CACHE_SIZE = 8
+
+# smaller object lists are checked without a spatial index
+BVH_MIN_SIZE = 256
+
+# most recently filtered object lists and their spatial index, None for lists
+# filtered once
+_trees: "OrderedDict[Tuple[Any, ...], _BoxTree | None]" = OrderedDict()
+_trees_size = 0
+_trees_lock = Lock()
+
+
+def enableIndexCache(maxSize: int = BVH_CACHE_SIZE) -> None:
+    """
+    Enable the spatial index cache used by NearestToPointSelector,
+    NearestToShapeSelector and BoxSelector. Once a large object list is filtered
+    the second time, e.g. the edges of a given shape, the bounding boxes of its
+    objects are indexed so that further picks skip most of the exact checks.
+
+    Building the index costs more than a single linear scan. The cache holds
+    references to the objects of the most recently filtered lists, call
+    :func:`disableIndexCache` to release them.
+
+    :param maxSize: Maximum number of cached object lists.
+    """
+
+    global _trees_size
+
+    with _trees_lock:
+        _trees_size = maxSize
+
+        while len(_trees) > _trees_size:
+            _trees.popitem(last=False)
+
+
+def disableIndexCache() -> None:
+    """
+    Disable and clear the spatial index cache.
+    """
+
+    global _trees_size
+
+    with _trees_lock:
+        _trees_size = 0
+        _trees.clear()
+
+
+def _tree(objects: Sequence[Shape]) -> "_BoxTree | None":
+    """
+    Cached spatial index of the objects. It is only built when a list is filtered
+    again while the cache is enabled, otherwise None is returned.
+    """
+
+    key = tuple(objects)
+
+    with _trees_lock:
+        if not _trees_size:
+            return None
+
+        seen = key in _trees
+        rv = _trees.pop(key, None)
+        _trees[key] = rv
+
+        while len(_trees) > _trees_size:
+            _trees.popitem(last=False)
+
+    if seen and rv is None:
+        rv = _BoxTree(_bounds(objects))
+
+        with _trees_lock:
+            if key in _trees:
+                _trees[key] = rv
+
+    return rv
+
+
+def _pointDistances(p: NDArray, boxes: NDArray) -> Tuple[NDArray, NDArray]:
+    """
+    Minimal and maximal distances between a point and the points of boxes.
+    """
+
+    lo, hi = boxes[:, :3], boxes[:, 3:]
+
+    dmin = np.maximum(np.maximum(lo - p, p - hi), 0)
+    dmax = np.maximum(np.abs(p - lo), np.abs(p - hi))
+
+    return _length(dmin) - BVH_MARGIN, _length(dmax) + BVH_MARGIN
+
+
+def _boxDistances(box: NDArray, boxes: NDArray) -> Tuple[NDArray, NDArray]:
+    """
+    Minimal and maximal distances between the points of a box and of boxes.
+    """
+
+    lo, hi = boxes[:, :3], boxes[:, 3:]
+
+    dmin = np.maximum(np.maximum(lo - box[3:], box[:3] - hi), 0)
+    dmax = np.maximum(np.abs(hi - box[:3]), np.abs(box[3:] - lo))
+
+    return _length(dmin) - BVH_MARGIN, _length(dmax) + BVH_MARGIN
+
+
+def _nearest(
+    props: "_Properties",
+    distances: Callable[[NDArray], Tuple[NDArray, NDArray]],
+    dist: Callable[[Any], float],
+) -> Any:
+    """
+    First object with the minimal distance. Nodes of the spatial index farther than
+    the closest upper bound are pruned, the remaining objects are checked in the
+    order of their lower bounds until the bound exceeds the best distance. Without
+    a spatial index all objects are checked.
+    """
+
+    tree = props.tree() if len(props.objects) >= BVH_MIN_SIZE else None
+
+    if tree is None:
+        return min(props.objects, key=dist)
+
+    def test(boxes):
+        dmin, dmax = distances(boxes)
+        return dmin <= dmax.min()
+
+    ixs = tree.query(test)
+    dmin, _ = distances(tree.bounds[ixs])
+
+    best, rv = math.inf, -1
+    for l, i in sorted(zip(dmin.tolist(), ixs.tolist())):
+        if l > best:
+            break
+
+        d = dist(props.objects[i])
+        if d < best or (d == best and i < rv):
+            best, rv = d, i
+
+    return props.objects[rv]
+
+
 class Selector(object):
     """
     Filters a list of objects.
@@ -45,6 +472,13 @@ class Selector(object):
         """
         return list(objectList)
 
+    def _filter(self, props: _Properties) -> List[Any]:
+        """
+        Filter using precomputed properties of the objects. The default
+        implementation delegates to filter.
+        """
+        return self.filter(props.objects)
+
     def __and__(self, other):
         return AndSelector(self, other)
 
@@ -80,10 +514,17 @@ class NearestToPointSelector(Selector):
         self.pnt = pnt
 
     def filter(self, objectList: Sequence[Shape]):
+
+        return self._filter(_Properties(objectList))
+
+    def _filter(self, props: _Properties) -> List[Any]:
         def dist(tShape):
             return tShape.Center().sub(Vector(*self.pnt)).Length
 
-        return [min(objectList, key=dist)]
+        p = np.array(Vector(*self.pnt).toTuple())
+
+        # the center of an object is inside of its bounding box
+        return [_nearest(props, lambda boxes: _pointDistances(p, boxes), dist)]
 
 
 class NearestToShapeSelector(Selector):
@@ -99,7 +540,16 @@ class NearestToShapeSelector(Selector):
 
     def filter(self, objectList: Sequence[Shape]):
 
-        return [min(objectList, key=lambda el: self.shape.distance(el))]
+        return self._filter(_Properties(objectList))
+
+    def _filter(self, props: _Properties) -> List[Any]:
+        def dist(el):
+            return self.shape.distance(el)
+
+        bb = self.shape.BoundingBox()
+        box = np.array((bb.xmin, bb.ymin, bb.zmin, bb.xmax, bb.ymax, bb.zmax))
+
+        return [_nearest(props, lambda boxes: _boxDistances(box, boxes), dist)]
 
 
 class BoxSelector(Selector):
@@ -124,31 +574,40 @@ class BoxSelector(Selector):
 
     def filter(self, objectList: Sequence[Shape]):
 
-        result = []
-        x0, y0, z0 = self.p0.toTuple()
-        x1, y1, z1 = self.p1.toTuple()
+        return self._filter(_Properties(objectList))
+
+    def _filter(self, props: _Properties) -> List[Any]:
 
-        def isInsideBox(p):
+        p0 = np.array(self.p0.toTuple())
+        p1 = np.array(self.p1.toTuple())
+
+        def isInsideBox(pts):
             # using XOR for checking if x/y/z is in between regardless
             # of order of x/y/z0 and x/y/z1
-            return (
-                ((p.x < x0) ^ (p.x < x1))
-                and ((p.y < y0) ^ (p.y < y1))
-                and ((p.z < z0) ^ (p.z < z1))
+            return np.all((pts < p0) ^ (pts < p1), axis=1)
+
+        tree = props.tree() if len(props.objects) >= BVH_MIN_SIZE else None
+
+        if tree is None:
+            ixs = np.arange(len(props.objects))
+            bounds = props.bounds() if self.test_boundingbox else None
+        else:
+            # only objects with bounding boxes touching the box can pass
+            lo = np.minimum(p0, p1) - BVH_MARGIN
+            hi = np.maximum(p0, p1) + BVH_MARGIN
+
+            ixs = tree.query(
+                lambda b: np.all(b[:, :3] <= hi, axis=1)
+                & np.all(b[:, 3:] >= lo, axis=1)
             )
+            bounds = tree.bounds
 
-        for o in objectList:
-            if self.test_boundingbox:
-                bb = o.BoundingBox()
-                if isInsideBox(Vector(bb.xmin, bb.ymin, bb.zmin)) and isInsideBox(
-                    Vector(bb.xmax, bb.ymax, bb.zmax)
-                ):
-                    result.append(o)
-            else:
-                if isInsideBox(o.Center()):
-                    result.append(o)
+        if self.test_boundingbox:
+            mask = isInsideBox(bounds[ixs, :3]) & isInsideBox(bounds[ixs, 3:])
+        else:
+            mask = isInsideBox(props.centersOf(ixs))
 
-        return result
+        return props.select(ixs[mask])
 
 
 class BaseDirSelector(Selector):
@@ -164,29 +623,40 @@ class BaseDirSelector(Selector):
         "Test a specified vector. Subclasses override to provide other implementations"
         return True
 
+    def testArray(self, vecs: NDArray) -> NDArray:
+        """
+        Test an (N, 3) array of vectors. Subclasses overriding test should also
+        override this method, the default implementation calls test per vector.
+        """
+        return np.array([self.test(Vector(*v)) for v in vecs.tolist()], dtype=bool)
+
     def filter(self, objectList: Sequence[Shape]) -> List[Shape]:
         """
         There are lots of kinds of filters, but for planes they are always
         based on the normal of the plane, and for edges on the tangent vector
         along the edge
         """
-        r = []
-        for o in objectList:
-            # no really good way to avoid a switch here, edges and faces are simply different!
-            if o.ShapeType() == "Face" and o.geomType() == "PLANE":
-                # a face is only parallel to a direction if it is a plane, and
-                # its normal is parallel to the dir
-                test_vector = cast(FaceProtocol, o).normalAt(None)
-            elif o.ShapeType() == "Edge" and o.geomType() == "LINE":
-                # an edge is parallel to a direction if its underlying geometry is plane or line
-                test_vector = cast(Shape1DProtocol, o).tangentAt()
-            else:
-                continue
+        return self._filter(_Properties(objectList))
+
+    def _mask(self, props: _Properties) -> NDArray:
 
-            if self.test(test_vector):
-                r.append(o)
+        # a face is only parallel to a direction if it is a plane, and its normal
+        # is parallel to the dir, an edge if its underlying geometry is a line
+        vecs = props.directions()
+        rv = ~np.isnan(vecs[:, 0])
 
-        return r
+        # fall back to the per vector test for subclasses not providing testArray
+        cls = type(self)
+        if _owner(cls, "test") is not _owner(cls, "testArray"):
+            rv[rv] = BaseDirSelector.testArray(self, vecs[rv])
+        else:
+            rv[rv] = self.testArray(vecs[rv])
+
+        return rv
+
+    def _filter(self, props: _Properties) -> List[Any]:
+
+        return props.select(np.flatnonzero(self._mask(props)))
 
 
 class ParallelDirSelector(BaseDirSelector):
@@ -211,6 +681,9 @@ class ParallelDirSelector(BaseDirSelector):
     def test(self, vec: Vector) -> bool:
         return self.direction.cross(vec).Length < self.tolerance
 
+    def testArray(self, vecs: NDArray) -> NDArray:
+        return _length(_cross(self.direction, vecs)) < self.tolerance
+
 
 class DirectionSelector(BaseDirSelector):
     """
@@ -234,6 +707,9 @@ class DirectionSelector(BaseDirSelector):
     def test(self, vec: Vector) -> bool:
         return self.direction.getAngle(vec) < self.tolerance
 
+    def testArray(self, vecs: NDArray) -> NDArray:
+        return _angle(self.direction, vecs) < self.tolerance
+
 
 class PerpendicularDirSelector(BaseDirSelector):
     """
@@ -258,6 +734,9 @@ class PerpendicularDirSelector(BaseDirSelector):
     def test(self, vec: Vector) -> bool:
         return abs(self.direction.getAngle(vec) - math.pi / 2) < self.tolerance
 
+    def testArray(self, vecs: NDArray) -> NDArray:
+        return np.abs(_angle(self.direction, vecs) - math.pi / 2) < self.tolerance
+
 
 class TypeSelector(Selector):
     """
@@ -281,11 +760,12 @@ class TypeSelector(Selector):
         self.typeString = typeString.upper()
 
     def filter(self, objectList: Sequence[Shape]) -> List[Shape]:
-        r = []
-        for o in objectList:
-            if o.geomType() == self.typeString:
-                r.append(o)
-        return r
+
+        return self._filter(_Properties(objectList))
+
+    def _filter(self, props: _Properties) -> List[Any]:
+
+        return props.select(np.flatnonzero(props.geomTypes() == self.typeString))
 
 
 class _NthSelector(Selector, ABC):
@@ -304,11 +784,28 @@ class _NthSelector(Selector, ABC):
         clustered if within self.tolerance.
         """
 
-        if len(objectlist) == 0:
+        return self._filter(_Properties(objectlist))
+
+    def _filter(self, props: _Properties) -> List[Any]:
+
+        return self._nth(props, np.arange(len(props.objects)))
+
+    def _nth(self, props: _Properties, ixs: NDArray) -> List[Any]:
+        """
+        Nth cluster of the objects at the given indices.
+        """
+
+        if len(ixs) == 0:
             # nothing to filter
             raise ValueError("Can not return the Nth element of an empty list")
 
-        clustered = self.cluster(objectlist)
+        # subclasses overriding only cluster are still supported
+        cls = type(self)
+        if _owner(cls, "cluster") is not _owner(cls, "_cluster"):
+            clustered = list(self.cluster(props.select(ixs)))
+        else:
+            clustered = [props.select(c) for c in self._cluster(props, ixs)]
+
         if not self.directionMax:
             clustered.reverse()
         try:
@@ -329,31 +826,50 @@ class _NthSelector(Selector, ABC):
         """
         raise NotImplementedError
 
+    def keys(self, props: _Properties) -> Tuple[NDArray, NDArray]:
+        """
+        Keys of all objects and a mask of the objects having one. Keys of the
+        built-in selectors only depend on the objects and are shared, subclasses
+        can override this method to compute their keys as arrays.
+        """
+        key = type(self).key
+
+        # Need to handle value errors, such as what occurs when you try to
+        # access the radius of a straight line
+        return props.keys(self.key, key if key in _SHARED_KEYS else None)
+
     def cluster(self, objectlist: Sequence[Shape]) -> List[List[Shape]]:
         """
         Clusters the elements of objectlist if they are within tolerance.
         """
-        key_and_obj = []
-        for obj in objectlist:
-            # Need to handle value errors, such as what occurs when you try to
-            # access the radius of a straight line
-            try:
-                key = self.key(obj)
-            except ValueError:
-                # forget about this element and continue
-                continue
-            key_and_obj.append((key, obj))
-
-        key_and_obj.sort(key=lambda x: x[0])
-        clustered = [[]]  # type: List[List[Shape]]
-        start = key_and_obj[0][0]
-        for key, obj in key_and_obj:
-            if abs(key - start) <= self.tolerance:
-                clustered[-1].append(obj)
-            else:
-                clustered.append([obj])
+        props = _Properties(objectlist)
+
+        return [
+            props.select(c)
+            for c in self._cluster(props, np.arange(len(props.objects)))
+        ]
+
+    def _cluster(self, props: _Properties, ixs: NDArray) -> List[NDArray]:
+        """
+        Clusters the objects at the given indices, returns arrays of indices.
+        """
+        keys, valid = self.keys(props)
+
+        # forget about the elements without a key
+        ixs = ixs[valid[ixs]]
+
+        # stable sort, so that equal keys keep the original order
+        ixs = ixs[np.argsort(keys[ixs], kind="stable")]
+        sorted_keys = keys[ixs].tolist()
+
+        start = sorted_keys[0]
+        bounds = [0]
+        for i, key in enumerate(sorted_keys):
+            if not abs(key - start) <= self.tolerance:
+                bounds.append(i)
                 start = key
-        return clustered
+
+        return np.split(ixs, bounds[1:])
 
 
 class RadiusNthSelector(_NthSelector):
@@ -395,6 +911,14 @@ class CenterNthSelector(_NthSelector):
     def key(self, obj: Shape) -> float:
         return obj.Center().dot(self.direction)
 
+    def keys(self, props: _Properties) -> Tuple[NDArray, NDArray]:
+        if _owner(type(self), "key") is not CenterNthSelector:
+            return super().keys(props)
+
+        centers = props.centers()
+
+        return _dot(centers, self.direction), np.ones(len(centers), dtype=bool)
+
 
 class DirectionMinMaxSelector(CenterNthSelector):
     """
@@ -447,9 +971,10 @@ class DirectionNthSelector(ParallelDirSelector, CenterNthSelector):
         _NthSelector.__init__(self, n, directionMax, tolerance)
 
     def filter(self, objectlist: Sequence[Shape]) -> List[Shape]:
-        objectlist = ParallelDirSelector.filter(self, objectlist)
-        objectlist = _NthSelector.filter(self, objectlist)
-        return objectlist
+        return self._filter(_Properties(objectlist))
+
+    def _filter(self, props: _Properties) -> List[Any]:
+        return self._nth(props, np.flatnonzero(self._mask(props)))
 
 
 class LengthNthSelector(_NthSelector):
@@ -537,6 +1062,10 @@ class AreaNthSelector(_NthSelector):
             )
 
 
+# key methods depending only on the object, their results can be shared
+_SHARED_KEYS = (RadiusNthSelector.key, LengthNthSelector.key, AreaNthSelector.key)
+
+
 class BinarySelector(Selector):
     """
     Base class for selectors that operates with two other
@@ -548,9 +1077,10 @@ class BinarySelector(Selector):
         self.right = right
 
     def filter(self, objectList: Sequence[Shape]):
-        return self.filterResults(
-            self.left.filter(objectList), self.right.filter(objectList)
-        )
+        return self._filter(_Properties(objectList))
+
+    def _filter(self, props: _Properties) -> List[Any]:
+        return self.filterResults(_apply(self.left, props), _apply(self.right, props))
 
     def filterResults(self, r_left, r_right):
         raise NotImplementedError
@@ -596,8 +1126,11 @@ class InverseSelector(Selector):
         self.selector = selector
 
     def filter(self, objectList: Sequence[Shape]):
+        return self._filter(_Properties(objectList))
+
+    def _filter(self, props: _Properties) -> List[Any]:
         # note that Selector() selects everything
-        return SubtractSelector(Selector(), self.selector).filter(objectList)
+        return SubtractSelector(Selector(), self.selector)._filter(props)
 
 
 def _makeGrammar():
@@ -766,6 +1299,9 @@ class _SimpleStringSyntaxSelector(Selector):
         """
         return self.mySelector.filter(objectList)
 
+    def _filter(self, props: _Properties) -> List[Any]:
+        return _apply(self.mySelector, props)
+
 
 def _makeExpressionGrammar(atom):
     """
@@ -821,6 +1357,19 @@ def _makeExpressionGrammar(atom):
 
 _expression_grammar = _makeExpressionGrammar(_grammar)
 
+# number of parsed selector strings kept in memory
+SELECTOR_CACHE_SIZE = 1024
+
+
+@lru_cache(maxsize=SELECTOR_CACHE_SIZE)
+def _compile(selectorString: str) -> Selector:
+    """
+    Parse a selector string into a tree of selector objects. The trees are
+    stateless and shared by all selectors using the same string.
+    """
+
+    return _expression_grammar.parse_string(selectorString, parse_all=True).asList()[0]
+
 
 class StringSyntaxSelector(Selector):
     r"""
@@ -878,14 +1427,30 @@ class StringSyntaxSelector(Selector):
         Feed the input string through the parser and construct an relevant complex selector object
         """
         self.selectorString = selectorString
-        parse_result = _expression_grammar.parse_string(selectorString, parse_all=True)
-        self.mySelector = parse_result.asList()[0]
+        self.mySelector = _compile(selectorString)
 
     def filter(self, objectList: Sequence[Shape]):
         """
         Filter give object list through th already constructed complex selector object
         """
-        return self.mySelector.filter(objectList)
+        return self._filter(_Properties(objectList))
+
+    def _filter(self, props: _Properties) -> List[Any]:
+        # properties of the objects are computed once for the whole expression
+        return _apply(self.mySelector, props)
+
+
+def precompile(*selectorStrings: str) -> List[StringSyntaxSelector]:
+    """
+    Parse selector strings ahead of time, e.g. before a modeling loop. Parsed
+    strings are kept in a bounded cache, so that later uses of the same strings
+    skip the parser.
+
+    :param selectorStrings: selector strings to parse
+    :return: selectors for the given strings
+    """
+
+    return [StringSyntaxSelector(s) for s in selectorStrings]
 
 
 # %% aliases
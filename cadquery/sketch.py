@@ -227,12 +227,14 @@ class Sketch(object):
         angle: Real = 0,
         mode: Modes = "a",
         tag: Optional[str] = None,
+        fast: bool = False,
     ) -> T:
         """
-        Import a DXF file and construct face(s)
+        Import a DXF file and construct face(s). See
+        :func:`~cadquery.occ_impl.importers.importDXF` for the meaning of fast.
         """
 
-        res = Compound.makeCompound(_importDXF(filename, tol, exclude, include))
+        res = Compound.makeCompound(_importDXF(filename, tol, exclude, include, fast))
 
         return self.face(res, angle, mode, tag)
 
@@ -184,6 +184,7 @@ def _to_vtk_shapes(
     linewidth: float = 2,
     alpha: float = 1,
     tolerance: float = 1e-3,
+    lods: int = 0,
 ) -> List[vtkProp3D]:
     """
     Convert Shapes to vtkAssembly.
@@ -195,6 +196,7 @@ def _to_vtk_shapes(
         edges=edges,
         linewidth=linewidth,
         tolerance=tolerance,
+        lods=lods,
     )
 
 
@@ -325,10 +327,12 @@ def style(
     edgecolor: str = "black",
     meshcolor: str = "lightgrey",
     vertexcolor: str = "cyan",
+    lods: int = 0,
     **kwargs,
 ) -> List[vtkProp3D]:
     """
     Apply styling to CQ objects. To be used in conjunction with show.
+    Use lods > 0 to add coarse levels of detail for fluid interaction with large assemblies.
     """
 
     # styling functions
@@ -367,6 +371,7 @@ def style(
             linewidth=linewidth,
             alpha=alpha,
             tolerance=tolerance,
+            lods=lods,
         )
 
         # apply style to every actor
@@ -421,9 +426,11 @@ def show(
     ypos: Union[int, float] = 0,
     fxaa: bool = False,
     orthographic: bool = False,
+    lods: int = 0,
 ):
     """
     Show CQ objects using VTK. This functions optionally allows to make screenshots.
+    Coarse levels of detail, rendered while interacting, are enabled with lods > 0.
     """
 
     # split objects
@@ -439,7 +446,7 @@ def show(
     # assy+renderer
     renderer = vtkRenderer()
 
-    for act in toVTKAssy(assy, tolerance=tolerance):
+    for act in toVTKAssy(assy, tolerance=tolerance, lods=lods):
         renderer.AddActor(act)
 
     # VTK window boilerplate
@@ -1,5 +1,6 @@
 import pytest
 import os
+import io
 from itertools import product
 from math import degrees
 import copy
@@ -7,18 +8,27 @@ from pathlib import Path
 from pathlib import PurePath
 from contextlib import chdir
 import re
+import json
+import struct
 from pytest import approx, raises
 
+import numpy as np
+
 import cadquery as cq
 
 from cadquery import Location
+from cadquery.utils import BiDict
 from cadquery.occ_impl.exporters.assembly import (
     exportAssembly,
     exportStepMeta,
     exportCAF,
     exportVTKJS,
     exportVRML,
+    exportSTL,
+    export3MF,
+    exportGLTF,
 )
+from cadquery.occ_impl.exporters.stl import StlWriter, STL_DTYPE
 from cadquery.occ_impl.assembly import toJSON, toCAF, toFusedCAF
 from cadquery.occ_impl.shapes import Face, box, cone, plane, Compound, segment
 
@@ -39,6 +49,7 @@ from OCP.IFSelect import IFSelect_RetDone
 from OCP.TDF import TDF_ChildIterator
 from OCP.Quantity import Quantity_ColorRGBA, Quantity_TOC_sRGB, Quantity_NameOfColor
 from OCP.TopAbs import TopAbs_ShapeEnum
+from OCP.Message import Message_ProgressRange, Message_ProgressIndicator
 
 
 @pytest.fixture(scope="function")
@@ -724,6 +735,56 @@ def test_step_export(nested_assy, tmpdir):
     assert pytest.approx(c2.toTuple()) == (0, 4, 0)
 
 
+def test_step_export_progress(nested_assy, tmp_path):
+
+    path = tmp_path / "nested.step"
+
+    assert exportAssembly(nested_assy, str(path), progress=Message_ProgressRange())
+    assert cq.importers.importStep(str(path)).solids().size() == 4
+
+
+class ProgressIndicator(Message_ProgressIndicator):
+    """
+    Progress indicator recording the reported positions.
+    """
+
+    def __init__(self, cancel=False):
+        super().__init__()
+
+        self.cancel = cancel
+        self.positions = []
+
+    def Show(self, scope, force):
+        self.positions.append(self.GetPosition())
+
+    def UserBreak(self):
+        return self.cancel
+
+
+def test_step_export_progress_indicator(nested_assy, tmp_path):
+
+    path = tmp_path / "nested.step"
+
+    indicator = ProgressIndicator()
+
+    assert exportAssembly(nested_assy, str(path), progress=indicator.Start())
+    assert path.exists()
+
+    assert indicator.positions
+    assert indicator.positions == sorted(indicator.positions)
+    assert 0 <= indicator.positions[-1] <= 1
+
+
+def test_step_export_progress_cancel(nested_assy, tmp_path):
+
+    path = tmp_path / "nested.step"
+
+    indicator = ProgressIndicator(cancel=True)
+
+    assert not exportAssembly(nested_assy, str(path), progress=indicator.Start())
+    assert not path.exists()
+
+
 def test_meta_step_export(tmpdir):
     """
     Tests that an assembly can be exported to a STEP file with faces tagged with names and colors,
@@ -1301,6 +1362,69 @@ def test_nested_subassembly_step_import(tmpdir):
     )
 
 
+@pytest.mark.parametrize("kind", ["step", "xbf"])
+def test_assembly_import_lazy(subshape_assy, kind, tmp_path):
+
+    path = str(tmp_path / f"lazy.{kind}")
+    subshape_assy.export(path)
+
+    ref = cq.Assembly.load(path)
+    assy = cq.Assembly.load(path, lazy=True)
+
+    # tree, locations and colors are available before the shapes are loaded
+    assert set(assy.objects) == set(ref.objects)
+
+    for name, node in assy.objects.items():
+        ref_node = ref.objects[name]
+
+        assert node.loc.toTuple() == approx(ref_node.loc.toTuple())
+        assert node.color == ref_node.color
+
+    cyl = assy.objects["cyl_1"]
+    assert "_loader" in cyl.__dict__
+
+    # a copy stays lazy
+    top = cq.Assembly().add(assy, name="top")
+    assert "_loader" in top.objects["cyl_1"].__dict__
+
+    # shapes and subshape metadata are loaded on first access
+    assert cyl.obj.Volume() == approx(ref.objects["cyl_1"].obj.Volume())
+    assert "_loader" not in cyl.__dict__
+    assert "cylinder_bottom_face" in assy.objects["cyl_1"]
+
+    cube = assy.objects["cube_1"]
+    assert list(cube._subshape_colors.values()) == list(
+        ref.objects["cube_1"]._subshape_colors.values()
+    )
+
+    # lazy nodes are loaded when exported
+    assert len(list(top)) == len(list(ref))
+    top.export(str(tmp_path / "lazy.step"))
+
+
+def test_assembly_import_lazy_assign(subshape_assy, tmp_path):
+
+    path = str(tmp_path / "lazy.xbf")
+    subshape_assy.export(path)
+
+    assy = cq.Assembly.load(path, lazy=True)
+
+    # assigned values are not overridden by the loader
+    cyl = assy.objects["cyl_1"]
+    box = cq.Workplane().box(1, 1, 1)
+    cyl.obj = box
+
+    assert "_loader" not in cyl.__dict__
+    assert cyl.obj is box
+    assert "cylinder_bottom_face" in cyl
+
+    cube = assy.objects["cube_1"]
+    cube._subshape_colors = BiDict()
+
+    assert cube.obj is not None
+    assert len(cube._subshape_colors) == 0
+
+
 @pytest.mark.parametrize("kind", ["step", "xml", "xbf"])
 @pytest.mark.parametrize(
     "assy_orig", ["subshape_assy", "boxes0_assy", "nested_assy", "simple_assy"],
@@ -1516,6 +1640,155 @@ def test_save_stl_formats(nested_assy_sphere, tmpdir):
         assert os.path.getsize("nested_ascii.stl") > 3960 * 1024
 
 
+def test_export_stl_streaming(nested_assy_sphere, tmpdir):
+
+    path = os.path.join(tmpdir, "streamed.stl")
+    path_ref = os.path.join(tmpdir, "reference.stl")
+
+    exportSTL(nested_assy_sphere, path, 1e-3)
+    nested_assy_sphere.toCompound().exportStl(path_ref, 1e-3)
+
+    def _read(p):
+        with open(p, "rb") as f:
+            data = f.read()
+
+        n = int.from_bytes(data[80:84], "little")
+        rv = np.frombuffer(data[84:], STL_DTYPE)
+        assert len(rv) == n
+
+        return rv
+
+    tris = _read(path)
+    tris_ref = _read(path_ref)
+
+    # same triangles, possibly in a different order
+    assert len(tris) == len(tris_ref)
+
+    key = lambda t: np.sort(np.round(t["vertices"].reshape(-1, 9), 5), axis=0)
+    assert key(tris) == approx(key(tris_ref))
+
+    # unit normals, except for degenerate triangles
+    lengths = np.linalg.norm(tris["normal"], axis=1)
+    assert lengths[lengths > 0] == approx(1, abs=1e-5)
+
+    # ascii output
+    path_ascii = os.path.join(tmpdir, "streamed_ascii.stl")
+    exportSTL(nested_assy_sphere, path_ascii, 1e-3, ascii=True)
+
+    with open(path_ascii) as f:
+        lines = f.readlines()
+
+    assert lines[0].startswith("solid")
+    assert lines[-1].startswith("endsolid")
+    assert sum(1 for l in lines if l.startswith(" facet")) == len(tris)
+
+
+def test_stl_writer_chunks():
+
+    vertices = np.array([(0, 0, 0), (1, 0, 0), (0, 1, 0)], dtype=float)
+    triangles = np.zeros((10, 3), dtype=np.int32)
+    triangles[:] = (0, 1, 2)
+
+    f = io.BytesIO()
+    with StlWriter(f, chunkSize=3) as w:
+        w.add(vertices, triangles)
+        w.add(vertices, triangles, Location((0, 0, 1)))
+
+    data = np.frombuffer(f.getvalue()[84:], STL_DTYPE)
+
+    assert int.from_bytes(f.getvalue()[80:84], "little") == 20
+    assert len(data) == 20
+    assert data["normal"] == approx(np.tile((0, 0, 1), (20, 1)))
+    assert data["vertices"][:10, :, 2] == approx(0)
+    assert data["vertices"][10:, :, 2] == approx(1)
+
+
+def test_export_3mf(tmpdir):
+
+    from zipfile import ZipFile
+    from xml.etree import ElementTree as ET
+    from cadquery.occ_impl.exporters.threemf import SCHEMAS
+
+    box = cq.Workplane().box(1, 1, 1).val()
+
+    assy = cq.Assembly()
+    assy.add(box, name="b0")
+    assy.add(box, name="b1", loc=cq.Location((2, 0, 0), (0, 0, 1), 90))
+    assy.add(cq.Workplane().sphere(1).val(), name="s")
+
+    path = os.path.join(tmpdir, "assy.3mf")
+    assy.export(path)
+
+    with ZipFile(path) as zf:
+        model = ET.fromstring(zf.read("3D/3dmodel.model"))
+
+    ns = {"m": SCHEMAS.CORE}
+
+    # box and sphere meshes plus the top level component
+    objects = model.findall(".//m:object", ns)
+    assert len(objects) == 3
+    assert len(objects[0].findall(".//m:vertex", ns)) == len(box.tessellate(0.1)[0])
+
+    # box is referenced twice
+    components = model.findall(".//m:component", ns)
+    assert [c.get("objectid") for c in components] == ["0", "0", "1"]
+
+    T = [float(v) for v in components[1].get("transform").split()]
+    assert T == approx([0, 1, 0, -1, 0, 0, 0, 0, 1, 2, 0, 0])
+
+    assert export3MF(assy, path, unit="meter")
+
+    with ZipFile(path) as zf:
+        model = ET.fromstring(zf.read("3D/3dmodel.model"))
+
+    assert model.get("unit") == "meter"
+
+
+def test_export_workplane_instances(tmpdir):
+
+    from zipfile import ZipFile
+    from xml.etree import ElementTree as ET
+    from cadquery.occ_impl.exporters.assembly import _instances
+    from cadquery.occ_impl.exporters.threemf import SCHEMAS
+
+    wp = cq.Workplane().box(1, 1, 1)
+
+    assy = cq.Assembly()
+    for i in range(3):
+        assy.add(wp, name=f"b{i}", loc=cq.Location((2 * i, 0, 0)))
+    assy.add(cq.Workplane().sphere(1), name="s")
+
+    # the box is meshed once even though every node yields a new compound
+    instances = _instances(assy)
+    assert [len(locs) for _, locs in instances.values()] == [3, 1]
+
+    path = os.path.join(tmpdir, "wp.3mf")
+    export3MF(assy, path)
+
+    with ZipFile(path) as zf:
+        model = ET.fromstring(zf.read("3D/3dmodel.model"))
+
+    ns = {"m": SCHEMAS.CORE}
+
+    # box and sphere meshes plus the top level component
+    assert len(model.findall(".//m:object", ns)) == 3
+
+    components = model.findall(".//m:component", ns)
+    assert [c.get("objectid") for c in components] == ["0", "0", "0", "1"]
+
+    # stl contains every instance
+    path = os.path.join(tmpdir, "wp.stl")
+    exportSTL(assy, path, 1e-3)
+
+    with open(path, "rb") as f:
+        n = int.from_bytes(f.read()[80:84], "little")
+
+    n_box = len(wp.val().tessellateArrays(1e-3).triangles)
+    n_sphere = len(assy.children[-1].obj.val().tessellateArrays(1e-3).triangles)
+
+    assert n == 3 * n_box + n_sphere
+
+
 def test_save_gltf(nested_assy_sphere, tmpdir):
 
     with chdir(tmpdir):
@@ -1531,7 +1804,15 @@ def test_save_gltf(nested_assy_sphere, tmpdir):
         # ASCII export
         nested_assy_sphere.save("nested_ascii.gltf")
         assert os.path.exists("nested_ascii.gltf")
-        assert os.path.getsize("nested_ascii.gltf") > 5 * 1024
+        assert os.path.getsize("nested_ascii.gltf") > 0
+
+        # geometry is stored in the external buffer
+        with open("nested_ascii.gltf") as f:
+            buffers = json.load(f)["buffers"]
+
+        assert buffers[0]["uri"] == "nested_ascii.bin"
+        assert buffers[0]["byteLength"] == os.path.getsize("nested_ascii.bin")
+        assert os.path.getsize("nested_ascii.bin") > 5 * 1024
 
 
 def test_exportGLTF(nested_assy_sphere, tmpdir):
@@ -1560,6 +1841,139 @@ def test_exportGLTF(nested_assy_sphere, tmpdir):
             lines = file.readlines()
             assert lines[0].startswith('{"accessors"')
 
+        # write errors are raised
+        assert cq.exporters.assembly.exportGLTF(nested_assy_sphere, "ok.glb")
+
+        with pytest.raises(OSError):
+            cq.exporters.assembly.exportGLTF(nested_assy_sphere, "missing/dir.glb")
+
+
+def test_exportGLTF_instances(tmp_path):
+
+    part = cq.Workplane().box(1, 1, 1).val()
+    pin = cq.Workplane().cylinder(2, 0.2).val()
+
+    assy = cq.Assembly(name="top")
+    red = cq.Color("red")
+
+    for i in range(10):
+        assy.add(part, loc=Location(2 * i, 0, 0), name=f"part{i}", color=red)
+        assy.add(pin, loc=Location(2 * i, 2, 0), name=f"pin{i}")
+
+    assy.add(part.moved(z=5), name="moved", color=red)
+    assy.add(part, name="blue", color=cq.Color("blue"))
+
+    loc = assy.loc
+
+    path = tmp_path / "instances.glb"
+    exportGLTF(assy, str(path))
+
+    # assembly is not modified
+    assert assy.loc is loc
+
+    with open(path, "rb") as f:
+        magic, version, length = struct.unpack("<III", f.read(12))
+        json_length, _ = struct.unpack("<II", f.read(8))
+        gltf = json.loads(f.read(json_length))
+
+    assert magic == 0x46546C67
+    assert version == 2
+    assert length == path.stat().st_size
+
+    # every unique shape is stored once, one mesh per color
+    assert len(gltf["meshes"]) == 3
+    assert len(gltf["materials"]) == 2
+    positions = {m["primitives"][0]["attributes"]["POSITION"] for m in gltf["meshes"]}
+    assert len(positions) == 2
+
+    names = [n.get("name") for n in gltf["nodes"]]
+    assert "part9" in names
+    assert "pin9" in names
+
+    # Y up root node
+    assert gltf["nodes"][0]["rotation"] == approx([-(0.5 ** 0.5), 0, 0, 0.5 ** 0.5])
+
+    # located copies reuse the mesh and are translated by their node
+    moved = gltf["nodes"][names.index("moved")]
+    part0 = gltf["nodes"][names.index("part0")]
+
+    assert moved["mesh"] == part0["mesh"]
+    assert moved["matrix"][12:15] == approx([0, 0, 5])
+
+
+def test_exportGLTF_subshape_colors(tmp_path):
+
+    b = cq.Workplane().box(1, 1, 1)
+
+    assy = cq.Assembly(b, name="box", color=cq.Color("red"))
+    assy.addSubshape(b.faces(">Z").val(), color=cq.Color("green"))
+
+    path = tmp_path / "subshapes.gltf"
+    exportGLTF(assy, str(path))
+
+    with open(path) as f:
+        gltf = json.load(f)
+
+    size = (tmp_path / "subshapes.bin").stat().st_size
+    assert size == gltf["buffers"][0]["byteLength"]
+
+    (mesh,) = gltf["meshes"]
+    counts = sorted(
+        gltf["accessors"][p["indices"]]["count"] for p in mesh["primitives"]
+    )
+
+    # two triangles on the top face, ten on the others
+    assert counts == [6, 30]
+
+
+def test_exportGLTF_lods(tmp_path):
+
+    s = cq.Workplane().sphere(1).val()
+
+    assy = cq.Assembly(name="top")
+    assy.add(s, name="s0", color=cq.Color("red"))
+    assy.add(s, loc=Location(3, 0, 0), name="s1", color=cq.Color("red"))
+
+    path = tmp_path / "lods.gltf"
+    assy.export(str(path), tolerance=1e-3, lods=2)
+
+    with open(path) as f:
+        gltf = json.load(f)
+
+    assert gltf["extensionsUsed"] == ["MSFT_lod"]
+
+    nodes = gltf["nodes"]
+    names = [n.get("name") for n in nodes]
+    s0, s1 = nodes[names.index("s0")], nodes[names.index("s1")]
+
+    ids = s0["extensions"]["MSFT_lod"]["ids"]
+    assert len(ids) == 2
+
+    # instances share the meshes of all levels
+    lod_meshes = [nodes[i]["mesh"] for i in ids]
+    assert lod_meshes == [
+        nodes[i]["mesh"] for i in s1["extensions"]["MSFT_lod"]["ids"]
+    ]
+
+    # coarse levels have the transform of their node and fewer triangles
+    assert nodes[s1["extensions"]["MSFT_lod"]["ids"][0]]["matrix"] == s1["matrix"]
+
+    counts = [
+        gltf["accessors"][gltf["meshes"][m]["primitives"][0]["indices"]]["count"]
+        for m in [s0["mesh"]] + lod_meshes
+    ]
+    assert counts == sorted(counts, reverse=True)
+    assert counts[0] > counts[-1]
+
+    attributes = gltf["meshes"][lod_meshes[0]]["primitives"][0]["attributes"]
+    assert "NORMAL" not in attributes
+
+    # no extension without levels of detail
+    exportGLTF(assy, str(path))
+
+    with open(path) as f:
+        assert "extensionsUsed" not in json.load(f)
+
 
 def test_save_gltf_boxes2(boxes2_assy, tmpdir, capfd):
     """
@@ -9,6 +9,7 @@ import sys
 import math
 import pytest
 import ezdxf
+import numpy as np
 
 from uuid import uuid1
 
@@ -35,6 +36,7 @@ from cadquery.occ_impl.exporters.dxf import DxfDocument
 from tests import BaseTest
 from OCP.GeomConvert import GeomConvert
 from OCP.BRepBuilderAPI import BRepBuilderAPI_MakeEdge
+from OCP.BRepTools import BRepTools
 
 
 @pytest.fixture(scope="module")
@@ -602,9 +604,128 @@ class TestExporters(BaseTest):
             },
         )
 
+    def testSVGViews(self):
+
+        dirs = [(0, 0, 1), (1, 0, 0), (0, 1, 0), (1, 1, 1)]
+        opts = {"showAxes": False}
+
+        for processes in (1, 2):
+            res = exporters.getSVGViews(
+                self._box().val(), dirs, opts, processes=processes
+            )
+
+            assert len(res) == len(dirs)
+
+            for d, (r, svg) in zip(dirs, res):
+                assert r.plane.zDir == Vector(d).normalized()
+                assert svg == exporters.getSVG(
+                    self._box().val(), {**opts, "projectionDir": d}
+                )
+
+        # draft mode
+        res = exporters.getSVGViews(
+            self._box().val(), dirs, {"poly": True}, processes=1
+        )
+
+        assert all("<path" in svg for _, svg in res)
+
+    def testSVGPaths(self):
+
+        from io import StringIO
+        from cadquery.occ_impl.exporters.svg import makeSVGpaths
+
+        # connected edges are merged into single paths
+        r = Workplane().rect(1, 2).val()
+        paths = makeSVGpaths(r.Edges())
+
+        assert len(paths) == 1
+        assert paths[0].count("M") == 1
+        assert paths[0].count("L") == 4
+
+        opts = {"projectionDir": (0, 0, 1), "showAxes": False, "showHidden": False}
+        svg = exporters.getSVG(self._box().val(), opts)
+
+        assert svg.count("<path") == 1
+
+        # streaming output
+        f = StringIO()
+        exporters.writeSVG(self._box().val(), f, opts)
+
+        assert f.getvalue() == svg
+
+        f = StringIO()
+        exporters.exportSVG(self._box(), f, opts)
+
+        assert f.getvalue() == svg
+
     def testAMF(self):
         self._exportBox(exporters.ExportTypes.AMF, ["<amf units", "</object>"])
 
+        from zipfile import ZipFile
+        import xml.etree.ElementTree as ET
+        from cadquery.occ_impl.exporters.amf import AmfWriter
+
+        # one object per solid
+        b = Workplane().box(1, 1, 1).val()
+        w = Workplane().add([b, b.translate((2, 0, 0))])
+        exporters.export(w, str(self.tmpdir / "multi.amf"))
+
+        amf = ET.parse(self.tmpdir / "multi.amf").getroot()
+        objects = amf.findall("object")
+
+        assert len(objects) == 2
+        assert [len(o.findall(".//triangle")) for o in objects] == [12, 12]
+
+        # compressed
+        exporters.export(w, str(self.tmpdir / "multi_zip.amf"), opt={"compress": True})
+
+        with ZipFile(self.tmpdir / "multi_zip.amf") as zf:
+            assert zf.namelist() == ["multi_zip.amf"]
+            amf_zip = ET.fromstring(zf.read("multi_zip.amf"))
+
+        assert len(amf_zip.findall("object")) == 2
+
+        # nested compounds, unrelated options are ignored
+        nested = compound(compound(b, b.translate((2, 0, 0))), b.translate((4, 0, 0)))
+        exporters.export(
+            nested, str(self.tmpdir / "nested.amf"), opt={"width": 100, "compress": 0}
+        )
+
+        amf = ET.parse(self.tmpdir / "nested.amf").getroot()
+
+        assert len(amf.findall("object")) == 3
+
+        # faces outside of solids are kept as an extra object
+        mixed = compound(b, face(rect(1, 1)).moved(z=5), face(rect(1, 1)).moved(z=6))
+        exporters.export(mixed, str(self.tmpdir / "mixed.amf"))
+
+        objects = ET.parse(self.tmpdir / "mixed.amf").getroot().findall("object")
+
+        assert [len(o.findall(".//triangle")) for o in objects] == [12, 4]
+
+        # a tuple of two tessellations is not mistaken for the legacy form
+        AmfWriter((b.tessellateArrays(0.1), b.tessellateArrays(0.1))).writeAmf(
+            self.tmpdir / "pair.amf"
+        )
+
+        amf = ET.parse(self.tmpdir / "pair.amf").getroot()
+
+        assert len(amf.findall("object")) == 2
+
+        # legacy list based tessellation, small chunks
+        vertices, triangles = self._box().val().tessellate(0.1)
+        AmfWriter((vertices, triangles), chunkSize=5).writeAmf(
+            self.tmpdir / "legacy.amf"
+        )
+
+        amf = ET.parse(self.tmpdir / "legacy.amf").getroot()
+
+        assert len(amf.findall(".//vertex")) == len(vertices)
+        assert [int(v.text) for v in amf.findall(".//triangle")[-1]] == list(
+            triangles[-1]
+        )
+        assert float(amf.findall(".//x")[-1].text) == approx(vertices[-1].x)
+
     def testSTEP(self):
         self._exportBox(exporters.ExportTypes.STEP, ["FILE_SCHEMA"])
 
@@ -622,11 +743,92 @@ class TestExporters(BaseTest):
         exporters.export(self._box(), str(self.tmpdir / "out2.3mf"))
         sys.modules["zlib"] = zlib
 
+        # check the model contents, use small chunks to exercise chunking
+        from zipfile import ZipFile
+        import xml.etree.ElementTree as ET
+        from cadquery.occ_impl.exporters.threemf import ThreeMFWriter, SCHEMAS
+
+        shape = self._box().val()
+        vertices, triangles = shape.tessellate(0.1, 0.1)
+
+        ThreeMFWriter(shape, 0.1, 0.1, chunkSize=5).write3mf(
+            str(self.tmpdir / "out3.3mf")
+        )
+
+        with ZipFile(self.tmpdir / "out3.3mf") as zf:
+            model = ET.fromstring(zf.read("3D/3dmodel.model"))
+
+        ns = {"m": SCHEMAS.CORE}
+        vs = model.findall(".//m:vertex", ns)
+        ts = model.findall(".//m:triangle", ns)
+
+        assert model.get("unit") == "millimeter"
+        assert len(vs) == len(vertices)
+        assert len(ts) == len(triangles)
+        assert [float(vs[-1].get(c)) for c in "xyz"] == approx(vertices[-1].toTuple())
+        assert tuple(int(ts[-1].get(c)) for c in ("v1", "v2", "v3")) == triangles[-1]
+        assert len(model.findall(".//m:component", ns)) == 1
+
     def testTJS(self):
         self._exportBox(
             exporters.ExportTypes.TJS, ["vertices", "formatVersion", "faces"]
         )
 
+    def testTJSBinary(self):
+
+        import json
+        from base64 import b64decode
+
+        def _array(attr, dtype):
+            return np.frombuffer(b64decode(attr["array"]), dtype)
+
+        shape = Workplane().sphere(1).val()
+        tess = shape.tessellateArrays(0.1, 0.1, normals=True)
+
+        exporters.export(
+            shape, str(self.tmpdir / "out.json"), "TJS", opt={"binary": True}
+        )
+
+        with open(self.tmpdir / "out.json") as f:
+            data = json.load(f)
+
+        attributes = data["data"]["attributes"]
+
+        assert data["type"] == "CadQueryBinaryGeometry"
+        assert data["metadata"]["type"] == "CadQueryBinaryGeometry"
+        assert attributes["position"]["type"] == "Float32Array"
+        assert _array(attributes["position"], "<f4").reshape(-1, 3) == approx(
+            tess.vertices
+        )
+        assert _array(attributes["normal"], "<f4").reshape(-1, 3) == approx(
+            tess.normals, abs=1e-6
+        )
+        assert data["data"]["index"]["type"] == "Uint16Array"
+        assert (_array(data["data"]["index"], "<u2") == tess.triangles.ravel()).all()
+
+        # quantized
+        exporters.export(
+            shape,
+            str(self.tmpdir / "out_q.json"),
+            "TJS",
+            opt={"binary": True, "quantize": True},
+        )
+
+        with open(self.tmpdir / "out_q.json") as f:
+            data = json.load(f)
+
+        attributes = data["data"]["attributes"]
+        quantization = data["userData"]["quantization"]
+
+        positions = quantization["offset"] + quantization["scale"] * _array(
+            attributes["position"], "<u2"
+        ).reshape(-1, 3)
+        normals = _array(attributes["normal"], "i1").reshape(-1, 3) / 127
+
+        assert attributes["normal"]["normalized"]
+        assert positions == approx(tess.vertices, abs=max(quantization["scale"]))
+        assert normals == approx(tess.normals, abs=1e-2)
+
     def testVRML(self):
 
         exporters.export(self._box(), str(self.tmpdir / "out1.vrml"))
@@ -992,6 +1194,51 @@ def test_dxf_shape(fname):
     assert (s - s_imported).Volume() == 0
 
 
+def test_dxf_polylines(tmpdir):
+
+    w = (
+        Workplane()
+        .rect(20, 10)
+        .extrude(1)
+        .edges("|Z")
+        .fillet(1)
+        .faces(">Z")
+        .workplane()
+        .rarray(2, 2, 5, 3)
+        .slot2D(1.5, 0.5)
+        .cutThruAll()
+        .section(-0.5)
+    )
+
+    path = str(tmpdir / "polylines.dxf")
+    exporters.exportDXF(w, path, polylines=True)
+
+    dxf = ezdxf.readfile(path)
+    msp = dxf.modelspace()
+
+    # one closed polyline per wire
+    assert len(msp) == len(msp.query("LWPOLYLINE")) == 16
+    assert all(e.closed for e in msp)
+
+    w_i = importers.importDXF(path)
+
+    assert w_i.val().isValid()
+    assert w.val().Area() == approx(w_i.val().Area())
+    assert w.edges().size() == w_i.edges().size()
+
+    # chains are split by splines and free edges are kept
+    s = Workplane().spline([(0, 0), (1, 1), (2, 0)]).lineTo(2, -1).lineTo(0, -1).close()
+    c = Edge.makeCircle(1, (5, 0, 0))
+    exporters.exportDXF(compound(s.val(), c), path, polylines=True)
+
+    msp = ezdxf.readfile(path).modelspace()
+
+    assert len(msp.query("LWPOLYLINE")) == 1
+    assert len(msp.query("SPLINE")) == 1
+    assert len(msp.query("CIRCLE")) == 1
+    assert len(msp.query("LWPOLYLINE")[0]) == 4
+
+
 def test_step_export_unit_default(tmpdir):
     """
     Exports a box without specifying a unit and verifies the STEP file
@@ -1067,3 +1314,106 @@ def test_toVTK():
     edge_data = edge_actor.GetMapper().GetInput()
     assert edge_data.GetNumberOfLines() > 0
     assert edge_data.GetNumberOfPolys() == 0
+
+
+@pytest.mark.parametrize("lods", [0, 2])
+def test_toVTKAssy_instances(lods):
+
+    from cadquery.occ_impl.assembly import toVTKAssy
+
+    w = Workplane().sphere(1)
+
+    assy = Assembly()
+    assy.add(w, name="a")
+    assy.add(w, name="b", loc=Location(3, 0, 0))
+
+    actors = toVTKAssy(assy, lods=lods)
+
+    assert len(actors) == 4
+
+    # both instances share the meshes
+    for i in range(2):
+        assert actors[i].GetMapper().GetInput() is actors[i + 2].GetMapper().GetInput()
+
+    faces = actors[0].GetMapper().GetInput()
+    assert faces.GetNumberOfPolys() > 0
+
+    if lods:
+        assert actors[0].GetLODMappers().GetNumberOfItems() == lods
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_exportBatch(tmp_path, processes):
+
+    part = Workplane().box(1, 1, 1).edges().fillet(0.1).val()
+
+    assy = Assembly(name="top")
+    for i in range(5):
+        assy.add(part, loc=Location(2 * i, 0, 0), name=f"part{i}")
+
+    exts = ("step", "stl", "3mf", "glb", "svg")
+    paths = [str(tmp_path / f"out.{ext}") for ext in exts]
+
+    mesh, rv = exporters.exportBatch(assy, paths, 0.01, processes=processes)
+
+    assert mesh >= 0
+    assert set(rv) == set(paths)
+    assert all(t >= 0 for t in rv.values())
+
+    for p in paths:
+        assert os.path.getsize(p) > 0
+
+    # the stored triangulation is used by the writers
+    ref = str(tmp_path / "ref.stl")
+    assy.export(ref, tolerance=0.01)
+
+    assert os.path.getsize(ref) == os.path.getsize(paths[1])
+
+    # a single file is exported in the current process
+    from cadquery.occ_impl.exporters import batch
+
+    exporters.exportBatch(assy, [str(tmp_path / "single.amf")], processes=processes)
+
+    assert batch._obj is assy
+    assert (tmp_path / "single.amf").stat().st_size > 0
+
+    # shapes are supported too
+    exporters.exportBatch(
+        part, [str(tmp_path / "part.step"), str(tmp_path / "part.gltf")], processes=1
+    )
+
+    assert (tmp_path / "part.bin").exists()
+
+    with pytest.raises(ValueError):
+        exporters.exportBatch(part, [str(tmp_path / "part.xyz")])
+
+
+def test_exportBatch_transfer():
+
+    from cadquery.occ_impl.exporters.batch import _dumps, _loads
+    from cadquery.occ_impl.exporters.assembly import _instances
+
+    part = Workplane().box(1, 1, 1).edges().fillet(0.1).val()
+    part.mesh(0.01)
+
+    # separate wrappers of the same TShape
+    assy = Assembly(name="top")
+    assy.add(Workplane().add(part), name="a")
+    assy.add(Workplane().add(Shape.cast(part.wrapped)), name="b", color=Color("red"))
+    assy.add(Shape.cast(part.wrapped), loc=Location(4, 0, 0), name="c")
+
+    res = _loads(*_dumps(assy))
+
+    # instances and triangulations are preserved
+    ((_, locs),) = _instances(res).values()
+    assert len(locs) == 3
+
+    a, b = res.objects["a"].obj.val(), res.objects["b"].obj.val()
+    c = res.objects["c"].obj
+
+    assert a == b == c
+    assert a is not b
+    assert res.objects["c"].loc.toTuple()[0] == approx((4, 0, 0))
+    assert res.objects["b"].color.toTuple() == approx(Color("red").toTuple())
+
+    assert BRepTools.Triangulation_s(c.wrapped, 1e3)
@@ -73,6 +73,7 @@ from cadquery.occ_impl.shapes import (
 )
 
 from OCP.BOPAlgo import BOPAlgo_CheckStatus
+from OCP.BRepTools import BRepTools
 
 import pytest
 from pytest import approx, raises, fixture
@@ -1596,3 +1597,17 @@ def test_hlr():
     bb = res3.visible.Edges()[0].BoundingBox()
     assert (bb.xmin, bb.ymin, bb.zmin) == approx((3, 0, 0))
     assert (bb.xmax, bb.ymax, bb.zmax) == approx((4, 0, 0))
+
+    # mesh based algorithm
+    res4 = hlr(s1, (1, 1, 1), up=(0, 0, 1), poly=True)
+
+    assert res4.visible.Edges()
+    assert res4.hidden.Edges()
+    assert res4.plane.zDir == res1.plane.zDir
+
+    bb1 = res1.visible.BoundingBox()
+    bb4 = res4.visible.BoundingBox()
+    assert (bb4.xlen, bb4.ylen) == approx((bb1.xlen, bb1.ylen), abs=1e-3)
+
+    # the projected shape is not meshed
+    assert not BRepTools.Triangulation_s(s1.wrapped, 1e3)
@@ -5,6 +5,8 @@
 import tempfile
 import os
 
+import numpy as np
+
 from cadquery import importers, Workplane, Compound
 from tests import BaseTest
 from pytest import approx, raises
@@ -312,6 +314,148 @@ class TestImporters(BaseTest):
         self.assertEqual(threed.findSolid().BoundingBox().zlen, extrusion_value)
 
 
+def test_importDXF_fast(tmp_path):
+
+    import ezdxf
+
+    doc = ezdxf.new()
+    msp = doc.modelspace()
+
+    # plate with a hole and an island inside of the hole, built from separate lines
+    for d in (5, 3, 1):
+        pts = [(-d, -d), (d, -d), (d, d), (-d, d)]
+        for p1, p2 in zip(pts, pts[1:] + pts[:1]):
+            msp.add_line(p1, p2)
+
+    # a grid of small circles and a polyline on a second layer
+    for i, j in np.ndindex(10, 10):
+        msp.add_circle((20 + 2 * i, 2 * j), 0.5)
+
+    msp.add_lwpolyline(
+        [(0, 20), (4, 20), (4, 22), (0, 22)], close=True, dxfattribs={"layer": "L2"}
+    )
+
+    path = str(tmp_path / "nested.dxf")
+    doc.saveas(path)
+
+    res = importers.importDXF(path, fast=True)
+    areas = sorted(f.Area() for f in res.faces().vals())
+
+    assert len(areas) == 103
+    assert areas[-1] == approx(100 - 36)
+    assert areas[-2] == approx(8)
+    assert areas[-3] == approx(4)
+    assert areas[0] == approx(np.pi * 0.25)
+
+    # same result as the default import on a shape without islands
+    filename = os.path.join(testdataDir, "spline.dxf")
+    res = importers.importDXF(filename, tol=1, fast=True)
+
+    assert res.faces().size() == 1
+    assert res.wires().size() == 2
+    assert res.val().Area() == approx(
+        importers.importDXF(filename, tol=1).val().Area()
+    )
+
+    res = importers.importDXF(path, include=["L2"], fast=True)
+    assert res.val().Area() == approx(8)
+
+
+def test_import_cache(tmp_path):
+
+    from cadquery import Assembly, Color
+    from cadquery.occ_impl.cache import enableImportCache, disableImportCache
+
+    path = str(tmp_path / "box.step")
+    Workplane().box(1, 2, 3).val().exportStep(path)
+
+    assy = Assembly(name="top").add(
+        Workplane().box(1, 1, 1), name="box", color=Color("red")
+    )
+    assy_path = str(tmp_path / "assy.step")
+    assy.export(assy_path)
+
+    cache = enableImportCache(tmp_path / "cache")
+
+    try:
+        # miss populates the cache
+        ref = importers.importStep(path)
+        assert len(cache.entries()) == 1
+
+        # hit
+        res = importers.importStep(path)
+        assert len(cache.entries()) == 1
+        assert res.val().Volume() == approx(ref.val().Volume())
+
+        # different unit results in a new entry
+        res = importers.importStep(path, unit="M")
+        assert len(cache.entries()) == 2
+        assert res.val().Volume() == approx(1e-9 * ref.val().Volume())
+
+        # modified file results in a new entry
+        Workplane().box(2, 2, 3).val().exportStep(path)
+        os.utime(path, ns=(0, 0))
+
+        assert importers.importStep(path).val().Volume() == approx(12)
+        assert len(cache.entries()) == 3
+
+        # assemblies
+        ref_assy = Assembly.importStep(assy_path)
+        assert len(cache.entries()) == 4
+
+        res_assy = Assembly.importStep(assy_path)
+        assert len(cache.entries()) == 4
+
+        assert set(res_assy.objects) == set(ref_assy.objects)
+        assert res_assy.objects["box"].color is not None
+        assert res_assy.objects["box"].obj.Volume() == approx(1)
+
+        # missing files are reported as before
+        with raises(ValueError):
+            importers.importStep(str(tmp_path / "missing.step"))
+
+    finally:
+        disableImportCache()
+
+
+def test_import_cache_lazy(tmp_path, monkeypatch):
+
+    from cadquery import Assembly
+    from cadquery.occ_impl.cache import enableImportCache, disableImportCache
+    from cadquery.occ_impl.importers import assembly as assembly_importers
+
+    calls = []
+
+    class Reader(assembly_importers.STEPCAFControl_Reader):
+        def ReadFile(self, path):
+            calls.append(path)
+            return super().ReadFile(path)
+
+    monkeypatch.setattr(assembly_importers, "STEPCAFControl_Reader", Reader)
+
+    path = str(tmp_path / "assy.step")
+    Assembly(name="top").add(Workplane().box(1, 1, 1), name="box").export(path)
+
+    enableImportCache(tmp_path / "cache")
+
+    try:
+        # miss, the nodes are not loaded to populate the cache
+        assy = Assembly.load(path, lazy=True)
+
+        assert len(calls) == 1
+        assert "_loader" in assy.objects["box"].__dict__
+
+        # hit, the STEP file is not read
+        assy = Assembly.load(path, lazy=True)
+
+        assert len(calls) == 1
+        assert "_loader" in assy.objects["box"].__dict__
+        assert assy.objects["box"].obj.Volume() == approx(1)
+
+    finally:
+        disableImportCache()
+
+
 if __name__ == "__main__":
     import unittest
 
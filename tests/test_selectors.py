@@ -529,6 +529,60 @@ class TestCQSelectors(BaseTest):
 
         assert res == b2
 
+    def testSpatialIndex(self):
+
+        s = Workplane().rarray(3, 3, 7, 7).box(1, 1, 1).val()
+
+        edges = s.Edges()
+        faces = s.Faces()
+
+        self.assertGreater(len(faces), selectors.BVH_MIN_SIZE)
+
+        sels = [
+            selectors.NearestToPointSelector((2.4, -1.2, 0.3)),
+            selectors.NearestToPointSelector((100, 0, 0)),
+            selectors.NearestToShapeSelector(box(1, 1, 1).moved(x=2, y=5)),
+            selectors.BoxSelector((-5, -5, -1), (0, 2, 0.2)),
+            selectors.BoxSelector((-5, -5, -1), (0, 2, 2), True),
+        ]
+
+        # no index is built by default
+        self.assertIsNone(selectors._Properties(edges).tree())
+        self.assertEqual(len(selectors._trees), 0)
+
+        linear = [(sel.filter(edges), sel.filter(faces)) for sel in sels]
+
+        # results with the index
+        selectors.enableIndexCache()
+
+        try:
+            indexed = [(sel.filter(edges), sel.filter(faces)) for sel in sels]
+
+            # the index is built once per object list, when it is filtered again
+            self.assertEqual(len(selectors._trees), 2)
+
+            tree = selectors._Properties(s.Edges()).tree()
+            self.assertIsNotNone(tree)
+            self.assertIs(tree, selectors._tree(edges))
+            self.assertEqual(len(tree.bounds), len(edges))
+
+            vertices = s.Vertices()
+            self.assertIsNone(selectors._tree(vertices))
+            self.assertIsNotNone(selectors._tree(vertices))
+
+            # least recently used lists are evicted
+            selectors.enableIndexCache(2)
+            self.assertNotIn(tuple(faces), selectors._trees)
+            self.assertIn(tuple(edges), selectors._trees)
+
+        finally:
+            selectors.disableIndexCache()
+
+        self.assertEqual(len(selectors._trees), 0)
+
+        self.assertListEqual(indexed, linear)
+        self.assertTrue(all(r for r, _ in indexed))
+
     def testBox(self):
         c = CQ(makeUnitCube(centered=False))
 
@@ -1147,6 +1201,35 @@ class TestCQSelectors(BaseTest):
         for e in expressions:
             gram.parse_string(e, parse_all=True)
 
+    def testSelectorCache(self):
+
+        selectors._compile.cache_clear()
+
+        sel1 = StringSyntaxSelector(">Z or <Z")
+        sel2 = StringSyntaxSelector(">Z or <Z")
+
+        # the string is only parsed once and the tree is shared
+        self.assertIs(sel1.mySelector, sel2.mySelector)
+        self.assertEqual(selectors._compile.cache_info().hits, 1)
+
+        top, sides = selectors.precompile(">Z", "#Z")
+
+        self.assertIsInstance(top, StringSyntaxSelector)
+        self.assertEqual(selectors._compile.cache_info().misses, 3)
+
+        w = Workplane().box(1, 1, 1)
+
+        self.assertEqual(w.faces(top).size(), 1)
+        self.assertEqual(w.faces(sides).size(), 4)
+        self.assertEqual(w.faces(">Z").size(), 1)
+        self.assertEqual(selectors._compile.cache_info().hits, 2)
+
+        # invalid strings are not cached
+        with self.assertRaises(Exception):
+            StringSyntaxSelector(">Q")
+
+        self.assertEqual(selectors._compile.cache_info().currsize, 3)
+
     def testShape(self):
         """
         Test selectors with shapes
@@ -1201,3 +1284,148 @@ class TestCQSelectors(BaseTest):
         res8_w = w.faces(">Z")
 
         check_centers(res8_w, res8)
+
+    def testArrayEngine(self):
+        """
+        Test that the array based evaluation matches the per object methods
+        """
+
+        s = (
+            Workplane()
+            .box(10, 8, 3)
+            .edges("|Z")
+            .fillet(1)
+            .faces(">Z")
+            .workplane()
+            .rarray(4, 3, 2, 2)
+            .hole(1)
+            .val()
+        )
+
+        faces = s.Faces()
+        edges = s.Edges()
+
+        # direction selectors
+        for sel, objs in (
+            (ParallelDirSelector(Vector(0, 0, 1)), faces + edges),
+            (DirectionSelector(Vector(0, 0, -1)), faces),
+            (PerpendicularDirSelector(Vector(1, 1, 0)), edges),
+        ):
+            expected = [
+                o
+                for o in objs
+                if o.geomType() in ("PLANE", "LINE")
+                and sel.test(o.normalAt() if o.ShapeType() == "Face" else o.tangentAt())
+            ]
+            self.assertListEqual(sel.filter(objs), expected)
+
+        # subclasses overriding only test are still supported
+        class XSelector(ParallelDirSelector):
+            def test(self, vec):
+                return vec.x > 0.5
+
+        self.assertListEqual(
+            XSelector(Vector()).filter(faces),
+            [f for f in faces if f.geomType() == "PLANE" and f.normalAt().x > 0.5],
+        )
+
+        # type selector
+        self.assertListEqual(
+            TypeSelector("circle").filter(edges),
+            [e for e in edges if e.geomType() == "CIRCLE"],
+        )
+
+        # nth selectors keep the order of objects with equal keys
+        sel = selectors.CenterNthSelector(Vector(0, 0, 1), 0)
+        clusters = sel.cluster(edges)
+
+        self.assertEqual(sum(len(c) for c in clusters), len(edges))
+        for c in clusters:
+            self.assertListEqual(c, [e for e in edges if e in c])
+
+        self.assertListEqual(
+            selectors.RadiusNthSelector(0).cluster(edges),
+            [[e for e in edges if e.geomType() == "CIRCLE" and e.radius() < 0.75]]
+            + [[e for e in edges if e.geomType() == "CIRCLE" and e.radius() > 0.75]],
+        )
+
+        # box selector
+        sel = selectors.BoxSelector((-6, -5, -1), (0, 5, 1))
+        self.assertListEqual(
+            sel.filter(faces),
+            [f for f in faces if f.Center().x < 0 and abs(f.Center().z) < 1],
+        )
+
+        sel = selectors.BoxSelector((-6, -5, -2), (0, 5, 2), boundingbox=True)
+        self.assertListEqual(
+            sel.filter(faces), [f for f in faces if f.BoundingBox().xmax < 0]
+        )
+
+        # string selectors share the properties of the objects
+        w = Workplane().add(s)
+
+        def z(o):
+            return o.Center().z
+
+        zmax = max(z(e) for e in edges)
+        lines_z = [e for e in edges if e.geomType() == "LINE" and e.tangentAt().z]
+
+        self.assertEqual(w.faces(">Z or <Z").size(), 2)
+        self.assertSetEqual(
+            set(w.edges("%CIRCLE and >Z").vals()),
+            {e for e in edges if e.geomType() == "CIRCLE" and z(e) == zmax},
+        )
+        self.assertSetEqual(
+            set(w.faces(">Z[-2]").vals()), {f for f in faces if abs(z(f)) < 1e-6}
+        )
+        self.assertSetEqual(
+            set(w.edges("not |Z and not %CIRCLE").vals()),
+            set(edges) - set(lines_z) - set(w.edges("%CIRCLE").vals()),
+        )
+
+    def testOverrides(self):
+        """
+        Test that subclasses overriding only the public methods are supported
+        """
+
+        s = Workplane().box(10, 8, 3).faces(">Z").workplane().hole(2).val()
+
+        faces = s.Faces()
+        planes = [f for f in faces if f.geomType() == "PLANE"]
+
+        # filter overrides are used by combined and inverted selectors
+        class PlaneSelector(Selector):
+            def filter(self, objectList):
+                return [o for o in objectList if o.geomType() == "PLANE"]
+
+        class NotPlaneSelector(TypeSelector):
+            def filter(self, objectList):
+                return [o for o in objectList if o.geomType() != "PLANE"]
+
+        z = ParallelDirSelector(Vector(0, 0, 1))
+
+        self.assertListEqual(
+            (PlaneSelector() & z).filter(faces), [f for f in planes if z.filter([f])]
+        )
+        self.assertListEqual(
+            (-PlaneSelector()).filter(faces), [f for f in faces if f not in planes]
+        )
+        self.assertListEqual(
+            (NotPlaneSelector("plane") + z).filter(faces),
+            [f for f in faces if f not in planes or z.filter([f])],
+        )
+
+        # cluster overrides are used by filter
+        class XClusterSelector(selectors.CenterNthSelector):
+            def cluster(self, objectlist):
+                return [[o] for o in sorted(objectlist, key=lambda o: o.Center().x)]
+
+        sel = XClusterSelector(Vector(0, 0, 1), 0)
+
+        self.assertListEqual(
+            sel.filter(planes), [min(planes, key=lambda o: o.Center().x)]
+        )
+        self.assertListEqual(
+            Workplane().add(s).faces(sel).vals(),
+            [min(faces, key=lambda o: o.Center().x)],
+        )
@@ -24,14 +24,19 @@ from cadquery.occ_impl.shapes import (
     wireOn,
     vertex,
     fuse,
+    sphere,
 )
 
 from cadquery.selectors import NearestToPointSelector
+from cadquery.occ_impl.mesh import weld, decimate, lods
+from cadquery.occ_impl.shapes import _tessellation_arrays, _polygon_arrays
 
 from pytest import approx, raises, fixture
 
 from math import pi
 
+import numpy as np
+
 
 @fixture
 def simple_box():
@@ -369,6 +374,93 @@ def test_remove():
     assert br.isValid()
 
 
+def test_topology_index():
+
+    b = box(1, 1, 1)
+
+    # the index is built lazily and reused
+    assert b.Faces()
+    index = b._index()
+
+    assert b._index() is index
+    assert len(b.Edges()) == 12
+    assert b._index() is index
+
+    f = b.faces(">Z")
+    assert f.ancestors(b, "Solid").size() == 1
+    assert f.siblings(b, "Edge").size() == 4
+    assert len(index.ancestors) == 2
+
+    # moving in place invalidates the index
+    b.move(Vector(0, 0, 1))
+
+    assert b._index() is not index
+    assert b.faces(">Z").Center().z == approx(2)
+
+    # as does removing subshapes
+    c = compound(box(1, 1, 1), sphere(1))
+    assert len(c.Solids()) == 2
+
+    # including for other shapes sharing the modified topology
+    other = Compound(c.wrapped)
+    assert len(other.Solids()) == 2
+
+    c.remove(c.Solids()[1])
+    assert len(c.Solids()) == 1
+    assert len(other.Solids()) == 1
+
+
+def test_properties():
+
+    b = box(1, 2, 3)
+    s = b.fillet(0.2, b.Edges()) + cylinder(1, 5).moved(Vector(0, 0, 3))
+
+    faces = s.Faces()
+    props = s.properties(
+        "Face", ["center", "area", "normal", "bbmin", "bbmax", "geomType"]
+    )
+
+    assert props["center"].shape == (len(faces), 3)
+    assert props["area"] == approx([f.Area() for f in faces])
+    assert props["center"] == approx(np.array([f.Center().toTuple() for f in faces]))
+    assert props["normal"] == approx(
+        np.array([f.normalAt().toTuple() for f in faces])
+    )
+    assert props["bbmin"][:, 2] == approx([f.BoundingBox().zmin for f in faces])
+    assert props["bbmax"][:, 0] == approx([f.BoundingBox().xmax for f in faces])
+    assert list(props["geomType"]) == [f.geomType() for f in faces]
+
+    # array based filtering
+    planes = props["geomType"] == "PLANE"
+    assert planes.sum() == len([f for f in faces if f.geomType() == "PLANE"])
+
+    edges = s.Edges()
+    props = s.properties("Edge", ["length", "tangent", "center", "geomType"])
+
+    assert props["length"] == approx([e.Length() for e in edges])
+    assert props["tangent"] == approx(
+        np.array([e.tangentAt().toTuple() for e in edges])
+    )
+    assert props["center"] == approx(np.array([e.Center().toTuple() for e in edges]))
+    assert list(props["geomType"]) == [e.geomType() for e in edges]
+
+    props = s.properties("Solid", ["volume", "area"])
+
+    assert props["volume"] == approx([s.Volume()])
+    assert props["area"] == approx([s.Area()])
+
+    props = s.properties("Vertex")
+    assert props["center"] == approx(
+        np.array([v.toTuple() for v in s.Vertices()])
+    )
+
+    with raises(ValueError):
+        s.properties("Edge", ["normal"])
+
+    with raises(ValueError):
+        s.properties("Compound")
+
+
 def test_addCavity():
 
     b1 = box(2, 2, 2)
@@ -541,3 +633,384 @@ def test_start_end():
 
     assert (seg.startPoint() - seg_r.endPoint()).Length == approx(0)
     assert (seg.endPoint() - seg_r.startPoint()).Length == approx(0)
+
+
+def test_tessellate_arrays():
+
+    s = box(1, 2, 3).moved(Vector(1, 1, 1)) + sphere(1).moved(Vector(0, 0, 6))
+
+    verts, tris = s.tessellate(1e-3)
+    tess = s.tessellateArrays(1e-3, normals=True)
+
+    assert tess.vertices.shape == (len(verts), 3)
+    assert tess.triangles.shape == (len(tris), 3)
+    assert tess.vertices.dtype == np.float64
+    assert tess.triangles.dtype == np.int32
+    assert tess.vertices.flags.c_contiguous
+    assert tess.triangles.flags.c_contiguous
+
+    # consistent with the list based API
+    assert tess.vertices == approx(np.array([v.toTuple() for v in verts]))
+    assert (tess.triangles == np.array(tris)).all()
+
+    # face ids map triangles back to faces
+    faces = s.Faces()
+    assert tess.faces.shape == (len(tris),)
+    assert set(tess.faces.tolist()) == set(range(len(faces)))
+
+    for i in (0, len(tris) - 1):
+        f = faces[tess.faces[i]]
+        c = tess.vertices[tess.triangles[i]].mean(axis=0)
+        assert f.distance(Vertex.makeVertex(*c)) < 1e-3
+
+    # normals are unit vectors pointing outwards
+    assert tess.normals.shape == tess.vertices.shape
+    assert np.linalg.norm(tess.normals, axis=1) == approx(1)
+
+    i = np.argmax(tess.vertices[:, 2])
+    assert tess.normals[i] == approx((0, 0, 1), abs=1e-3)
+
+    # no normals by default
+    assert s.tessellateArrays(1e-3).normals is None
+
+    # empty tessellation
+    tess = Face.makePlane(1e-9, 1e-9).tessellateArrays(1e-3)
+
+    assert tess.vertices.shape == (0, 3)
+    assert tess.triangles.shape == (0, 3)
+
+
+def test_tessellate_arrays_parallel():
+
+    s = compound([sphere(1).moved(Vector(3 * i, 0, 0)) for i in range(4)])
+
+    ser = s.tessellateArrays(1e-3, normals=True)
+    par = s.tessellateArrays(1e-3, normals=True, parallel=True)
+
+    assert (ser.vertices == par.vertices).all()
+    assert (ser.triangles == par.triangles).all()
+    assert (ser.faces == par.faces).all()
+    assert (ser.normals == par.normals).all()
+
+
+def test_mesh_cache(tmp_path):
+
+    from cadquery.occ_impl.cache import (
+        enableMeshCache,
+        disableMeshCache,
+        getMeshCache,
+    )
+    from cadquery.occ_impl.shapes import _vtk_poly_data
+    from OCP.BRepTools import BRepTools
+    from OCP.BRepMesh import BRepMesh_IncrementalMesh
+
+    def _shape():
+        return (box(1, 2, 3) + sphere(1)).moved(Vector(1, 2, 3))
+
+    ref = _shape().tessellateArrays(1e-3, normals=True)
+
+    cache = enableMeshCache(tmp_path / "mesh")
+
+    try:
+        assert getMeshCache() is cache
+
+        # miss populates the cache
+        tess = _shape().tessellateArrays(1e-3, normals=True)
+
+        assert len(cache.entries()) == 1
+        assert (tess.triangles == ref.triangles).all()
+
+        # hit returns memory-mapped arrays
+        tess = _shape().tessellateArrays(1e-3, normals=True)
+
+        assert isinstance(tess.vertices, np.memmap)
+        assert tess.vertices == approx(ref.vertices)
+        assert tess.normals == approx(ref.normals)
+        assert (tess.triangles == ref.triangles).all()
+        assert (tess.faces == ref.faces).all()
+
+        verts, tris = _shape().tessellate(1e-3)
+        assert len(verts) == len(ref.vertices)
+        assert len(tris) == len(ref.triangles)
+
+        # different parameters result in a new entry
+        _shape().tessellateArrays(1e-2)
+
+        assert len(cache.entries()) == 2
+
+        # mesh restores the triangulation from the cache
+        s = _shape()
+        s.mesh(1e-3)
+
+        # including the edge polygons, deflections are relative to the face size
+        assert BRepTools.Triangulation_s(s.wrapped, 1e3)
+        assert _vtk_poly_data(s.wrapped) is not None
+
+        disableMeshCache()
+        assert getMeshCache() is None
+
+        tess = s.tessellateArrays(1e-3)
+
+        assert tess.vertices == approx(ref.vertices)
+        assert (tess.triangles == ref.triangles).all()
+
+        # stl export of the restored mesh
+        enableMeshCache(tmp_path / "mesh")
+        s = _shape()
+        s.exportStl(str(tmp_path / "cached.stl"), 1e-3)
+
+        # binary stl: 84 byte header and 50 bytes per triangle
+        assert (tmp_path / "cached.stl").stat().st_size == 84 + 50 * len(tris)
+
+        # an existing finer triangulation is used but not cached
+        n = len(cache.entries())
+        s = _shape()
+        BRepMesh_IncrementalMesh(s.wrapped, 1e-4, False, 0.1)
+        tess = s.tessellateArrays(5e-3)
+
+        assert len(tess.triangles) > len(ref.triangles)
+        assert len(cache.entries()) == n
+
+        # eviction
+        cache = enableMeshCache(tmp_path / "mesh", maxSize=0)
+        _shape().tessellateArrays(2e-3)
+
+        assert len(cache.entries()) == 0
+
+    finally:
+        disableMeshCache()
+
+
+def test_shape_store(tmp_path):
+
+    from cadquery.occ_impl.store import ShapeStore
+    from cadquery.occ_impl.geom import BoundBox
+
+    path = tmp_path / "parts.cqs"
+
+    shapes = {f"box_{i}": box(1, 1, 1).moved(Vector(2 * i, 0, 0)) for i in range(10)}
+    shapes["sphere"] = sphere(1).moved(Vector(0, 5, 0))
+
+    ShapeStore.write(path, shapes)
+
+    with ShapeStore(path) as store:
+        assert len(store) == 11
+        assert list(store) == list(shapes)
+        assert "sphere" in store
+        assert "cone" not in store
+
+        # shapes are loaded on demand
+        s = store["box_3"]
+
+        assert s.isValid()
+        assert s.Volume() == approx(1)
+        assert s.Center().toTuple() == approx((6, 0, 0.5))
+
+        # bounding boxes are available without loading shapes
+        bb = store.boundingBox("sphere")
+        ref = shapes["sphere"].BoundingBox()
+
+        assert (bb.xmin, bb.ymin, bb.zmax) == approx((ref.xmin, ref.ymin, ref.zmax))
+
+        names = store.query(box(3.4, 1, 1).moved(Vector(4, 0, 0)).BoundingBox())
+
+        assert names == ["box_1", "box_2", "box_3"]
+        assert store.query(BoundBox(bb.wrapped)) == ["sphere"]
+
+    with raises(ValueError):
+        ShapeStore.write(tmp_path / "dup.cqs", [("a", box(1, 1, 1))] * 2)
+
+    (tmp_path / "other.cqs").write_bytes(b"0" * 64)
+
+    with raises(ValueError):
+        ShapeStore(tmp_path / "other.cqs")
+
+
+def _edge_counts(tess):
+    """
+    Number of triangles sharing every edge of a tessellation.
+    """
+
+    edges = np.sort(
+        np.vstack(
+            (
+                tess.triangles[:, (0, 1)],
+                tess.triangles[:, (1, 2)],
+                tess.triangles[:, (2, 0)],
+            )
+        ),
+        axis=1,
+    )
+
+    return np.unique(edges, axis=0, return_counts=True)[1]
+
+
+def test_weld():
+
+    b = box(1, 1, 1)
+    s = b.fillet(0.2, b.edges())
+    tess = s.tessellateArrays(1e-2, normals=True)
+
+    welded = weld(tess)
+
+    # duplicated boundary nodes are merged and the mesh is closed
+    assert len(welded.vertices) < len(tess.vertices)
+    assert len(welded.triangles) <= len(tess.triangles)
+    assert (_edge_counts(welded) == 2).all()
+    assert len(welded.faces) == len(welded.triangles)
+    assert np.linalg.norm(welded.normals, axis=1) == approx(1)
+
+    # triangles collapsing under a coarse tolerance are removed
+    assert len(weld(tess, 0.2).triangles) < len(tess.triangles)
+
+
+def test_decimate(tmp_path):
+
+    b = box(10, 10, 10)
+    s = b.fillet(2, b.edges())
+
+    deviation = decimate(s, 0.01)
+    tess = s.tessellateArrays(0.01)
+
+    assert deviation <= 0.01
+    assert (_edge_counts(weld(tess)) == 2).all()
+
+    # lighter than a direct mesh with the same deflection
+    ref = s.copy()
+    ref.mesh(0.01)
+
+    assert len(tess.triangles) < len(ref.tessellateArrays(0.01).triangles)
+
+    # all nodes lie on the BRep
+    for i in np.linspace(0, len(tess.vertices) - 1, 20).astype(int):
+        assert s.distance(Vertex.makeVertex(*tess.vertices[i])) == approx(0, abs=1e-6)
+
+    # the triangulation is complete, including the edge polygons
+    from OCP.BRepTools import BRepTools
+
+    assert BRepTools.Triangulation_s(s.wrapped, 0.01)
+
+    # and reused by exports
+    s.exportStl(str(tmp_path / "decimated.stl"), 0.01, relative=False)
+
+    with open(tmp_path / "decimated.stl", "rb") as f:
+        assert int.from_bytes(f.read(84)[80:], "little") == len(tess.triangles)
+
+
+def test_decimate_seams():
+
+    # plate with a filleted hole, the cylindrical and toroidal faces have seams
+    from OCP.BRepTools import BRepTools
+
+    b = box(10, 10, 2).cut(cylinder(4, 4).moved(z=-1))
+    s = b.fillet(0.5, [e for e in b.Edges() if e.geomType() == "CIRCLE"])
+
+    assert decimate(s, 0.01) <= 0.01
+
+    data = _tessellation_arrays(s.wrapped)
+    polygons = _polygon_arrays(s.wrapped)
+
+    sizes = {i: n1 - n0 for i, n0, n1, _, _ in data["ranges"].tolist()}
+    seams = {}
+
+    # every node of the edge polygons is a node of the face triangulation
+    for e, f, rev, k0, k1 in polygons["edge_ranges"].tolist():
+        nodes = polygons["edge_nodes"][k0:k1]
+
+        assert nodes.min() >= 1
+        assert nodes.max() <= sizes[f]
+
+        seams.setdefault((e, f), []).append(nodes)
+
+    # and both polygons of a seam refer to distinct nodes
+    seams = {k: v for k, v in seams.items() if len(v) == 2}
+    assert seams
+
+    for fwd, rev in seams.values():
+        assert not set(fwd.tolist()) & set(rev.tolist())
+
+    assert BRepTools.Triangulation_s(s.wrapped, 0.01)
+
+
+def test_decimate_failure():
+
+    s = sphere(1)
+
+    # the reference mesh alone exceeds the bound
+    with raises(ValueError):
+        decimate(s, 0.01, refinement=1.5)
+
+
+def test_lods():
+
+    s = sphere(1).moved(z=2).fuse(box(1, 1, 1))
+
+    rv = lods(s, 1e-3, 0.1, levels=3, reduction=0.5)
+
+    assert len(rv) == 3
+
+    # coarse to fine, welded
+    counts = [len(l.triangles) for l in rv]
+    assert counts[0] > counts[1] > counts[2]
+    assert (_edge_counts(rv[0]) == 2).all()
+
+    # every triangle is mapped to a face
+    for l in rv:
+        assert len(l.faces) == len(l.triangles)
+        assert set(l.faces.tolist()) <= set(range(len(s.Faces())))
+        assert l.vertices.min(axis=0) == approx((-0.5, -0.5, 0), abs=0.1)
+        assert l.vertices.max(axis=0) == approx((0.5, 0.5, 2.5), abs=0.1)
+
+
+def test_toVtkPolyData_meshed():
+
+    from itertools import groupby
+    from OCP.BRepMesh import BRepMesh_IncrementalMesh
+
+    s = cylinder(1, 1).fuse(box(1, 1, 1).moved(z=1))
+
+    ref = s.toVtkPolyData(1e-2, 0.1, normals=True)
+
+    # reuse the stored triangulation
+    BRepMesh_IncrementalMesh(s.wrapped, 1e-2, False, 0.1)
+    rv = s.toVtkPolyData(1e-2, 0.1, normals=True)
+
+    tess = s.tessellateArrays(1e-2)
+
+    assert rv.GetNumberOfPolys() == len(tess.triangles)
+    assert rv.GetNumberOfLines() > 0
+    assert rv.GetNumberOfVerts() == len(s.Vertices())
+    assert rv.GetBounds() == approx(ref.GetBounds(), abs=1e-2)
+
+    for name in ("SUBSHAPE_IDS", "MESH_TYPES"):
+        arr = rv.GetCellData().GetArray(name)
+        assert arr.GetNumberOfTuples() == rv.GetNumberOfCells()
+
+    assert rv.GetPointData().GetNormals() is not None
+    assert rv.GetCellData().GetNormals() is not None
+
+    # same cell layout as the IVtk based conversion, normals only on request
+    rv = s.toVtkPolyData(1e-2, 0.1)
+
+    assert rv.GetPointData().GetNormals() is None
+    assert rv.GetCellData().GetNormals() is None
+
+    def _layout(data):
+        types = (data.GetCellType(i) for i in range(data.GetNumberOfCells()))
+        return [t for t, _ in groupby(types)]
+
+    assert _layout(rv) == _layout(ref)
+
+    # the stored triangulation is not used without a tolerance
+    s = cylinder(1, 1)
+    s.mesh(0.5)
+    n_coarse = len(s.tessellateArrays(0.5).triangles)
+
+    assert s.toVtkPolyData().GetNumberOfPolys() > n_coarse
+
+    # a coarser mesh than requested is not reused
+    s = cylinder(1, 1)
+    s.mesh(0.5)
+    n_coarse = len(s.tessellateArrays(0.5).triangles)
+
+    assert s.toVtkPolyData(1e-3).GetNumberOfPolys() > n_coarse
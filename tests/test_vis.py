@@ -16,6 +16,7 @@ from vtkmodules.vtkRenderingCore import (
     vtkProp3D,
 )
 from vtkmodules.vtkRenderingAnnotation import vtkAnnotatedCubeActor
+from vtkmodules.vtkRenderingLOD import vtkLODActor
 from vtkmodules.vtkIOImage import vtkPNGWriter
 
 from pytest import fixture, raises, mark
@@ -123,6 +124,9 @@ def test_show(wp, assy, sk, patch_vtk):
     # show with edges
     show(wp, edges=True)
 
+    # show with levels of detail
+    show(wp, assy, lods=2)
+
     show_object(wp)
     show_object(wp.val())
     show_object(assy)
@@ -238,6 +242,11 @@ def test_style(wp, assy):
     act = style(ctrlPts(e.toNURBS()))
     assert instance_of(act, List[vtkProp3D])
 
+    # levels of detail
+    act = style(t, lods=2)
+    assert isinstance(act[0], vtkLODActor)
+    assert act[0].GetLODMappers().GetNumberOfItems() == 2
+
 
 def test_camera_position(wp, patch_vtk):
 